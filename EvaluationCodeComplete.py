@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 import re
@@ -10,6 +11,18 @@ from collections import Counter
 from scipy.stats import pearsonr
 import textstat
 import os
+import io
+import sys
+import copy
+import types
+import json
+import pickle
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 # Download required NLTK packages
 nltk.download('punkt', quiet=True)
@@ -19,6 +32,200 @@ nltk.download('averaged_perceptron_tagger', quiet=True)
 # Load spaCy model
 nlp = spacy.load('en_core_web_sm')
 
+class _ThreadLocalStdout:
+    """sys.stdout proxy that lets each worker thread capture its own report output"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self, buffer):
+        self._local.buffer = buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+class _RunningStats:
+    """
+    Mergeable summary statistics of one metric (count, mean, variance, min, max).
+    The median comes from value counts. These are exact while a metric takes at
+    most max_bins distinct values. Past that they are compressed into max_bins
+    equal-count buckets, each kept as its weighted mean. The median is then
+    approximate, accurate to within one bucket, about 1/max_bins of the
+    values. Memory stays bounded for near-continuous metrics like
+    quality_score.
+    """
+
+    max_bins = 1024
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.value_counts = Counter()
+
+    def update(self, values):
+        values = pd.Series(values, dtype=float).dropna()
+        if values.empty:
+            return
+        chunk = _RunningStats()
+        chunk.count = len(values)
+        chunk.mean = values.mean()
+        chunk.m2 = ((values - chunk.mean) ** 2).sum()
+        chunk.min = values.min()
+        chunk.max = values.max()
+        chunk.value_counts = Counter(values.value_counts().to_dict())
+        chunk._compress()
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Combine with another partial (Chan et al. parallel variance)"""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.value_counts.update(other.value_counts)
+        self._compress()
+
+    def _compress(self):
+        """Fold the value counts into max_bins equal-count buckets once there are more distinct values"""
+        if len(self.value_counts) <= self.max_bins:
+            return
+        target = sum(self.value_counts.values()) / self.max_bins
+        buckets = Counter()
+        weighted, count = 0.0, 0
+        for value, n in sorted(self.value_counts.items()):
+            weighted += value * n
+            count += n
+            if count >= target:
+                buckets[weighted / count] += count
+                weighted, count = 0.0, 0
+        if count:
+            buckets[weighted / count] += count
+        self.value_counts = buckets
+
+    def median(self):
+        if self.count == 0:
+            return np.nan
+        lower_rank, upper_rank = (self.count - 1) // 2, self.count // 2
+        lower = None
+        seen = 0
+        for value in sorted(self.value_counts):
+            seen += self.value_counts[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                return (lower + value) / 2
+
+    def summary(self):
+        return {
+            'mean': self.mean if self.count else np.nan,
+            'median': self.median(),
+            'std': np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan,
+            'min': self.min if self.count else np.nan,
+            'max': self.max if self.count else np.nan
+        }
+
+class _MetricAggregates:
+    """
+    Mergeable algorithm-level partial aggregates of one language's questions:
+    code element sets for coverage, Bloom's level counts for entropy and
+    diversity, and the maxima used to normalize per-question metrics
+    """
+
+    def __init__(self):
+        self.max_fk_grade = -np.inf
+        self.max_element_count = 0
+        self.element_sets = {}
+        self.blooms_counts = None
+
+    def update(self, evaluator, df):
+        """Fold a chunk of evaluated questions into the aggregates"""
+        chunk = _MetricAggregates()
+        if df['flesch_kincaid_grade'].notna().any():
+            chunk.max_fk_grade = df['flesch_kincaid_grade'].max()
+        chunk.max_element_count = df['element_count'].max()
+        for algo, algo_df in df.groupby('algorithm', sort=False):
+            chunk.element_sets[algo] = evaluator._algorithm_element_sets(algo_df)
+        chunk.blooms_counts = evaluator._blooms_count_matrix(df)
+        self.merge(chunk)
+
+    def merge(self, other):
+        self.max_fk_grade = max(self.max_fk_grade, other.max_fk_grade)
+        self.max_element_count = max(self.max_element_count, other.max_element_count)
+        for algo, sets in other.element_sets.items():
+            if algo in self.element_sets:
+                for mine, theirs in zip(self.element_sets[algo], sets):
+                    mine.update(theirs)
+            else:
+                self.element_sets[algo] = tuple(set(elements) for elements in sets)
+        if self.blooms_counts is None:
+            self.blooms_counts = other.blooms_counts
+        elif other.blooms_counts is not None:
+            self.blooms_counts = self.blooms_counts.add(other.blooms_counts, fill_value=0)
+
+class QuestionMetricStore:
+    """
+    SQLite store of per-question metric values keyed by question hash, so repeated
+    evaluations only compute metrics for new or changed questions
+    """
+
+    # Bump when a stored metric's definition changes to invalidate old rows
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_metrics ("
+            "question_hash TEXT PRIMARY KEY, metrics TEXT NOT NULL)"
+        )
+
+    def question_hash(self, language, code, question):
+        key = json.dumps([self.VERSION, language, code, question])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def load(self, hashes):
+        """Return {hash: metrics dict} for the hashes present in the store"""
+        hashes = list(hashes)
+        stored = {}
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT question_hash, metrics FROM question_metrics "
+                f"WHERE question_hash IN ({', '.join('?' * len(batch))})",
+                batch
+            )
+            for question_hash, metrics in rows:
+                stored[question_hash] = json.loads(metrics)
+        return stored
+
+    def save(self, rows):
+        """Insert or replace {hash: metrics dict}"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO question_metrics (question_hash, metrics) VALUES (?, ?)",
+            [(question_hash, json.dumps(metrics, default=lambda value: value.item()))
+             for question_hash, metrics in rows.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
 class QuestionEvaluator:
     def __init__(self):
         self.languages = ['C', 'CPP', 'Java', 'Python']
@@ -46,7 +253,256 @@ class QuestionEvaluator:
             'educational_alignment': 0.10,
             'cognitive_diversity': 0.05
         }
-    
+
+        # Metrics reported by generate_comparative_report and generate_summary_statistics
+        self.report_metrics = [
+            'linguistic_complexity', 'code_coverage', 'blooms_distribution',
+            'precision_score', 'recall_score', 'novelty_score',
+            'educational_alignment', 'cognitive_diversity', 'quality_score'
+        ]
+
+        # Columns created by preprocess_data that every metric stage may read
+        self.base_columns = ['algorithm', 'code', 'complexity', 'question', 'level', 'code_elements']
+
+        # Per-question columns that only depend on the question and its code, and
+        # are cached in the metric store between runs
+        self.stored_metric_columns = [
+            'flesch_reading_ease', 'flesch_kincaid_grade', 'sentence_count', 'word_count',
+            'variables_covered', 'functions_covered', 'blooms_level'
+        ]
+
+        # Metric stages run by evaluate_questions, in report order (see register_metric)
+        self.metric_stages = {}
+        self._register_default_metrics()
+
+    def _register_default_metrics(self):
+        """Register the built-in metric stages with their input and output columns"""
+        self.register_metric(
+            'linguistic_complexity', self.evaluate_linguistic_complexity,
+            inputs=['question'],
+            outputs=['flesch_reading_ease', 'flesch_kincaid_grade', 'sentence_count', 'word_count',
+                     'avg_sentence_length', 'normalized_fk_grade', 'normalized_sentence_length',
+                     'linguistic_complexity'],
+            description="Evaluating linguistic complexity"
+        )
+        self.register_metric(
+            'code_coverage', self.evaluate_code_coverage,
+            inputs=['question', 'algorithm', 'code_elements'],
+            outputs=['variables_covered', 'functions_covered', 'code_coverage'],
+            description="Evaluating code coverage"
+        )
+        self.register_metric(
+            'blooms_taxonomy', self.analyze_blooms_taxonomy,
+            inputs=['question', 'algorithm', 'level'],
+            outputs=['blooms_level', 'blooms_value', 'blooms_normalized', 'blooms_distribution'],
+            description="Analyzing Bloom's taxonomy"
+        )
+        self.register_metric(
+            'precision_recall', self.evaluate_precision_recall,
+            inputs=['question', 'variables_covered', 'functions_covered', 'code_coverage'],
+            outputs=['has_code_elements', 'good_structure', 'precision_score', 'recall_score'],
+            description="Evaluating precision and recall"
+        )
+        self.register_metric(
+            'novelty', self.evaluate_novelty,
+            inputs=['question', 'blooms_value', 'variables_covered', 'functions_covered'],
+            outputs=['bloom_novelty', 'element_count', 'element_novelty', 'advanced_question', 'novelty_score'],
+            description="Evaluating novelty"
+        )
+        self.register_metric(
+            'educational_alignment', self.evaluate_educational_alignment,
+            inputs=['level', 'blooms_value', 'linguistic_complexity'],
+            outputs=['expected_bloom_match', 'expected_complexity_match', 'educational_alignment'],
+            description="Evaluating educational alignment"
+        )
+        self.register_metric(
+            'cognitive_diversity', self.evaluate_cognitive_diversity,
+            inputs=['algorithm', 'blooms_level'],
+            outputs=['cognitive_diversity'],
+            description="Evaluating cognitive diversity"
+        )
+        self.register_metric(
+            'quality_score', self.calculate_overall_quality_score,
+            inputs=['complexity', 'level', 'linguistic_complexity', 'code_coverage', 'blooms_distribution',
+                    'precision_score', 'recall_score', 'novelty_score', 'educational_alignment',
+                    'cognitive_diversity'],
+            outputs=['quality_score'],
+            description="Calculating overall quality score"
+        )
+
+    def register_metric(self, name, func, inputs, outputs, description=None):
+        """
+        Register a metric stage for evaluate_questions
+
+        func is called with a dict of dataframes shaped like self.dfs and must add its
+        output columns to the '<lang>_questions' frames in that dict. inputs and outputs
+        name the question columns the stage reads and writes; they determine the order
+        in which stages run and which stages may run concurrently.
+        """
+        for other_name, other in self.metric_stages.items():
+            clash = set(outputs) & set(other['outputs'])
+            if clash and other_name != name:
+                raise ValueError(f"Metric '{name}' redefines columns {sorted(clash)} produced by '{other_name}'")
+
+        self.metric_stages[name] = {
+            'func': func,
+            'inputs': list(inputs),
+            'outputs': list(outputs),
+            'description': description or f"Evaluating {name.replace('_', ' ')}"
+        }
+
+    def _resolve_metric_stages(self, metrics=None):
+        """
+        Work out which stages are needed for the requested metrics (stage names or
+        output columns; all stages if None) and group them into dependency waves.
+        Stages within a wave only depend on earlier waves.
+        """
+        producers = {}
+        for name, stage in self.metric_stages.items():
+            for column in stage['outputs']:
+                producers[column] = name
+
+        if metrics is None:
+            pending = list(self.metric_stages)
+        else:
+            pending = []
+            for metric in metrics:
+                if metric in self.metric_stages:
+                    pending.append(metric)
+                elif metric in producers:
+                    pending.append(producers[metric])
+                else:
+                    raise ValueError(f"Unknown metric: {metric}")
+
+        # Walk back from the requested stages to everything they depend on
+        needed = set()
+        dependencies = {}
+        while pending:
+            name = pending.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            dependencies[name] = set()
+            for column in self.metric_stages[name]['inputs']:
+                if column in producers:
+                    if producers[column] != name:
+                        dependencies[name].add(producers[column])
+                        pending.append(producers[column])
+                elif column not in self.base_columns:
+                    raise ValueError(f"No metric stage produces column '{column}' required by '{name}'")
+
+        waves = []
+        done = set()
+        while len(done) < len(needed):
+            wave = [name for name in self.metric_stages
+                    if name in needed and name not in done and dependencies[name] <= done]
+            if not wave:
+                raise ValueError(f"Metric stages have a dependency cycle: {sorted(needed - done)}")
+            waves.append(wave)
+            done.update(wave)
+
+        return waves
+
+    def _run_metric_stage(self, name, stdout, dfs):
+        """Run one stage on shallow copies of the question frames, capturing its report"""
+        stage_dfs = dict(dfs)
+        for key in self._question_keys(dfs):
+            stage_dfs[key] = dfs[key].copy(deep=False)
+
+        buffer = io.StringIO()
+        stdout.capture(buffer)
+        try:
+            self.metric_stages[name]['func'](stage_dfs)
+        finally:
+            stdout.release()
+
+        return stage_dfs, buffer.getvalue()
+
+    def _stage_worker(self):
+        """
+        A copy of the evaluator to send to metric stage processes, without the
+        data frames and registered stages, so only the frames a stage needs are
+        pickled with it
+        """
+        worker = copy.copy(self)
+        worker.dfs = {}
+        worker.metric_stages = {}
+        return worker
+
+    def _submit_metric_stage(self, name, dfs, stdout, threads, processes, worker, summaries):
+        """
+        Submit one stage to the process pool if it is a built-in stage (a method of
+        this evaluator) and processes is given, otherwise to the thread pool.
+        A stage process gets its own question frames holding only the base, input
+        and already present output columns, and the summary frames (summaries,
+        such as the Bloom's count matrices) that earlier waves produced.
+        """
+        stage = self.metric_stages[name]
+        func = stage['func']
+        if processes is None or getattr(func, '__self__', None) is not self:
+            return threads.submit(self._run_metric_stage, name, stdout, dfs)
+
+        columns = set(self.base_columns) | set(stage['inputs']) | set(stage['outputs'])
+        frames = {key: dfs[key][[column for column in dfs[key].columns if column in columns]]
+                  for key in self._question_keys(dfs)}
+        frames.update((key, dfs[key]) for key in summaries)
+        return processes.submit(_run_metric_stage_process, types.MethodType(func.__func__, worker), frames)
+
+    def _question_keys(self, dfs):
+        return [f"{lang}_questions" for lang in self.languages if f"{lang}_questions" in dfs]
+
+    def run_metric_stages(self, metrics=None, max_workers=None, dfs=None, processes=None):
+        """
+        Run the metric stages needed for the requested metrics (all by default)
+        on dfs (self.dfs by default).
+        Stages in the same dependency wave are independent and run concurrently.
+        The built-in stages are CPU-bound pandas and textstat work that holds the
+        GIL, so when a wave has more than one of them they run in a process pool;
+        registered plugin stages, which need not be picklable, run in a thread
+        pool. max_workers=1 runs every stage in turn in this process. processes is
+        a ProcessPoolExecutor to use instead of starting one for this call, for
+        callers that run the stages many times. Reports are printed in
+        registration order once each wave has finished.
+        """
+        dfs = self.dfs if dfs is None else dfs
+        waves = self._resolve_metric_stages(metrics)
+        question_keys = self._question_keys(dfs)
+        builtin = [sum(getattr(self.metric_stages[name]['func'], '__self__', None) is self for name in wave)
+                   for wave in waves]
+        use_processes = (processes is not None or max_workers != 1) and max(builtin, default=0) > 1
+
+        stdout = _ThreadLocalStdout(sys.stdout)
+        sys.stdout = stdout
+        try:
+            with contextlib.ExitStack() as stack:
+                threads = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+                if use_processes and processes is None:
+                    processes = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+                worker = self._stage_worker() if use_processes else None
+                summaries = set()
+                for wave, count in zip(waves, builtin):
+                    pool = processes if count > 1 else None
+                    futures = {name: self._submit_metric_stage(name, dfs, stdout, threads, pool, worker, summaries)
+                               for name in wave}
+                    results = {name: futures[name].result() for name in wave}
+
+                    # Merge each stage's output columns (and any summary frames) back in
+                    for name in wave:
+                        stage_dfs, report = results[name]
+                        for key, value in stage_dfs.items():
+                            if key in question_keys:
+                                for column in self.metric_stages[name]['outputs']:
+                                    if column in value:
+                                        dfs[key][column] = value[column]
+                            elif dfs.get(key) is not value:
+                                dfs[key] = value
+                                summaries.add(key)
+
+                        print(f"\n{self.metric_stages[name]['description']}...")
+                        stdout.write(report)
+        finally:
+            sys.stdout = stdout.stream
+
     def load_data(self, file_paths):
         """Load CSV data files for each programming language"""
         for lang, path in file_paths.items():
@@ -62,46 +518,85 @@ class QuestionEvaluator:
         language_keys = list(self.dfs.keys())
         
         for lang in language_keys:
-            df = self.dfs[lang]
-            # Extract questions as a list
-            df['questions_list'] = df['GeneratedQuestions'].apply(
-                lambda x: x.split("\n") if isinstance(x, str) else []
-            )
-            
-            # Clean questions and extract features
-            clean_questions = []
-            for idx, row in df.iterrows():
-                code = row['Code'] if isinstance(row['Code'], str) else ""
-                complexity = row['complexity']
-                
-                # Extract code elements (variable names, function names)
-                code_elements = self._extract_code_elements(code, lang)
-                
-                # Process each question
-                for q in row['questions_list']:
-                    # Extract difficulty level
-                    level_match = re.search(r'\[(beginner|intermediate|advanced)\]', q.lower())
-                    level = level_match.group(1) if level_match else "unknown"
-                    
-                    # Clean question text
-                    clean_q = re.sub(r'\[(beginner|intermediate|advanced)\]', '', q).strip()
-                    
-                    if clean_q:  # Skip empty questions
-                        clean_questions.append({
-                            'algorithm': row['AlgorithmName'] if 'AlgorithmName' in row else f"Algorithm_{idx}",
-                            'code': code,
-                            'complexity': complexity,
-                            'question': clean_q,
-                            'level': level,
-                            'code_elements': code_elements
-                        })
-            
-            df_questions = pd.DataFrame(clean_questions)
+            df_questions = self._extract_questions(self.dfs[lang], lang)
             
             # Store the questions dataframe
             self.dfs[f"{lang}_questions"] = df_questions
             print(f"Processed {len(df_questions)} questions for {lang}")
     
+    def _extract_questions(self, df, lang):
+        """Split the generated questions of each code sample into one row per question"""
+        # Extract questions as a list
+        df['questions_list'] = df['GeneratedQuestions'].apply(
+            lambda x: x.split("\n") if isinstance(x, str) else []
+        )
+        
+        # Clean questions and extract features
+        clean_questions = []
+        for idx, row in df.iterrows():
+            code = row['Code'] if isinstance(row['Code'], str) else ""
+            complexity = row['complexity']
+            
+            # Extract code elements (variable names, function names)
+            code_elements = self._extract_code_elements(code, lang)
+            
+            # Process each question
+            for q in row['questions_list']:
+                # Extract difficulty level
+                level_match = re.search(r'\[(beginner|intermediate|advanced)\]', q.lower())
+                level = level_match.group(1) if level_match else "unknown"
+                
+                # Clean question text
+                clean_q = re.sub(r'\[(beginner|intermediate|advanced)\]', '', q).strip()
+                
+                if clean_q:  # Skip empty questions
+                    clean_questions.append({
+                        'algorithm': row['AlgorithmName'] if 'AlgorithmName' in row else f"Algorithm_{idx}",
+                        'code': code,
+                        'complexity': complexity,
+                        'question': clean_q,
+                        'level': level,
+                        'code_elements': code_elements
+                    })
+        
+        return pd.DataFrame(clean_questions)
+    
+    def _load_stored_metrics(self, store):
+        """
+        Restore stored per-question metrics into the question frames.
+        Returns {frame key: hashes of the questions that still need computing}.
+        """
+        new_hashes = {}
+        for key, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
+                                  self.languages):
+            if key in self.dfs and not self.dfs[key].empty:
+                df = self.dfs[key]
+                df['question_hash'] = [store.question_hash(lang_name, code, question)
+                                       for code, question in zip(df['code'], df['question'])]
+                stored = store.load(set(df['question_hash']))
+                
+                if stored:
+                    for column in self.stored_metric_columns:
+                        df[column] = [stored[h][column] if h in stored else np.nan for h in df['question_hash']]
+                
+                new_hashes[key] = set(df['question_hash']) - set(stored)
+                print(f"Reusing stored metrics for {len(df) - df['question_hash'].isin(new_hashes[key]).sum()} "
+                      f"of {len(df)} {lang_name} questions")
+        return new_hashes
+    
+    def _save_stored_metrics(self, store, new_hashes):
+        """Write the per-question metrics of newly evaluated questions to the store"""
+        for key, hashes in new_hashes.items():
+            df = self.dfs[key]
+            columns = [column for column in self.stored_metric_columns if column in df]
+            if not hashes or len(columns) < len(self.stored_metric_columns):
+                continue  # only store complete rows
+            new_rows = df[df['question_hash'].isin(hashes)].drop_duplicates('question_hash')
+            store.save({
+                row['question_hash']: {column: row[column] for column in columns}
+                for _, row in new_rows.iterrows()
+            })
+    
     def _extract_code_elements(self, code, language):
         """Extract variable names, function names, etc. from code"""
         if not code:
@@ -144,18 +639,38 @@ class QuestionEvaluator:
         
         return elements
     
-    def evaluate_linguistic_complexity(self):
+    def _fill_column(self, df, column, compute):
+        """
+        Set df[column] to compute(rows), computing only the rows still missing a value
+        (those not restored from the metric store by _load_stored_metrics)
+        """
+        if column not in df:
+            df[column] = compute(df)
+            return
+        
+        missing = df[column].isna()
+        if missing.any():
+            computed = compute(df[missing])
+            df[column] = [computed[idx] if is_missing else value
+                          for idx, is_missing, value in zip(df.index, missing, df[column])]
+    
+    def evaluate_linguistic_complexity(self, dfs=None):
         """Analyze linguistic complexity of questions"""
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # Calculate readability metrics
-                df['flesch_reading_ease'] = df['question'].apply(lambda q: textstat.flesch_reading_ease(q))
-                df['flesch_kincaid_grade'] = df['question'].apply(lambda q: textstat.flesch_kincaid_grade(q))
-                df['sentence_count'] = df['question'].apply(lambda q: textstat.sentence_count(q))
-                df['word_count'] = df['question'].apply(lambda q: len(q.split()))
+                self._fill_column(df, 'flesch_reading_ease',
+                                  lambda rows: rows['question'].apply(lambda q: textstat.flesch_reading_ease(q)))
+                self._fill_column(df, 'flesch_kincaid_grade',
+                                  lambda rows: rows['question'].apply(lambda q: textstat.flesch_kincaid_grade(q)))
+                self._fill_column(df, 'sentence_count',
+                                  lambda rows: rows['question'].apply(lambda q: textstat.sentence_count(q)))
+                self._fill_column(df, 'word_count',
+                                  lambda rows: rows['question'].apply(lambda q: len(q.split())))
                 
                 # Calculate average sentence length
                 df['avg_sentence_length'] = df.apply(
@@ -165,18 +680,10 @@ class QuestionEvaluator:
                 
                 # Normalize metrics to 0-1 scale for the linguistic complexity score
                 max_fk_grade = max(10, df['flesch_kincaid_grade'].max())  # Cap at 10 or the max
-                df['normalized_fk_grade'] = df['flesch_kincaid_grade'].apply(lambda x: min(x / max_fk_grade, 1))
-                
-                max_sentence_length = 25  # Assuming 25 words is a complex sentence
-                df['normalized_sentence_length'] = df['avg_sentence_length'].apply(
-                    lambda x: min(x / max_sentence_length, 1)
-                )
-                
-                # Calculate linguistic complexity score (higher = more complex)
-                df['linguistic_complexity'] = 0.6 * df['normalized_fk_grade'] + 0.4 * df['normalized_sentence_length']
+                self._score_linguistic_complexity(df, max_fk_grade)
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
                 
                 print(f"\n=== Linguistic Complexity Analysis for {lang_name} ===")
                 print(f"Average Flesch Reading Ease: {df['flesch_reading_ease'].mean():.2f}")
@@ -192,23 +699,36 @@ class QuestionEvaluator:
                         print(f"  Average Flesch-Kincaid Grade: {level_df['flesch_kincaid_grade'].mean():.2f}")
                         print(f"  Average linguistic complexity: {level_df['linguistic_complexity'].mean():.2f}")
     
-    def evaluate_code_coverage(self):
+    def _score_linguistic_complexity(self, df, max_fk_grade):
+        """Normalize readability metrics and combine them into the linguistic complexity score"""
+        df['normalized_fk_grade'] = df['flesch_kincaid_grade'].apply(lambda x: min(x / max_fk_grade, 1))
+        
+        max_sentence_length = 25  # Assuming 25 words is a complex sentence
+        df['normalized_sentence_length'] = df['avg_sentence_length'].apply(
+            lambda x: min(x / max_sentence_length, 1)
+        )
+        
+        # Calculate linguistic complexity score (higher = more complex)
+        df['linguistic_complexity'] = 0.6 * df['normalized_fk_grade'] + 0.4 * df['normalized_sentence_length']
+    
+    def evaluate_code_coverage(self, dfs=None):
         """Analyze how much of the code elements are covered by questions"""
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # Create columns to track code element coverage
-                df['variables_covered'] = df.apply(
+                self._fill_column(df, 'variables_covered', lambda rows: rows.apply(
                     lambda row: self._check_element_coverage(row['question'], row['code_elements']['variables']), 
                     axis=1
-                )
+                ))
                 
-                df['functions_covered'] = df.apply(
+                self._fill_column(df, 'functions_covered', lambda rows: rows.apply(
                     lambda row: self._check_element_coverage(row['question'], row['code_elements']['functions']), 
                     axis=1
-                )
+                ))
                 
                 # Calculate overall coverage percentage
                 algorithms = df['algorithm'].unique()
@@ -216,52 +736,59 @@ class QuestionEvaluator:
                 
                 for algo in algorithms:
                     algo_df = df[df['algorithm'] == algo]
-                    
-                    # Get all variables and functions for this algorithm
-                    all_vars = set()
-                    all_funcs = set()
-                    
-                    for _, row in algo_df.iterrows():
-                        all_vars.update(row['code_elements']['variables'])
-                        all_funcs.update(row['code_elements']['functions'])
-                    
-                    # Get all covered variables and functions
-                    covered_vars = set()
-                    covered_funcs = set()
-                    
-                    for _, row in algo_df.iterrows():
-                        covered_vars.update(row['variables_covered'])
-                        covered_funcs.update(row['functions_covered'])
-                    
-                    # Calculate coverage
-                    var_coverage = len(covered_vars) / len(all_vars) if all_vars else 1.0
-                    func_coverage = len(covered_funcs) / len(all_funcs) if all_funcs else 1.0
-                    
-                    # Weighted overall coverage (give functions more weight)
-                    overall_coverage = (0.4 * var_coverage + 0.6 * func_coverage)
-                    
-                    coverage_data.append({
-                        'algorithm': algo,
-                        'var_coverage': var_coverage,
-                        'func_coverage': func_coverage,
-                        'overall_coverage': overall_coverage
-                    })
+                    element_sets = self._algorithm_element_sets(algo_df)
+                    coverage_data.append({'algorithm': algo, **self._algorithm_coverage(*element_sets)})
                 
                 coverage_df = pd.DataFrame(coverage_data)
-                self.dfs[f"{lang_name}_coverage"] = coverage_df
+                dfs[f"{lang_name}_coverage"] = coverage_df
                 
                 # Add algorithm coverage to questions dataframe
                 algo_coverage_map = {row['algorithm']: row['overall_coverage'] for _, row in coverage_df.iterrows()}
                 df['code_coverage'] = df['algorithm'].map(algo_coverage_map)
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
                 
                 print(f"\n=== Code Coverage Analysis for {lang_name} ===")
                 print(f"Average variable coverage: {coverage_df['var_coverage'].mean():.2f}")
                 print(f"Average function coverage: {coverage_df['func_coverage'].mean():.2f}")
                 print(f"Average overall code coverage: {coverage_df['overall_coverage'].mean():.2f}")
     
+    def _algorithm_element_sets(self, algo_df):
+        """Collect the code elements of an algorithm and the ones its questions mention"""
+        # Get all variables and functions for this algorithm
+        all_vars = set()
+        all_funcs = set()
+        
+        for elements in algo_df['code_elements']:
+            all_vars.update(elements['variables'])
+            all_funcs.update(elements['functions'])
+        
+        # Get all covered variables and functions
+        covered_vars = set()
+        covered_funcs = set()
+        
+        for covered in algo_df['variables_covered']:
+            covered_vars.update(covered)
+        for covered in algo_df['functions_covered']:
+            covered_funcs.update(covered)
+        
+        return all_vars, all_funcs, covered_vars, covered_funcs
+    
+    def _algorithm_coverage(self, all_vars, all_funcs, covered_vars, covered_funcs):
+        """Coverage ratios of an algorithm's variables and functions"""
+        var_coverage = len(covered_vars) / len(all_vars) if all_vars else 1.0
+        func_coverage = len(covered_funcs) / len(all_funcs) if all_funcs else 1.0
+        
+        # Weighted overall coverage (give functions more weight)
+        overall_coverage = (0.4 * var_coverage + 0.6 * func_coverage)
+        
+        return {
+            'var_coverage': var_coverage,
+            'func_coverage': func_coverage,
+            'overall_coverage': overall_coverage
+        }
+    
     def _check_element_coverage(self, question, elements):
         """Check which code elements are mentioned in the question"""
         question_lower = question.lower()
@@ -274,38 +801,17 @@ class QuestionEvaluator:
         
         return covered
     
-    def analyze_blooms_taxonomy(self):
+    def analyze_blooms_taxonomy(self, dfs=None):
         """Analyze questions based on Bloom's taxonomy levels"""
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # Detect Bloom's taxonomy level for each question
-                blooms_levels = []
-                for _, row in df.iterrows():
-                    question = row['question'].lower()
-                    levels_detected = {}
-                    
-                    for level, keywords in self.blooms_keywords.items():
-                        matches = sum(1 for keyword in keywords if keyword in question)
-                        levels_detected[level] = matches
-                    
-                    # Find the level with the most keywords (if tied, take the higher level)
-                    max_matches = 0
-                    primary_level = 'remember'  # Default
-                    
-                    # Order levels from lowest to highest
-                    bloom_order = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
-                    
-                    for level in bloom_order:
-                        if levels_detected[level] >= max_matches:
-                            max_matches = levels_detected[level]
-                            primary_level = level
-                    
-                    blooms_levels.append(primary_level)
-                
-                df['blooms_level'] = blooms_levels
+                self._fill_column(df, 'blooms_level',
+                                  lambda rows: rows['question'].apply(self._detect_blooms_level))
                 
                 # Map Bloom's levels to numeric values (higher = more advanced)
                 bloom_values = {
@@ -318,45 +824,31 @@ class QuestionEvaluator:
                 }
                 
                 df['blooms_value'] = df['blooms_level'].map(bloom_values)
-                
+
                 # Normalize to 0-1 scale
                 df['blooms_normalized'] = df['blooms_value'] / 6.0
-                
+
+                # Algorithm x Bloom's level counts, shared with evaluate_cognitive_diversity
+                blooms_matrix = self._blooms_count_matrix(df)
+                dfs[f"{lang_name}_blooms_matrix"] = blooms_matrix
+
                 # Get distribution of Bloom's levels
-                blooms_dist = df['blooms_level'].value_counts(normalize=True).to_dict()
-                
+                level_totals = blooms_matrix.sum(axis=0)
+                blooms_dist = (level_totals[level_totals > 0] / level_totals.sum()).to_dict()
+
                 # Calculate Bloom's distribution evenness (higher value = more evenly distributed)
                 # Using entropy for measuring distribution evenness
-                if len(blooms_dist) > 1:
-                    blooms_entropy = -sum(
-                        p * np.log(p) if p > 0 else 0 
-                        for p in blooms_dist.values()
-                    ) / np.log(len(bloom_values))
-                else:
-                    blooms_entropy = 0
-                
+                blooms_entropy = self._normalized_entropy(level_totals.to_numpy())
+
                 # Assign blooms_distribution score to each question based on the algorithm's distribution
-                algorithms = df['algorithm'].unique()
-                algo_blooms_dist = {}
-                
-                for algo in algorithms:
-                    algo_df = df[df['algorithm'] == algo]
-                    algo_dist = algo_df['blooms_level'].value_counts(normalize=True).to_dict()
-                    
-                    if len(algo_dist) > 1:
-                        dist_score = -sum(
-                            p * np.log(p) if p > 0 else 0 
-                            for p in algo_dist.values()
-                        ) / np.log(len(bloom_values))
-                    else:
-                        dist_score = 0
-                    
-                    algo_blooms_dist[algo] = dist_score
-                
+                algo_blooms_dist = pd.Series(
+                    self._normalized_entropy(blooms_matrix.to_numpy()), index=blooms_matrix.index
+                )
+
                 df['blooms_distribution'] = df['algorithm'].map(algo_blooms_dist)
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
                 
                 print(f"\n=== Bloom's Taxonomy Analysis for {lang_name} ===")
                 print("Bloom's Taxonomy Distribution:")
@@ -371,18 +863,59 @@ class QuestionEvaluator:
                     if not level_df.empty:
                         avg_bloom = level_df['blooms_value'].mean()
                         print(f"{level.capitalize()} questions average Bloom's level: {avg_bloom:.2f}")
+
+    def _detect_blooms_level(self, question):
+        """Bloom's level whose keywords occur most often in the question"""
+        question = question.lower()
+        levels_detected = {}
+        
+        for level, keywords in self.blooms_keywords.items():
+            matches = sum(1 for keyword in keywords if keyword in question)
+            levels_detected[level] = matches
+        
+        # Find the level with the most keywords (if tied, take the higher level)
+        max_matches = 0
+        primary_level = 'remember'  # Default
+        
+        # Order levels from lowest to highest
+        bloom_order = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
+        
+        for level in bloom_order:
+            if levels_detected[level] >= max_matches:
+                max_matches = levels_detected[level]
+                primary_level = level
+        
+        return primary_level
     
-    def evaluate_precision_recall(self):
+    def _blooms_count_matrix(self, df):
+        """Count questions per algorithm (rows) and Bloom's level (columns)"""
+        bloom_order = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
+        counts = pd.crosstab(df['algorithm'], df['blooms_level'])
+        return counts.reindex(columns=bloom_order, fill_value=0)
+
+    def _normalized_entropy(self, counts):
+        """
+        Row-wise entropy of a count matrix (or a single count vector),
+        normalized by log(# of Bloom's levels) so the result lies in 0-1
+        """
+        counts = np.asarray(counts, dtype=float)
+        totals = counts.sum(axis=-1, keepdims=True)
+        p = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+        inv_p = np.divide(1.0, p, out=np.ones_like(p), where=p > 0)
+        return (p * np.log(inv_p)).sum(axis=-1) / np.log(counts.shape[-1])
+
+    def evaluate_precision_recall(self, dfs=None):
         """
         Evaluate precision and recall metrics for question generation
         
         Since we don't have ground truth for what constitutes a "good" question,
         we'll use heuristics to estimate precision and recall
         """
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # Estimate precision: what proportion of questions are likely to be useful?
                 # Heuristic: a question is "precise" if it mentions specific code elements 
@@ -412,18 +945,19 @@ class QuestionEvaluator:
                 print(f"F1 Score: {f1_score:.2f}")
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
     
-    def evaluate_novelty(self):
+    def evaluate_novelty(self, dfs=None):
         """
         Evaluate novelty of questions
         
         Novelty: Do questions go beyond trivial observations about the code?
         """
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # Heuristics for novelty:
                 # 1. Higher Bloom's taxonomy level (analysis, evaluation, creation > remembering)
@@ -435,8 +969,6 @@ class QuestionEvaluator:
                 
                 # Calculate novelty based on mentioned code elements
                 df['element_count'] = df['variables_covered'].apply(len) + df['functions_covered'].apply(len)
-                max_elements = max(df['element_count'].max(), 1)
-                df['element_novelty'] = df['element_count'] / max_elements
                 
                 # Detect advanced question types
                 advanced_keywords = ['complexity', 'optimize', 'efficient', 'edge case', 
@@ -446,9 +978,8 @@ class QuestionEvaluator:
                 )
                 
                 # Combine novelty factors
-                df['novelty_score'] = (0.4 * df['bloom_novelty'] + 
-                                      0.3 * df['element_novelty'] + 
-                                      0.3 * df['advanced_question'].astype(int))
+                max_elements = max(df['element_count'].max(), 1)
+                self._score_novelty(df, max_elements)
                 
                 avg_novelty = df['novelty_score'].mean()
                 
@@ -457,50 +988,29 @@ class QuestionEvaluator:
                 print(f"Proportion of Advanced Questions: {df['advanced_question'].mean():.2f}")
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
+    
+    def _score_novelty(self, df, max_elements):
+        """Normalize the element count and combine the novelty factors"""
+        df['element_novelty'] = df['element_count'] / max_elements
+        df['novelty_score'] = (0.4 * df['bloom_novelty'] + 
+                              0.3 * df['element_novelty'] + 
+                              0.3 * df['advanced_question'].astype(int))
     
-    def evaluate_educational_alignment(self):
+    def evaluate_educational_alignment(self, dfs=None):
         """
         Evaluate whether difficulty labels match question complexity
         
         This checks whether beginner/intermediate/advanced labels accurately 
         reflect question difficulty
         """
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                
-                # Expected Bloom's level for each difficulty
-                expected_blooms = {
-                    'beginner': [1, 2],  # Remember, Understand
-                    'intermediate': [2, 3, 4],  # Understand, Apply, Analyze
-                    'advanced': [4, 5, 6]  # Analyze, Evaluate, Create
-                }
-                
-                # Check if Bloom's level matches the expected range for difficulty
-                df['expected_bloom_match'] = df.apply(
-                    lambda row: row['blooms_value'] in expected_blooms[row['level']], 
-                    axis=1
-                )
-                
-                # Check if linguistic complexity aligns with difficulty
-                # Normalize linguistic complexity to 0-1 and compare with expected ranges
-                expected_complexity = {
-                    'beginner': (0, 0.4),
-                    'intermediate': (0.3, 0.7),
-                    'advanced': (0.6, 1.0)
-                }
+            if lang in dfs:
+                df = dfs[lang]
                 
-                df['expected_complexity_match'] = df.apply(
-                    lambda row: (expected_complexity[row['level']][0] <= row['linguistic_complexity'] and
-                               row['linguistic_complexity'] <= expected_complexity[row['level']][1]),
-                    axis=1
-                )
-                
-                # Combined educational alignment score
-                df['educational_alignment'] = (0.7 * df['expected_bloom_match'].astype(int) + 
-                                            0.3 * df['expected_complexity_match'].astype(int))
+                self._score_educational_alignment(df)
                 
                 alignment_by_level = {}
                 for level in self.difficulty_levels:
@@ -514,47 +1024,63 @@ class QuestionEvaluator:
                     print(f"{level.capitalize()} questions alignment: {score:.2f}")
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
+    
+    def _score_educational_alignment(self, df):
+        """Compare each question's Bloom's level and linguistic complexity with its difficulty label"""
+        # Expected Bloom's level for each difficulty
+        expected_blooms = {
+            'beginner': [1, 2],  # Remember, Understand
+            'intermediate': [2, 3, 4],  # Understand, Apply, Analyze
+            'advanced': [4, 5, 6]  # Analyze, Evaluate, Create
+        }
+        
+        # Check if Bloom's level matches the expected range for difficulty
+        df['expected_bloom_match'] = df.apply(
+            lambda row: row['blooms_value'] in expected_blooms[row['level']], 
+            axis=1
+        )
+        
+        # Check if linguistic complexity aligns with difficulty
+        # Normalize linguistic complexity to 0-1 and compare with expected ranges
+        expected_complexity = {
+            'beginner': (0, 0.4),
+            'intermediate': (0.3, 0.7),
+            'advanced': (0.6, 1.0)
+        }
+        
+        df['expected_complexity_match'] = df.apply(
+            lambda row: (expected_complexity[row['level']][0] <= row['linguistic_complexity'] and
+                         row['linguistic_complexity'] <= expected_complexity[row['level']][1]),
+            axis=1
+        )
+        
+        # Combined educational alignment score
+        df['educational_alignment'] = (0.7 * df['expected_bloom_match'].astype(int) + 
+                                       0.3 * df['expected_complexity_match'].astype(int))
     
-    def evaluate_cognitive_diversity(self):
+    def evaluate_cognitive_diversity(self, dfs=None):
         """
         Evaluate cognitive diversity of questions
         
         Do questions target different cognitive processes?
         """
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # We'll measure cognitive diversity at the algorithm level
                 # Count unique Bloom's levels and calculate diversity score
-                
-                algorithms = df['algorithm'].unique()
-                algo_cognitive_div = {}
-                
-                for algo in algorithms:
-                    algo_df = df[df['algorithm'] == algo]
-                    
-                    # Count unique Bloom's levels
-                    unique_blooms = algo_df['blooms_level'].nunique()
-                    
-                    # Calculate distribution of Bloom's levels
-                    blooms_dist = algo_df['blooms_level'].value_counts(normalize=True).to_dict()
-                    
-                    # Calculate entropy as a measure of diversity
-                    if len(blooms_dist) > 1:
-                        entropy = -sum(
-                            p * np.log(p) if p > 0 else 0 
-                            for p in blooms_dist.values()
-                        ) / np.log(6)  # Normalize by log(# of categories)
-                    else:
-                        entropy = 0
-                    
-                    # Combine metrics (unique count and distribution entropy)
-                    diversity_score = (0.4 * (unique_blooms / 6) + 0.6 * entropy)
-                    
-                    algo_cognitive_div[algo] = diversity_score
+
+                # Reuse the count matrix built by analyze_blooms_taxonomy
+                blooms_matrix = dfs.get(f"{lang_name}_blooms_matrix")
+                if blooms_matrix is None:
+                    blooms_matrix = self._blooms_count_matrix(df)
+                algo_cognitive_div = pd.Series(
+                    self._cognitive_diversity_scores(blooms_matrix.to_numpy()), index=blooms_matrix.index
+                )
                 
                 # Assign cognitive diversity score to each question based on its algorithm
                 df['cognitive_diversity'] = df['algorithm'].map(algo_cognitive_div)
@@ -565,31 +1091,32 @@ class QuestionEvaluator:
                 print(f"Average Cognitive Diversity Score: {avg_diversity:.2f}")
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
     
-    def calculate_overall_quality_score(self):
+    def _cognitive_diversity_scores(self, counts):
+        """Diversity score for each row of an algorithm x Bloom's level count matrix"""
+        # Count unique Bloom's levels
+        unique_blooms = (counts > 0).sum(axis=1)
+
+        # Calculate entropy as a measure of diversity
+        entropy = self._normalized_entropy(counts)
+
+        # Combine metrics (unique count and distribution entropy)
+        return 0.4 * (unique_blooms / 6) + 0.6 * entropy
+    
+    def calculate_overall_quality_score(self, dfs=None):
         """Calculate weighted overall question quality score"""
+        dfs = self.dfs if dfs is None else dfs
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
+            if lang in dfs:
+                df = dfs[lang]
                 
                 # Calculate overall quality score using weights
-                overall_score = (
-                    self.metric_weights['linguistic_complexity'] * df['linguistic_complexity'] +
-                    self.metric_weights['code_coverage'] * df['code_coverage'] +
-                    self.metric_weights['blooms_distribution'] * df['blooms_distribution'] +
-                    self.metric_weights['precision'] * df['precision_score'] +
-                    self.metric_weights['recall'] * df['recall_score'] +
-                    self.metric_weights['novelty'] * df['novelty_score'] +
-                    self.metric_weights['educational_alignment'] * df['educational_alignment'] +
-                    self.metric_weights['cognitive_diversity'] * df['cognitive_diversity']
-                )
-                
-                df['quality_score'] = overall_score
+                df['quality_score'] = self._weighted_quality_score(df)
                 
                 # Update the dataframe
-                self.dfs[lang] = df
+                dfs[lang] = df
                 
                 print(f"\n=== Overall Quality Score for {lang_name} ===")
                 print(f"Average Quality Score: {df['quality_score'].mean():.2f}")
@@ -606,27 +1133,46 @@ class QuestionEvaluator:
                     if not level_df.empty:
                         print(f"{level.capitalize()} questions average quality: {level_df['quality_score'].mean():.2f}")
     
-    def generate_comparative_report(self):
-        """Generate a comparative report across languages"""
-        # Collect metrics across languages
-        metrics_by_lang = {}
+    def _weighted_quality_score(self, df):
+        """Weighted sum of the per-question metrics"""
+        return (
+            self.metric_weights['linguistic_complexity'] * df['linguistic_complexity'] +
+            self.metric_weights['code_coverage'] * df['code_coverage'] +
+            self.metric_weights['blooms_distribution'] * df['blooms_distribution'] +
+            self.metric_weights['precision'] * df['precision_score'] +
+            self.metric_weights['recall'] * df['recall_score'] +
+            self.metric_weights['novelty'] * df['novelty_score'] +
+            self.metric_weights['educational_alignment'] * df['educational_alignment'] +
+            self.metric_weights['cognitive_diversity'] * df['cognitive_diversity']
+        )
+    
+    def generate_comparative_report(self, metrics_by_lang=None):
+        """
+        Generate a comparative report across languages
+
+        metrics_by_lang maps language -> metric -> mean; it is computed from
+        self.dfs unless given (as evaluate_questions_streaming does)
+        """
+        if metrics_by_lang is None:
+            # Collect metrics across languages
+            metrics_by_lang = {}
         
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                
-                metrics_by_lang[lang_name] = {
-                    'linguistic_complexity': df['linguistic_complexity'].mean(),
-                    'code_coverage': df['code_coverage'].mean(),
-                    'blooms_distribution': df['blooms_distribution'].mean(),
-                    'precision_score': df['precision_score'].mean(),
-                    'recall_score': df['recall_score'].mean(),
-                    'novelty_score': df['novelty_score'].mean(),
-                    'educational_alignment': df['educational_alignment'].mean(),
-                    'cognitive_diversity': df['cognitive_diversity'].mean(),
-                    'quality_score': df['quality_score'].mean()
-                }
+            for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
+                                      self.languages):
+                if lang in self.dfs:
+                    df = self.dfs[lang]
+                
+                    metrics_by_lang[lang_name] = {
+                        'linguistic_complexity': df['linguistic_complexity'].mean(),
+                        'code_coverage': df['code_coverage'].mean(),
+                        'blooms_distribution': df['blooms_distribution'].mean(),
+                        'precision_score': df['precision_score'].mean(),
+                        'recall_score': df['recall_score'].mean(),
+                        'novelty_score': df['novelty_score'].mean(),
+                        'educational_alignment': df['educational_alignment'].mean(),
+                        'cognitive_diversity': df['cognitive_diversity'].mean(),
+                        'quality_score': df['quality_score'].mean()
+                    }
         
         if metrics_by_lang:
             print("\n=== Comparative Report Across Languages ===")
@@ -655,34 +1201,20 @@ class QuestionEvaluator:
             
             return metrics_df
     
-    def visualize_results(self):
-        """Create visualizations of evaluation results"""
-        # Prepare directory for visualizations
-        os.makedirs('evaluation_plots', exist_ok=True)
-        
-        # 1. Quality score by language and complexity
-        quality_data = []
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                for complexity in df['complexity'].unique():
-                    complexity_df = df[df['complexity'] == complexity]
-                    quality_data.append({
-                        'Language': lang_name,
-                        'Complexity': complexity,
-                        'Quality Score': complexity_df['quality_score'].mean()
-                    })
+    def visualize_results(self, max_workers=None, force=False):
+        """
+        Create visualizations of evaluation results
+
+        Plot data is built here; the figures are rendered by _render_plots, which
+        skips figures whose data has not changed since the last run unless force
+        is set.
+        """
+        question_frames = [(lang_name, self.dfs[lang])
+                           for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
+                                                      self.languages)
+                           if lang in self.dfs]
+        plots = []
         
-        if quality_data:
-            quality_df = pd.DataFrame(quality_data)
-            plt.figure(figsize=(12, 8))
-            sns.barplot(x='Language', y='Quality Score', hue='Complexity', data=quality_df)
-            plt.title('Question Quality Score by Language and Code Complexity')
-            plt.savefig('evaluation_plots/quality_by_language_complexity.png')
-            plt.close()        
-      
-        # 2. Spider plots for evaluation metrics by language
         metrics = [
             'linguistic_complexity', 'code_coverage', 'blooms_distribution',
             'precision_score', 'recall_score', 'novelty_score', 
@@ -695,218 +1227,176 @@ class QuestionEvaluator:
             'Educational\nAlignment', 'Cognitive\nDiversity'
         ]
         
-        metrics_by_lang = {}
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                metrics_by_lang[lang_name] = [df[metric].mean() for metric in metrics]
+        # 1. Quality score by language and complexity
+        quality_df = self._grouped_quality(question_frames, 'complexity', 'Complexity')
+        if not quality_df.empty:
+            plots.append(('quality_by_language_complexity.png', _plot_quality_by_language_complexity, (quality_df,)))
         
+        # 2. Spider plots for evaluation metrics by language
+        metrics_by_lang = {lang_name: df[metrics].mean().tolist() for lang_name, df in question_frames}
         if metrics_by_lang:
-            # Create radar plot
-            plt.figure(figsize=(10, 10))
-            ax = plt.subplot(111, polar=True)
-            
-            # Number of metrics
-            num_metrics = len(metrics)
-            
-            # Compute angle for each metric
-            angles = np.linspace(0, 2*np.pi, num_metrics, endpoint=False).tolist()
-            angles += angles[:1]  # Close the polygon
-            
-            # Plot each language
-            for lang_name, values in metrics_by_lang.items():
-                values += values[:1]  # Close the polygon
-                ax.plot(angles, values, linewidth=2, label=lang_name)
-                ax.fill(angles, values, alpha=0.1)
-            
-            # Set labels
-            ax.set_xticks(angles[:-1])
-            ax.set_xticklabels(metric_names)
-            
-            # Add legend
-            plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-            plt.title('Evaluation Metrics by Programming Language', size=15)
-            plt.savefig('evaluation_plots/metrics_radar_chart.png')
-            plt.close()
+            plots.append(('metrics_radar_chart.png', _plot_metrics_radar_chart, (metrics_by_lang, metric_names)))
         
         # 3. Quality score by difficulty level for each language
-        level_data = []
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                for level in self.difficulty_levels:
-                    level_df = df[df['level'] == level]
-                    if not level_df.empty:
-                        level_data.append({
-                            'Language': lang_name,
-                            'Difficulty': level.capitalize(),
-                            'Quality Score': level_df['quality_score'].mean()
-                        })
-        
-        if level_data:
-            level_df = pd.DataFrame(level_data)
-            plt.figure(figsize=(12, 8))
-            sns.barplot(x='Language', y='Quality Score', hue='Difficulty', data=level_df)
-            plt.title('Question Quality Score by Language and Difficulty Level')
-            plt.savefig('evaluation_plots/quality_by_difficulty.png')
-            plt.close()
+        level_df = self._grouped_quality(question_frames, 'level', 'Difficulty', order=self.difficulty_levels)
+        if not level_df.empty:
+            level_df['Difficulty'] = level_df['Difficulty'].str.capitalize()
+            plots.append(('quality_by_difficulty.png', _plot_quality_by_difficulty, (level_df,)))
         
         # 4. Heatmap of correlation between metrics
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                
-                # Select metrics columns
-                metrics_df = df[metrics + ['quality_score']]
-                
-                # Calculate correlation
-                corr = metrics_df.corr()
-                
-                # Create heatmap
-                plt.figure(figsize=(12, 10))
-                mask = np.triu(np.ones_like(corr, dtype=bool))
-                sns.heatmap(corr, mask=mask, cmap='coolwarm', annot=True, fmt=".2f", square=True)
-                plt.title(f'Correlation Heatmap of Evaluation Metrics - {lang_name}')
-                plt.tight_layout()
-                plt.savefig(f'evaluation_plots/correlation_heatmap_{lang_name}.png')
-                plt.close()
+        for lang_name, df in question_frames:
+            corr = df[metrics + ['quality_score']].corr()
+            plots.append((f'correlation_heatmap_{lang_name}.png', _plot_correlation_heatmap, (corr, lang_name)))
         
         # 5. Distribution of quality scores
-        plt.figure(figsize=(14, 8))
-        for i, (lang, lang_name) in enumerate(zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                                self.languages)):
-            if lang in self.dfs:
-                plt.subplot(2, 2, i+1)
-                df = self.dfs[lang]
-                sns.histplot(df['quality_score'], kde=True)
-                plt.axvline(df['quality_score'].mean(), color='r', linestyle='--')
-                plt.title(f'Quality Score Distribution - {lang_name}')
-                plt.xlabel('Quality Score')
-                plt.ylabel('Count')
-        
-        plt.tight_layout()
-        plt.savefig('evaluation_plots/quality_distribution.png')
-        plt.close()
+        quality_scores = {lang_name: self.dfs[lang]['quality_score']
+                          for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
+                                                     self.languages)
+                          if lang in self.dfs}
+        positions = {lang_name: i + 1 for i, lang_name in enumerate(self.languages)}
+        plots.append(('quality_distribution.png', _plot_quality_distribution, (quality_scores, positions)))
         
         # 6. Boxplots of linguistic complexity by difficulty level
-        plt.figure(figsize=(14, 8))
-        ling_data = []
-        
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                for _, row in df.iterrows():
-                    ling_data.append({
-                        'Language': lang_name,
-                        'Difficulty': row['level'].capitalize(),
-                        'Linguistic Complexity': row['linguistic_complexity']
-                    })
-        
-        if ling_data:
-            ling_df = pd.DataFrame(ling_data)
-            sns.boxplot(x='Difficulty', y='Linguistic Complexity', hue='Language', data=ling_df)
-            plt.title('Linguistic Complexity by Difficulty Level')
-            plt.savefig('evaluation_plots/linguistic_complexity_boxplot.png')
-            plt.close()
+        if question_frames:
+            ling_df = pd.concat([
+                pd.DataFrame({
+                    'Language': lang_name,
+                    'Difficulty': df['level'].str.capitalize(),
+                    'Linguistic Complexity': df['linguistic_complexity']
+                })
+                for lang_name, df in question_frames
+            ], ignore_index=True)
+            if not ling_df.empty:
+                plots.append(('linguistic_complexity_boxplot.png', _plot_linguistic_complexity_boxplot, (ling_df,)))
         
         # 7. Bar chart of top 10 algorithms by quality score
-        algo_data = []
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                for algo in df['algorithm'].unique():
-                    algo_df = df[df['algorithm'] == algo]
-                    algo_data.append({
-                        'Language': lang_name,
-                        'Algorithm': algo,
-                        'Quality Score': algo_df['quality_score'].mean()
-                    })
-        
-        if algo_data:
-            algo_df = pd.DataFrame(algo_data)
+        algo_df = self._grouped_quality(question_frames, 'algorithm', 'Algorithm')
+        if not algo_df.empty:
             top_algos = algo_df.nlargest(10, 'Quality Score')
-            
-            plt.figure(figsize=(14, 8))
-            sns.barplot(x='Quality Score', y='Algorithm', hue='Language', data=top_algos)
-            plt.title('Top 10 Algorithms by Question Quality Score')
-            plt.savefig('evaluation_plots/top_algorithms.png')
-            plt.close()
+            plots.append(('top_algorithms.png', _plot_top_algorithms, (top_algos,)))
+        
+        self._render_plots(plots, max_workers=max_workers, force=force)
         
         print("\nVisualization complete. Plots saved to 'evaluation_plots' directory.")
 
-    def analyze_blooms_by_code_complexity(self):
+    def _grouped_quality(self, question_frames, column, label, order=None):
+        """Mean quality score per value of `column` (first-seen order, or `order`) for each language"""
+        frames = []
+        for lang_name, df in question_frames:
+            means = df.groupby(column, sort=False)['quality_score'].mean()
+            if order is not None:
+                means = means.reindex([value for value in order if value in means.index])
+            frames.append(pd.DataFrame({
+                'Language': lang_name,
+                label: means.index,
+                'Quality Score': means.to_numpy()
+            }))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _render_plots(self, plots, max_workers=None, force=False):
+        """
+        Render (file name, render function, args) plots into evaluation_plots/.
+
+        Each figure is drawn by render(path, *args) with the Agg backend, in worker
+        processes or, with max_workers=1, in this process (the previous backend is
+        restored afterwards). A hash of each figure's input data is kept in plot_cache.json, and
+        figures whose data and renderer are unchanged are not redrawn.
+        """
+        os.makedirs('evaluation_plots', exist_ok=True)
+        manifest_path = os.path.join('evaluation_plots', 'plot_cache.json')
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        
+        pending = {}
+        for filename, render, args in plots:
+            path = os.path.join('evaluation_plots', filename)
+            data_hash = _plot_data_hash(render, args)
+            if force or manifest.get(filename) != data_hash or not os.path.exists(path):
+                pending[filename] = (path, render, args, data_hash)
+        
+        if not pending:
+            return
+        
+        if max_workers == 1:
+            backend = matplotlib.get_backend()
+            _init_plot_worker()
+            try:
+                for path, render, args, data_hash in pending.values():
+                    render(path, *args)
+            finally:
+                matplotlib.use(backend)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_plot_worker) as pool:
+                futures = [pool.submit(render, path, *args) for path, render, args, _ in pending.values()]
+                for future in futures:
+                    future.result()
+        
+        manifest.update({filename: item[3] for filename, item in pending.items()})
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    def analyze_blooms_by_code_complexity(self, max_workers=None, force=False):
         """Analyze the relationship between code complexity and Bloom's taxonomy levels"""
-        combined_data = []
+        frames = []
         
         for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
                                   self.languages):
             if lang in self.dfs:
                 df = self.dfs[lang]
                 
-                # Group by complexity and calculate average Bloom's level
-                for complexity in df['complexity'].unique():
-                    complexity_df = df[df['complexity'] == complexity]
-                    bloom_dist = complexity_df['blooms_level'].value_counts(normalize=True).to_dict()
-                    
-                    # Add to combined data
-                    for bloom_level, proportion in bloom_dist.items():
-                        combined_data.append({
-                            'Language': lang_name,
-                            'Code Complexity': complexity,
-                            'Bloom\'s Level': bloom_level,
-                            'Proportion': proportion
-                        })
-        
-        if combined_data:
-            blooms_df = pd.DataFrame(combined_data)
-            
-            plt.figure(figsize=(15, 10))
-            g = sns.catplot(
-                data=blooms_df, kind="bar",
-                x="Code Complexity", y="Proportion", hue="Bloom\'s Level",
-                col="Language", height=6, aspect=.7
-            )
-            
-            g.set_axis_labels("Code Complexity", "Proportion of Questions")
-            g.set_titles("{col_name}")
-            plt.tight_layout()
-            plt.savefig('evaluation_plots/blooms_by_complexity.png')
-            plt.close()
+                # Proportion of each Bloom's level within each code complexity group
+                bloom_dist = df.groupby('complexity', sort=False)['blooms_level'].value_counts(normalize=True)
+                bloom_dist = bloom_dist.reindex(df['complexity'].unique(), level=0)
+                frames.append(pd.DataFrame({
+                    'Language': lang_name,
+                    'Code Complexity': bloom_dist.index.get_level_values(0),
+                    'Bloom\'s Level': bloom_dist.index.get_level_values(1),
+                    'Proportion': bloom_dist.to_numpy()
+                }))
+        
+        if frames:
+            blooms_df = pd.concat(frames, ignore_index=True)
+            self._render_plots([('blooms_by_complexity.png', _plot_blooms_by_complexity, (blooms_df,))],
+                               max_workers=max_workers, force=force)
             
             print("\nAnalysis of Bloom's levels by code complexity complete.")
 
-    def generate_summary_statistics(self):
-        """Generate summary statistics for all evaluation metrics"""
-        summary_stats = {}
+    def generate_summary_statistics(self, summary_stats=None):
+        """
+        Generate summary statistics for all evaluation metrics
+
+        summary_stats maps language -> metric -> statistic; it is computed from
+        self.dfs unless given (as evaluate_questions_streaming does)
+        """
+        if summary_stats is None:
+            summary_stats = {}
         
-        for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
-                                  self.languages):
-            if lang in self.dfs:
-                df = self.dfs[lang]
-                
-                # Calculate summary statistics for each metric
-                metrics = [
-                    'linguistic_complexity', 'code_coverage', 'blooms_distribution',
-                    'precision_score', 'recall_score', 'novelty_score', 
-                    'educational_alignment', 'cognitive_diversity', 'quality_score'
-                ]
-                
-                lang_stats = {}
-                for metric in metrics:
-                    lang_stats[metric] = {
-                        'mean': df[metric].mean(),
-                        'median': df[metric].median(),
-                        'std': df[metric].std(),
-                        'min': df[metric].min(),
-                        'max': df[metric].max()
-                    }
-                
-                summary_stats[lang_name] = lang_stats
+            for lang, lang_name in zip(['C_questions', 'CPP_questions', 'Java_questions', 'Python_questions'], 
+                                      self.languages):
+                if lang in self.dfs:
+                    df = self.dfs[lang]
+                
+                    # Calculate summary statistics for each metric
+                    metrics = [
+                        'linguistic_complexity', 'code_coverage', 'blooms_distribution',
+                        'precision_score', 'recall_score', 'novelty_score', 
+                        'educational_alignment', 'cognitive_diversity', 'quality_score'
+                    ]
+                
+                    lang_stats = {}
+                    for metric in metrics:
+                        lang_stats[metric] = {
+                            'mean': df[metric].mean(),
+                            'median': df[metric].median(),
+                            'std': df[metric].std(),
+                            'min': df[metric].min(),
+                            'max': df[metric].max()
+                        }
+                
+                    summary_stats[lang_name] = lang_stats
         
         # Save summary statistics to CSV
         if summary_stats:
@@ -933,8 +1423,18 @@ class QuestionEvaluator:
             
             return stats_df
 
-    def evaluate_questions(self, file_paths):
-        """Run the complete evaluation pipeline"""
+    def evaluate_questions(self, file_paths, metrics=None, max_workers=None, metric_store=None):
+        """
+        Run the complete evaluation pipeline
+
+        metrics optionally restricts the run to the listed metrics (stage names or
+        output columns such as 'quality_score'); only the stages they depend on are
+        run and the cross-language reports and plots are skipped.
+
+        metric_store is an optional path to a QuestionMetricStore. Per-question metrics
+        of questions seen in earlier runs are restored from it and only new or changed
+        questions are evaluated; algorithm-level metrics and reports are always recomputed.
+        """
         print("=== Starting Question Evaluation ===")
         
         # Step 1: Load data
@@ -945,38 +1445,22 @@ class QuestionEvaluator:
         print("\nPreprocessing data...")
         self.preprocess_data()
         
-        # Step 3: Evaluate linguistic complexity
-        print("\nEvaluating linguistic complexity...")
-        self.evaluate_linguistic_complexity()
-        
-        # Step 4: Evaluate code coverage
-        print("\nEvaluating code coverage...")
-        self.evaluate_code_coverage()
-        
-        # Step 5: Analyze Bloom's taxonomy
-        print("\nAnalyzing Bloom's taxonomy...")
-        self.analyze_blooms_taxonomy()
+        store = QuestionMetricStore(metric_store) if metric_store else None
+        if store:
+            print("\nLoading stored question metrics...")
+            new_hashes = self._load_stored_metrics(store)
         
-        # Step 6: Evaluate precision and recall
-        print("\nEvaluating precision and recall...")
-        self.evaluate_precision_recall()
-        
-        # Step 7: Evaluate novelty
-        print("\nEvaluating novelty...")
-        self.evaluate_novelty()
-        
-        # Step 8: Evaluate educational alignment
-        print("\nEvaluating educational alignment...")
-        self.evaluate_educational_alignment()
-        
-        # Step 9: Evaluate cognitive diversity
-        print("\nEvaluating cognitive diversity...")
-        self.evaluate_cognitive_diversity()
-        
-        # Step 10: Calculate overall quality score
-        print("\nCalculating overall quality score...")
-        self.calculate_overall_quality_score()
+        # Steps 3-10: Metric stages, independent ones running concurrently
+        self.run_metric_stages(metrics, max_workers=max_workers)
         
+        if store:
+            self._save_stored_metrics(store, new_hashes)
+            store.close()
+
+        if metrics is not None:
+            print("\n=== Question Evaluation Complete ===")
+            return
+
         # Step 11: Generate comparative report
         print("\nGenerating comparative report...")
         self.generate_comparative_report()
@@ -995,6 +1479,237 @@ class QuestionEvaluator:
         
         print("\n=== Question Evaluation Complete ===")
 
+    def evaluate_questions_streaming(self, file_paths, chunksize=10000, questions_output=None, max_workers=None):
+        """
+        Run the evaluation over question files too large to hold in memory
+
+        Each language file is read `chunksize` rows at a time. A first pass runs the
+        per-question metric stages on each chunk, spills the columns needed later to a
+        temporary file and folds the chunk into mergeable algorithm-level aggregates
+        (coverage sets, Bloom's counts, normalization maxima). A second pass over the
+        spill applies the merged aggregates, so every score matches evaluate_questions,
+        and accumulates mergeable summary statistics. Per-question rows are appended to
+        `questions_output` (a CSV file) when given. Registered plugin stages run per chunk,
+        and the chunks share one process pool for the built-in stages.
+
+        The comparative report and summary statistics are written to the same files as
+        evaluate_questions; self.dfs is left untouched and no plots are drawn.
+        """
+        print("=== Starting Streaming Question Evaluation ===")
+
+        # Per-question columns needed to finish the aggregate-dependent metrics
+        spill_columns = [
+            'algorithm', 'complexity', 'question', 'level', 'flesch_kincaid_grade',
+            'avg_sentence_length', 'blooms_level', 'blooms_value', 'precision_score',
+            'bloom_novelty', 'element_count', 'advanced_question'
+        ]
+        write_header = True
+        summary_stats = {}
+
+        # One process pool runs the metric stages of every chunk (see run_metric_stages)
+        with contextlib.ExitStack() as stack:
+            processes = (stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+                         if max_workers != 1 else None)
+            for lang_name in self.languages:
+                if lang_name not in file_paths:
+                    continue
+                key = f"{lang_name}_questions"
+                aggregates = _MetricAggregates()
+                n_questions = 0
+
+                with tempfile.TemporaryFile() as spill:
+                    # Pass 1: per-question metrics and partial aggregates, chunk by chunk
+                    for chunk in pd.read_csv(file_paths[lang_name], chunksize=chunksize):
+                        chunk_dfs = {key: self._extract_questions(chunk, lang_name)}
+                        if chunk_dfs[key].empty:
+                            continue
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            self.run_metric_stages(['linguistic_complexity', 'precision_score', 'novelty_score'],
+                                                   max_workers=max_workers, dfs=chunk_dfs, processes=processes)
+                        questions = chunk_dfs[key]
+                        aggregates.update(self, questions)
+                        pickle.dump(questions[spill_columns], spill)
+                        n_questions += len(questions)
+
+                    print(f"Processed {n_questions} questions for {lang_name}")
+                    if not n_questions:
+                        continue
+
+                    # Finalize the algorithm-level aggregates
+                    max_fk_grade = max(10, aggregates.max_fk_grade)
+                    max_elements = max(aggregates.max_element_count, 1)
+                    coverage = pd.Series({algo: self._algorithm_coverage(*sets)['overall_coverage']
+                                          for algo, sets in aggregates.element_sets.items()})
+                    blooms_matrix = aggregates.blooms_counts
+                    blooms_distribution = pd.Series(self._normalized_entropy(blooms_matrix.to_numpy()),
+                                                    index=blooms_matrix.index)
+                    cognitive_diversity = pd.Series(self._cognitive_diversity_scores(blooms_matrix.to_numpy()),
+                                                    index=blooms_matrix.index)
+
+                    # Pass 2: aggregate-dependent metrics and summary statistics
+                    stats = {metric: _RunningStats() for metric in self.report_metrics}
+                    spill.seek(0)
+                    while True:
+                        try:
+                            questions = pickle.load(spill)
+                        except EOFError:
+                            break
+
+                        self._score_linguistic_complexity(questions, max_fk_grade)
+                        questions['code_coverage'] = questions['algorithm'].map(coverage)
+                        questions['recall_score'] = questions['code_coverage']
+                        questions['blooms_distribution'] = questions['algorithm'].map(blooms_distribution)
+                        self._score_novelty(questions, max_elements)
+                        self._score_educational_alignment(questions)
+                        questions['cognitive_diversity'] = questions['algorithm'].map(cognitive_diversity)
+                        questions['quality_score'] = self._weighted_quality_score(questions)
+
+                        for metric, metric_stats in stats.items():
+                            metric_stats.update(questions[metric])
+
+                        if questions_output:
+                            questions.insert(0, 'language', lang_name)
+                            questions.to_csv(questions_output, mode='w' if write_header else 'a',
+                                             header=write_header, index=False)
+                            write_header = False
+
+                summary_stats[lang_name] = {metric: metric_stats.summary() for metric, metric_stats in stats.items()}
+
+        # Reports over the merged statistics
+        print("\nGenerating comparative report...")
+        self.generate_comparative_report({
+            lang_name: {metric: stats['mean'] for metric, stats in lang_stats.items()}
+            for lang_name, lang_stats in summary_stats.items()
+        })
+
+        print("\nGenerating summary statistics...")
+        self.generate_summary_statistics(summary_stats)
+
+        print("\n=== Streaming Question Evaluation Complete ===")
+
+def _run_metric_stage_process(func, frames):
+    """Run a metric stage in a worker process, returning its frames and report"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        func(frames)
+    return frames, buffer.getvalue()
+
+def _init_plot_worker():
+    """Plot workers render off-screen"""
+    matplotlib.use('Agg')
+
+def _plot_data_hash(render, args):
+    """Hash a figure's renderer and input data"""
+    digest = hashlib.sha256(render.__name__.encode('utf-8'))
+    digest.update(render.__code__.co_code)
+    digest.update(repr([c for c in render.__code__.co_consts if isinstance(c, (str, int, float))]).encode('utf-8'))
+    for arg in args:
+        if isinstance(arg, dict):
+            digest.update(_plot_data_hash(render, tuple(arg.items())).encode('utf-8'))
+        elif isinstance(arg, tuple):
+            digest.update(_plot_data_hash(render, arg).encode('utf-8'))
+        elif isinstance(arg, pd.DataFrame):
+            digest.update(repr(list(arg.columns)).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(arg, index=True).to_numpy().tobytes())
+        elif isinstance(arg, pd.Series):
+            digest.update(repr(arg.name).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(arg, index=True).to_numpy().tobytes())
+        else:
+            digest.update(repr(arg).encode('utf-8'))
+    return digest.hexdigest()
+
+def _plot_quality_by_language_complexity(path, quality_df):
+    plt.figure(figsize=(12, 8))
+    sns.barplot(x='Language', y='Quality Score', hue='Complexity', data=quality_df)
+    plt.title('Question Quality Score by Language and Code Complexity')
+    plt.savefig(path)
+    plt.close()
+
+def _plot_metrics_radar_chart(path, metrics_by_lang, metric_names):
+    # Create radar plot
+    plt.figure(figsize=(10, 10))
+    ax = plt.subplot(111, polar=True)
+    
+    # Number of metrics
+    num_metrics = len(metric_names)
+    
+    # Compute angle for each metric
+    angles = np.linspace(0, 2*np.pi, num_metrics, endpoint=False).tolist()
+    angles += angles[:1]  # Close the polygon
+    
+    # Plot each language
+    for lang_name, values in metrics_by_lang.items():
+        values = values + values[:1]  # Close the polygon
+        ax.plot(angles, values, linewidth=2, label=lang_name)
+        ax.fill(angles, values, alpha=0.1)
+    
+    # Set labels
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(metric_names)
+    
+    # Add legend
+    plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+    plt.title('Evaluation Metrics by Programming Language', size=15)
+    plt.savefig(path)
+    plt.close()
+
+def _plot_quality_by_difficulty(path, level_df):
+    plt.figure(figsize=(12, 8))
+    sns.barplot(x='Language', y='Quality Score', hue='Difficulty', data=level_df)
+    plt.title('Question Quality Score by Language and Difficulty Level')
+    plt.savefig(path)
+    plt.close()
+
+def _plot_correlation_heatmap(path, corr, lang_name):
+    plt.figure(figsize=(12, 10))
+    mask = np.triu(np.ones_like(corr, dtype=bool))
+    sns.heatmap(corr, mask=mask, cmap='coolwarm', annot=True, fmt=".2f", square=True)
+    plt.title(f'Correlation Heatmap of Evaluation Metrics - {lang_name}')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+def _plot_quality_distribution(path, quality_scores, positions):
+    plt.figure(figsize=(14, 8))
+    for lang_name, scores in quality_scores.items():
+        plt.subplot(2, 2, positions[lang_name])
+        sns.histplot(scores, kde=True)
+        plt.axvline(scores.mean(), color='r', linestyle='--')
+        plt.title(f'Quality Score Distribution - {lang_name}')
+        plt.xlabel('Quality Score')
+        plt.ylabel('Count')
+    
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+def _plot_linguistic_complexity_boxplot(path, ling_df):
+    plt.figure(figsize=(14, 8))
+    sns.boxplot(x='Difficulty', y='Linguistic Complexity', hue='Language', data=ling_df)
+    plt.title('Linguistic Complexity by Difficulty Level')
+    plt.savefig(path)
+    plt.close()
+
+def _plot_top_algorithms(path, top_algos):
+    plt.figure(figsize=(14, 8))
+    sns.barplot(x='Quality Score', y='Algorithm', hue='Language', data=top_algos)
+    plt.title('Top 10 Algorithms by Question Quality Score')
+    plt.savefig(path)
+    plt.close()
+
+def _plot_blooms_by_complexity(path, blooms_df):
+    g = sns.catplot(
+        data=blooms_df, kind="bar",
+        x="Code Complexity", y="Proportion", hue="Bloom\'s Level",
+        col="Language", height=6, aspect=.7
+    )
+    
+    g.set_axis_labels("Code Complexity", "Proportion of Questions")
+    g.set_titles("{col_name}")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close('all')
+
 # Example usage
 if __name__ == "__main__":
     # Create evaluator
@@ -1014,8 +1729,8 @@ if __name__ == "__main__":
             'Python': 'CodeQualityMetricsFinal-Python.csv'
         }
         
-        # Run evaluation
-        evaluator.evaluate_questions(file_paths)
+        # Run evaluation, reusing per-question metrics from earlier runs
+        evaluator.evaluate_questions(file_paths, metric_store='question_metrics.sqlite')
         
         # Restore stdout
         sys.stdout = original_stdout
@@ -1,11 +1,34 @@
 import ast
 import re
+import csv
+import sys
+import json
+import math
+import time
+import hashlib
+import heapq
+import itertools
 import random
+import select
+import shutil
+import selectors
+import atexit
+import threading
 import subprocess
 import tempfile
+import sqlite3
 import os
 from enum import Enum
-from typing import List, Dict, Any, Optional, Tuple, Set
+from collections import OrderedDict, Counter, defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Set, Union, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # not available on Windows; tests then run without limits
+    resource = None
+
+from sandbox_worker import pack_message, unpack_message, encode_value, decode_value, termination_error
 
 class DifficultyLevel(Enum):
     BEGINNER = "beginner"
@@ -18,6 +41,9 @@ class Language(Enum):
     CPP = "cpp"
     C = "c"
 
+# Bloom's taxonomy levels, from the simplest to the most complex
+BLOOM_LEVELS = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
+
 class CodeParser:
     """Base class for language-specific parsers"""
     
@@ -44,6 +70,45 @@ class CodeParser:
     def identify_algorithm(self, code: str) -> Optional[str]:
         """Identify algorithm in the code"""
         raise NotImplementedError("Subclasses must implement this method")
+    
+    def importance_context(self, code: str) -> Dict[str, Any]:
+        """The whole-file facts element_importance needs: line nesting depths and call counts"""
+        return {
+            'depths': self._line_depths(code),
+            'calls': Counter(re.findall(r'\b(\w+)\s*\(', code))
+        }
+    
+    def _line_depths(self, code: str) -> List[int]:
+        """Brace nesting depth at the start of each line"""
+        depths = []
+        depth = 0
+        for line in code.split('\n'):
+            depths.append(depth)
+            depth = max(0, depth + line.count('{') - line.count('}'))
+        return depths
+    
+    def element_importance(self, kind: str, element: Dict[str, Any], context: Dict[str, Any]) -> float:
+        """
+        How much an extracted element is worth asking about, 1 for the least
+
+        Functions gain with their call fan-in (calls other than the
+        definition) and recursion, variables with how often they are
+        modified, and loops and conditionals with their nesting depth, so a
+        throwaway counter weighs less than a recursive partition function.
+        """
+        importance = 1.0
+        if kind == 'function':
+            fan_in = max(0, context['calls'][element.get('name')] - 1)
+            importance += 0.5 * min(fan_in, 6) + (2.0 if element.get('is_recursive') else 0.0)
+        elif kind == 'variable':
+            importance += 0.25 * min(len(element.get('modifications', [])) - 1, 8)
+        elif kind in ('loop', 'conditional'):
+            depths = context['depths']
+            line = element.get('line_num', 0) - 1
+            importance += 0.5 * min(depths[line] if 0 <= line < len(depths) else 0, 6)
+        elif kind == 'algorithm':
+            importance += 1.0
+        return round(importance, 2)
 
 class PythonParser(CodeParser):
     """Parser for Python code"""
@@ -257,6 +322,21 @@ class PythonParser(CodeParser):
         else:
             return "unknown"
     
+    def _line_depths(self, code: str) -> List[int]:
+        """Indentation depth of each line (blank and comment lines take the depth of the line before)"""
+        depths = []
+        indents = [0]
+        for line in code.split('\n'):
+            stripped = line.lstrip()
+            if stripped and not stripped.startswith('#'):
+                width = len(line) - len(stripped)
+                while width < indents[-1]:
+                    indents.pop()
+                if width > indents[-1]:
+                    indents.append(width)
+            depths.append(len(indents) - 1)
+        return depths
+    
     def identify_algorithm(self, code: str) -> Optional[str]:
         """Identify algorithm in Python code based on patterns"""
         for algo, pattern in self.algorithm_patterns.items():
@@ -309,6 +389,8 @@ class JavaParser(CodeParser):
         # Match method declarations
         method_pattern = r'(?:public|private|protected)?\s+(?:static\s+)?(?:\w+(?:<.+>)?)\s+(\w+)\s*\((.*?)\)'
         
+        # The estimate covers the whole file, so it is the same for every function
+        complexity = self._estimate_complexity(parsed_code['code'])
         for i, line in enumerate(parsed_code['lines']):
             match = re.search(method_pattern, line)
             if match:
@@ -334,7 +416,7 @@ class JavaParser(CodeParser):
                     'param_types': [p['type'] for p in params],
                     'line_num': i + 1,
                     'is_recursive': is_recursive,
-                    'complexity': self._estimate_complexity(parsed_code['code'])
+                    'complexity': complexity
                 })
         
         return functions
@@ -505,6 +587,8 @@ class CppParser(CodeParser):
         # Match function declarations
         func_pattern = r'(?:(?:inline|static|constexpr|virtual)\s+)?(?:\w+\s+)?(\w+)\s*\((.*?)\)\s*(?:const)?\s*{'
         
+        # The estimate covers the whole file, so it is the same for every function
+        complexity = self._estimate_complexity(parsed_code['code'])
         for i, line in enumerate(parsed_code['lines']):
             match = re.search(func_pattern, line)
             if match:
@@ -530,7 +614,7 @@ class CppParser(CodeParser):
                     'params': params,
                     'line_num': i + 1,
                     'is_recursive': is_recursive,
-                    'complexity': self._estimate_complexity(parsed_code['code'])
+                    'complexity': complexity
                 })
         
         return functions
@@ -699,6 +783,8 @@ class CParser(CodeParser):
         # Match function declarations (simplified for C)
         func_pattern = r'(?:static\s+)?(?:\w+\s+)?(\w+)\s*\((.*?)\)\s*{'
         
+        # The estimate covers the whole file, so it is the same for every function
+        complexity = self._estimate_complexity(parsed_code['code'])
         for i, line in enumerate(parsed_code['lines']):
             match = re.search(func_pattern, line)
             if match:
@@ -724,7 +810,7 @@ class CParser(CodeParser):
                     'params': params,
                     'line_num': i + 1,
                     'is_recursive': is_recursive,
-                    'complexity': self._estimate_complexity(parsed_code['code'])
+                    'complexity': complexity
                 })
         
         return functions
@@ -851,144 +937,1686 @@ class CParser(CodeParser):
         return None
 
 
-class MultiLanguageQuestionGenerator:
-    def print_bloom_template_distribution(self):
-        """Print the number of templates per Bloom level for each category and difficulty."""
-        from collections import Counter, defaultdict
-        print("\nBloom's Template Distribution by Category and Difficulty:")
-        summary = defaultdict(lambda: Counter())
-        for category, diff_dict in self.question_templates.items():
-            for difficulty, templates in diff_dict.items():
-                blooms = [t['bloom'] for t in templates]
-                bloom_counts = Counter(blooms)
-                summary[category, difficulty] = bloom_counts
-        # Print nicely
-        for (category, difficulty), bloom_counts in summary.items():
-            print(f"  {category} [{difficulty.name}]:")
-            for bloom, count in sorted(bloom_counts.items()):
-                print(f"    {bloom:10}: {count}")
-        # Also print total per Bloom level
-        total = Counter()
-        for bloom_counts in summary.values():
-            total.update(bloom_counts)
-        print("\nTotal templates per Bloom level:")
-        for bloom, count in sorted(total.items()):
-            print(f"  {bloom:10}: {count}")
+SANDBOX_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sandbox_worker.py')
+
+
+def _test_result(test_id: Any, status: str, message: str, response: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a test_results entry, carrying over what the worker measured"""
+    response = response or {}
+    return {
+        'test_id': test_id,
+        'status': status,
+        'message': message,
+        'value': response.get('value'),
+        'exception_type': response.get('exception_type'),
+        'wall_time': response.get('wall_time'),
+        'cpu_user': response.get('cpu_user'),
+        'cpu_system': response.get('cpu_system'),
+        'peak_rss': response.get('peak_rss'),
+        'peak_memory': response.get('peak_memory'),
+        'cached': False
+    }
+
+
+def _test_outcome(test_id: Any, response: Dict[str, Any], expected_output: Any) -> Dict[str, Any]:
+    """Turn a decoded worker response into a passed/failed/error test result"""
+    if response['status'] != 'ok':
+        return _test_result(test_id, 'error', response['message'], response)
+
+    actual_value = response['value']
+    if actual_value == expected_output:
+        return _test_result(test_id, 'passed', 'Test passed successfully', response)
+    return _test_result(test_id, 'failed', f'Expected {expected_output}, but got {actual_value}', response)
 
+
+def _call_request(test_case: Dict[str, Any], binary_threshold: Optional[int], measure_memory: bool) -> Tuple[Dict[str, Any], bytes]:
+    payload = bytearray()
+    inputs = encode_value(list(test_case.get('inputs', [])), payload, binary_threshold)
+    message = {
+        'op': 'call',
+        'function': test_case.get('function_name'),
+        'inputs': inputs,
+        'binary_threshold': binary_threshold,
+        'measure_memory': measure_memory
+    }
+    if test_case.get('min_time'):
+        message['min_time'] = test_case['min_time']
+    return message, bytes(payload)
+
+
+def _decode_response(response: Dict[str, Any], payload: bytes) -> Dict[str, Any]:
+    if 'value' in response:
+        response['value'] = decode_value(response['value'], payload)
+    return response
+
+
+class ResourceLimits:
     """
-    Enhanced question generator for multiple programming languages
-    with difficulty levels and more sophisticated templates
+    Operating system limits applied to every test process (POSIX only)
+
+    cpu_time is the CPU seconds allowed per test, memory the address space
+    and file_size the largest file a test may write, both in bytes.
+    processes sets RLIMIT_NPROC, which stops a fork bomb. It is off by
+    default because the kernel counts every process and thread of the real
+    user, not just the test's children. On a shared host where the grading
+    user already runs that many tasks, every fork in a test would fail. Set
+    it only when tests run as a dedicated user. output caps what a compiled
+    test may print. None disables a limit. Python workers enforce cpu_time
+    themselves, test by test, because one worker runs many tests.
     """
-    
-    def __init__(self):
-        self.parsers = {
-            Language.PYTHON: PythonParser(),
-            Language.JAVA: JavaParser(),
-            Language.CPP: CppParser(),
-            Language.C: CParser()
+
+    def __init__(self, cpu_time: Optional[float] = 5, memory: Optional[int] = 512 * 2**20,
+                 file_size: Optional[int] = 16 * 2**20, processes: Optional[int] = None,
+                 output: Optional[int] = 16 * 2**20):
+        self.cpu_time = cpu_time
+        self.memory = memory
+        self.file_size = file_size
+        self.processes = processes
+        self.output = output
+
+    def wall_timeout(self, timeout: float, budget: float = 1) -> float:
+        """
+        timeout, raised so a test is never killed by the wall clock before its CPU limit
+
+        budget is how many times cpu_time the process may use in total.
+        """
+        if self.cpu_time is None:
+            return timeout
+        return max(timeout, budget * self.cpu_time + 1)
+
+    def apply(self, cpu_time: bool = True, memory: bool = True, processes: bool = True):
+        """Set the limits on the current process; called in the child before exec"""
+        limits = [(resource.RLIMIT_CORE, 0), (resource.RLIMIT_FSIZE, self.file_size)]
+        if cpu_time and self.cpu_time is not None:
+            limits.append((resource.RLIMIT_CPU, math.ceil(self.cpu_time)))
+        if memory:
+            limits.append((resource.RLIMIT_AS, self.memory))
+        if processes and hasattr(resource, 'RLIMIT_NPROC'):
+            limits.append((resource.RLIMIT_NPROC, self.processes))
+        for limit, value in limits:
+            if value is None:
+                continue
+            soft, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            # SIGXCPU at the soft CPU limit, SIGKILL a second later if it is caught
+            new_hard = value
+            if limit == resource.RLIMIT_CPU and (hard == resource.RLIM_INFINITY or value < hard):
+                new_hard = value + 1
+            resource.setrlimit(limit, (value, new_hard))
+
+    def preexec_fn(self, **kwargs):
+        """A subprocess preexec_fn applying these limits, or None where unsupported"""
+        if resource is None:
+            return None
+        return lambda: self.apply(**kwargs)
+
+
+def _cpu_fields(rusage) -> Dict[str, Any]:
+    """
+    cpu_user and cpu_system from a child's resource usage
+
+    The child's ru_maxrss is not used: it keeps the high-water mark of the
+    parent's memory image that was forked before exec, so test processes
+    report their own peak RSS instead.
+    """
+    if rusage is None:
+        return {}
+    return {'cpu_user': rusage.ru_utime, 'cpu_system': rusage.ru_stime}
+
+
+def _run_limited(command: List[str], stdin: bytes, cwd: str, timeout: float,
+                 limits: Optional[ResourceLimits], **limit_options) -> Dict[str, Any]:
+    """
+    Run a test process under limits and collect its resource usage
+
+    Like subprocess.run(..., capture_output=True, timeout=timeout), but the
+    child is reaped with os.wait4 so its CPU time and peak RSS are known even
+    when it is killed, and output beyond limits.output stops the process.
+    Returns returncode, stdout, stderr, timed_out, output_exceeded,
+    wall_time and rusage (None where os.wait4 is unavailable).
+    """
+    env = {'PATH': os.environ.get('PATH', os.defpath)}
+    start = time.perf_counter()
+    if os.name != 'posix':
+        try:
+            process = subprocess.run(command, input=stdin, capture_output=True, cwd=cwd, env=env, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            return {'returncode': None, 'stdout': e.stdout or b'', 'stderr': e.stderr or b'', 'timed_out': True,
+                    'output_exceeded': False, 'wall_time': time.perf_counter() - start, 'rusage': None}
+        return {'returncode': process.returncode, 'stdout': process.stdout, 'stderr': process.stderr,
+                'timed_out': False, 'output_exceeded': False, 'wall_time': time.perf_counter() - start,
+                'rusage': None}
+
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               cwd=cwd, env=env,
+                               preexec_fn=limits.preexec_fn(**limit_options) if limits else None)
+    output = {process.stdout.fileno(): bytearray(), process.stderr.fileno(): bytearray()}
+    output_limit = limits.output if limits and limits.output is not None else math.inf
+    pending = memoryview(stdin)
+    deadline = start + timeout
+    timed_out = output_exceeded = False
+
+    with selectors.DefaultSelector() as selector:
+        if pending:
+            selector.register(process.stdin, selectors.EVENT_WRITE)
+        else:
+            process.stdin.close()
+        selector.register(process.stdout, selectors.EVENT_READ)
+        selector.register(process.stderr, selectors.EVENT_READ)
+
+        while selector.get_map():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in selector.select(remaining):
+                if key.fileobj is process.stdin:
+                    try:
+                        pending = pending[os.write(key.fd, pending[:1 << 16]):]
+                    except BrokenPipeError:
+                        pending = pending[:0]
+                    if not pending:
+                        selector.unregister(process.stdin)
+                        process.stdin.close()
+                    continue
+                chunk = os.read(key.fd, 1 << 16)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                output[key.fd] += chunk
+                if len(output[key.fd]) > output_limit:
+                    output_exceeded = True
+                    break
+            if output_exceeded:
+                break
+
+    # The pipes are closed; wait for the exit status within the same deadline
+    while not (timed_out or output_exceeded):
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            break
+        if time.perf_counter() >= deadline:
+            timed_out = True
+        else:
+            time.sleep(0.001)
+    if timed_out or output_exceeded:
+        process.kill()
+        _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    wall_time = time.perf_counter() - start
+
+    stdout, stderr = bytes(output[process.stdout.fileno()]), bytes(output[process.stderr.fileno()])
+    for stream in (process.stdin, process.stdout, process.stderr):
+        stream.close()
+    return {'returncode': process.returncode, 'stdout': stdout, 'stderr': stderr, 'timed_out': timed_out,
+            'output_exceeded': output_exceeded, 'wall_time': wall_time, 'rusage': rusage}
+
+
+class _PythonTestWorker:
+    """A started sandbox_worker.py process, talked to one framed message at a time"""
+
+    def __init__(self, limits: Optional[ResourceLimits] = None):
+        # Isolated mode (-I) in an empty scratch directory with a minimal
+        # environment, so submissions see neither our files nor our settings.
+        # The worker sets its own per-test CPU limit (see sandbox_worker.py).
+        self.sandbox_dir = tempfile.mkdtemp(prefix='qg_sandbox_')
+        self.process = subprocess.Popen(
+            [sys.executable, '-I', SANDBOX_WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.sandbox_dir,
+            env={'PATH': os.environ.get('PATH', os.defpath)},
+            preexec_fn=limits.preexec_fn(cpu_time=False) if limits else None
+        )
+        self._buffer = bytearray()
+
+    def request(self, message: Dict[str, Any], timeout: float, payload: bytes = b'') -> Dict[str, Any]:
+        """
+        Send one message and wait for the decoded reply
+
+        Raises TimeoutError if no reply arrives within timeout seconds and
+        EOFError if the worker has died.
+        """
+        try:
+            self.process.stdin.write(pack_message(message, payload))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise EOFError('test worker exited unexpectedly')
+
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        while True:
+            received = unpack_message(self._buffer)
+            if received is not None:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, 1 << 20)
+            if not chunk:
+                raise EOFError('test worker exited unexpectedly')
+            self._buffer += chunk
+
+        response, response_payload, consumed = received
+        del self._buffer[:consumed]
+        return _decode_response(response, response_payload)
+
+    def kill(self, grace: float = 0) -> int:
+        """Stop the worker, giving it grace seconds to exit by itself; returns its exit status"""
+        try:
+            self.process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+        shutil.rmtree(self.sandbox_dir, ignore_errors=True)
+        return self.process.returncode
+
+
+class PythonTestWorkerPool:
+    """
+    Pool of pre-started sandboxed workers for Python unit tests
+
+    A submission is loaded into one worker once and all of its test cases
+    are run there over a pipe, instead of starting an interpreter per test.
+    Each worker serves a single submission and is then replaced, so student
+    code never shares an interpreter; up to `size` replacements are started
+    ahead of time to keep interpreter start-up off the critical path. A
+    worker that times out, crashes or exceeds its limits is killed and the
+    submission reloaded into a fresh one for the remaining tests.
+
+    With fork=True the workers are fork servers: the loaded submission stays
+    untouched in the worker and each test runs in a fork() of it, so tests
+    are isolated from each other at copy-on-write cost. A hung or crashed
+    test then only loses its child process.
+    """
+
+    def __init__(self, size: int = 1, timeout: float = 5, limits: Optional[ResourceLimits] = None,
+                 fork: bool = False):
+        if fork and not hasattr(os, 'fork'):
+            raise ValueError('Fork-server test workers need os.fork (POSIX only)')
+        self.size = size
+        self.timeout = timeout
+        self.limits = limits or ResourceLimits()
+        self.fork = fork
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> _PythonTestWorker:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _PythonTestWorker(self.limits)
+
+    def _replenish(self):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(_PythonTestWorker(self.limits))
+
+    def _start_submission(self, code: str, test_count: int) -> Tuple[_PythonTestWorker, Optional[Dict[str, Any]]]:
+        """Load code into a worker; returns the worker and the failed load response, if any"""
+        worker = self._acquire()
+        message = {'op': 'load', 'code': code}
+        if self.limits.cpu_time is not None:
+            # Loading counts as one more test against the worker's total CPU budget
+            message.update(cpu_time=self.limits.cpu_time, cpu_budget=self.limits.cpu_time * (test_count + 1))
+        try:
+            response = worker.request(message, self.limits.wall_timeout(self.timeout))
+        except TimeoutError:
+            return worker, {'status': 'error', 'message': 'Loading the code timed out (possibly infinite loop)'}
+        except EOFError as e:
+            returncode = worker.kill(grace=1)
+            if returncode is not None and returncode < 0:
+                return worker, termination_error(returncode)
+            return worker, {'status': 'error', 'message': f'Unexpected error: {str(e)}'}
+        if response['status'] != 'ok':
+            return worker, response
+        return worker, None
+
+    def run_tests(self, code: str, test_cases: List[Dict[str, Any]], binary_threshold: Optional[int] = None,
+                  measure_memory: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run every test case against code, returning one result per test
+
+        binary_threshold sends int/float lists of at least that many items
+        as packed arrays instead of JSON; measure_memory records each test's
+        peak Python allocation with tracemalloc.
+        """
+        test_results = []
+        worker, load_error = self._start_submission(code, len(test_cases))
+        try:
+            for test_case in test_cases:
+                test_id = test_case.get('id', 'unknown')
+                function_name = test_case.get('function_name')
+                expected_output = test_case.get('expected_output')
+
+                if not function_name or expected_output is None:
+                    test_results.append(_test_result(
+                        test_id, 'error', 'Invalid test case: missing function name or expected output'))
+                    continue
+                if load_error:
+                    test_results.append(_test_result(test_id, 'error', load_error['message'], load_error))
+                    continue
+
+                message, payload = _call_request(test_case, binary_threshold, measure_memory)
+                timeout = self.limits.wall_timeout(self.timeout)
+                if self.fork:
+                    # The fork server enforces the timeout itself; ours only catches a stuck server
+                    message.update(fork=True, timeout=timeout)
+                    timeout += 1
+                try:
+                    response = worker.request(message, timeout, payload)
+                except (TimeoutError, EOFError) as e:
+                    # Recycle the hung or dead worker before the next test
+                    returncode = worker.kill(grace=0 if isinstance(e, TimeoutError) else 1)
+                    if isinstance(e, TimeoutError):
+                        test_results.append(_test_result(test_id, 'error', 'Test timed out (possibly infinite loop)'))
+                    elif returncode < 0:
+                        error = termination_error(returncode)
+                        test_results.append(_test_result(test_id, 'error', error['message'], error))
+                    else:
+                        test_results.append(_test_result(test_id, 'error', f'Unexpected error: {str(e)}'))
+                    worker, load_error = self._start_submission(code, len(test_cases))
+                    continue
+
+                test_results.append(_test_outcome(test_id, response, expected_output))
+        finally:
+            worker.kill()
+            self._replenish()
+
+        return test_results
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+
+def private_cache_dir(name: str, path: Optional[str] = None) -> str:
+    """
+    A cache directory that only the current user can write to
+
+    Defaults to <$XDG_CACHE_HOME or ~/.cache>/multiprogramming_qg/<name>. A
+    missing directory is created with mode 0700. PermissionError is raised
+    for a symlink, a directory owned by another user, or one that group or
+    others can write to. Otherwise anyone on the machine could plant cached
+    results or binaries under the expected keys.
+    """
+    if path is None:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        path = os.path.join(base, 'multiprogramming_qg', name)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if os.path.islink(path) or not os.path.isdir(path):
+        raise PermissionError(f'Cache directory {path} is not a plain directory')
+    if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+        raise PermissionError(f'Cache directory {path} is not owned by the current user')
+    if info.st_mode & 0o022:
+        raise PermissionError(f'Cache directory {path} is writable by group or others')
+    return path
+
+
+TEST_DRIVERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_drivers')
+DRIVER_RESULT_MARKER = b'\n__QG_RESULT__\n'
+DRIVER_PEAK_RSS_PATTERN = re.compile(rb'\n__QG_PEAK_RSS__ (\d+)$')
+
+_C_INTEGER_TYPES = {
+    'int', 'short', 'short int', 'long', 'long int', 'long long', 'long long int',
+    'unsigned', 'unsigned int', 'unsigned short', 'unsigned long', 'unsigned long long',
+    'signed', 'signed int', 'size_t', 'int8_t', 'int16_t', 'int32_t', 'int64_t',
+    'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t', 'bool', '_Bool'
+}
+_C_REAL_TYPES = {'float', 'double', 'long double'}
+
+
+class CompilationError(Exception):
+    """Raised when a submission or its test driver does not compile"""
+
+
+def _c_value_kind(base_type: str, depth: int) -> Optional[str]:
+    """Classify a C type as integer, real, char, string or array:<element kind>"""
+    if base_type == 'char':
+        return {0: 'char', 1: 'string'}.get(depth)
+    if base_type in _C_INTEGER_TYPES:
+        element = 'bool' if base_type in ('bool', '_Bool') else 'integer'
+    elif base_type in _C_REAL_TYPES:
+        element = 'real'
+    else:
+        return None
+    return {0: element, 1: f'array:{element}'}.get(depth)
+
+
+def _parse_c_declaration(declaration: str, named: bool = True) -> Tuple[str, str, int]:
+    """Split a C declaration into (base type, name, pointer/array depth)"""
+    declaration = re.sub(r'\b(const|volatile|register|restrict|static|inline|extern)\b', ' ', declaration)
+    depth = declaration.count('*') + len(re.findall(r'\[[^\]]*\]', declaration))
+    words = re.sub(r'\[[^\]]*\]', ' ', declaration).replace('*', ' ').split()
+    if named and len(words) > 1:
+        return ' '.join(words[:-1]), words[-1], depth
+    return ' '.join(words), '', depth
+
+
+def _encode_driver_input(value: Any, out: bytearray):
+    """
+    Append value to a compiled test driver's stdin
+
+    Numbers are whitespace-separated tokens, strings are '<byte length> <bytes>'
+    and sequences, sets and dicts are an item count followed by the items
+    (keys and values alternating for dicts).
+    """
+    if isinstance(value, bool):
+        out += b'1 ' if value else b'0 '
+    elif isinstance(value, int):
+        out += b'%d ' % value
+    elif isinstance(value, float):
+        if value != value:
+            out += b'NaN '
+        elif value in (float('inf'), float('-inf')):
+            out += b'Infinity ' if value > 0 else b'-Infinity '
+        else:
+            out += repr(value).encode('ascii') + b' '
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out += b'%d ' % len(data) + data + b' '
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        out += b'%d ' % len(value)
+        for item in value:
+            _encode_driver_input(item, out)
+    elif isinstance(value, dict):
+        out += b'%d ' % len(value)
+        for key, item in value.items():
+            _encode_driver_input(key, out)
+            _encode_driver_input(item, out)
+    else:
+        raise TypeError(f"Unsupported input value for compiled tests: {value!r}")
+
+
+class CompiledTestRunner:
+    """
+    Compile-and-run unit tests for C, C++ and Java submissions
+
+    For every function under test a small driver (see test_drivers/) is
+    compiled together with the submission. It reads the test inputs from
+    stdin, calls the function and prints the result in the encoding
+    sandbox_worker.py uses, so results compare exactly like Python ones.
+    Build directories are cached under cache_dir by a hash of the compiler
+    version, flags and sources, so a submission is compiled once however
+    many tests or re-gradings use it; compiler errors are cached too. The
+    cached binaries are run, so cache_dir must be private to the grader
+    (see private_cache_dir). Builds unused for max_age seconds are removed,
+    and past max_cache_bytes the least recently used builds are removed
+    until the cache is below 80% of that.
+    """
+
+    COMPILERS = {'c': 'gcc', 'cpp': 'g++', 'java': 'javac'}
+
+    def __init__(self, cache_dir: Optional[str] = None, compile_timeout: float = 60,
+                 max_cache_bytes: int = 512 * 2**20, max_age: float = 7 * 24 * 3600):
+        self.cache_dir = private_cache_dir('compiled', cache_dir)
+        self.compile_timeout = compile_timeout
+        self.max_cache_bytes = max_cache_bytes
+        self.max_age = max_age
+        self.flags = {
+            'c': ['-O2', '-std=c11', '-w'],
+            'cpp': ['-O2', '-std=c++17', '-w'],
+            'java': ['-nowarn', '-encoding', 'UTF-8']
         }
-        
-        self.question_templates = self._initialize_question_templates()
-    
-    def _initialize_question_templates(self) -> Dict[str, Dict[DifficultyLevel, List[Dict[str, str]]]]:
-        """Initialize question templates for different code elements and difficulty levels, with Bloom's taxonomy annotation"""
-        # Each template is a dict with 'template' and 'bloom' keys
-        # --- BEGIN PATCH: Add more templates for underrepresented Bloom levels ---
-        return {
-            'function': {
-                DifficultyLevel.BEGINNER: [
-                    {"template": "Analyze the consequences of removing function '{name}' from the code.", "bloom": "analyze"},
-                    {"template": "Evaluate the impact of function '{name}' on code maintainability.", "bloom": "evaluate"},
-                    {"template": "Apply the function '{name}' to a new set of inputs and predict the output.", "bloom": "apply"},
-                    {"template": "Demonstrate how to use function '{name}' in a real-world scenario.", "bloom": "apply"},
-                    {"template": "Analyze the effect of changing a parameter in function '{name}'.", "bloom": "analyze"},
-                    {"template": "Evaluate the readability of function '{name}' and suggest improvements.", "bloom": "evaluate"},
-                    # ...existing code...
-                ],
-                DifficultyLevel.INTERMEDIATE: [
-                    {"template": "Analyze the dependencies between function '{name}' and other functions.", "bloom": "analyze"},
-                    {"template": "Evaluate the testability of function '{name}'.", "bloom": "evaluate"},
-                    {"template": "Apply function '{name}' to a boundary case and explain the result.", "bloom": "apply"},
-                    {"template": "Demonstrate the use of function '{name}' in a different context.", "bloom": "apply"},
-                    {"template": "Analyze the impact of removing a parameter from function '{name}'.", "bloom": "analyze"},
-                    {"template": "Evaluate the efficiency of function '{name}' for large datasets.", "bloom": "evaluate"},
-                    {"template": "Recall a scenario where function '{name}' would be most useful.", "bloom": "remember"},
-                    {"template": "List the possible outputs of function '{name}' given different inputs.", "bloom": "remember"},
-                    {"template": "Explain in detail how function '{name}' transforms its inputs to outputs.", "bloom": "understand"},
-                    {"template": "Summarize the changes you would make to function '{name}' to adapt it for a new requirement.", "bloom": "create"},
-                    {"template": "Devise a new use case for function '{name}' in a different context.", "bloom": "create"},
-                    # ...existing code...
-                    {"template": "Recall the return type of function '{name}'.", "bloom": "remember"},
-                    {"template": "List all parameters and their types for function '{name}'.", "bloom": "remember"},
-                    {"template": "Describe a scenario where function '{name}' would be useful.", "bloom": "understand"},
-                    {"template": "Summarize the changes you would make to function '{name}' to add a new feature.", "bloom": "create"},
-                    {"template": "Propose a modification to function '{name}' to improve its efficiency.", "bloom": "create"},
-                ],
-                DifficultyLevel.ADVANCED: [
-                    {"template": "Analyze the security implications of function '{name}'.", "bloom": "analyze"},
-                    {"template": "Evaluate the scalability of function '{name}' in distributed systems.", "bloom": "evaluate"},
-                    {"template": "Apply function '{name}' in a multi-threaded environment and discuss the outcome.", "bloom": "apply"},
-                    {"template": "Demonstrate how to refactor function '{name}' for better modularity.", "bloom": "apply"},
-                    {"template": "Analyze the trade-offs between time and space complexity in function '{name}'.", "bloom": "analyze"},
-                    {"template": "Evaluate the robustness of function '{name}' under invalid input.", "bloom": "evaluate"},
-                    {"template": "Recall a time when a similar function to '{name}' caused a bug. How would you prevent it here?", "bloom": "remember"},
-                    {"template": "Explain the rationale behind the design of function '{name}'.", "bloom": "understand"},
-                    {"template": "Summarize the improvements you would make to function '{name}' for scalability.", "bloom": "understand"},
-                    {"template": "Invent a new function that extends the capabilities of '{name}'.", "bloom": "create"},
-                    {"template": "Design a test suite to validate all edge cases for function '{name}'.", "bloom": "create"},
-                    # ...existing code...
-                    {"template": "Recall the signature and return type of function '{name}'.", "bloom": "remember"},
-                    {"template": "Describe the most complex part of function '{name}'.", "bloom": "understand"},
-                    {"template": "Summarize the improvements you would make to function '{name}' for scalability.", "bloom": "create"},
-                    {"template": "Invent a new function inspired by '{name}' that solves a related problem.", "bloom": "create"},
+        self.compilations = 0
+        self.cache_hits = 0
+        self._compiler_versions = {}
+        self._build_locks = {}
+        self._lock = threading.Lock()
+        self._cache_bytes = None
+        self.prune_cache()
+
+    def _read_driver(self, filename: str) -> str:
+        with open(os.path.join(TEST_DRIVERS_DIR, filename), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _c_driver_main(self, code: str, function_name: str) -> str:
+        """Generate a main() that reads the arguments of function_name and prints its result"""
+        match = re.search(r'(?m)^[ \t]*([A-Za-z_][\w \t\*]*?)[ \t\*]*\b' + re.escape(function_name)
+                          + r'\s*\(([^)]*)\)\s*\{', code)
+        if not match:
+            raise ValueError(f"Function '{function_name}' not found")
+        return_base, _, return_depth = _parse_c_declaration(match.group(1), named=False)
+        params = [p for p in match.group(2).split(',') if p.strip() and p.strip() != 'void']
+
+        lines = ['int main(void) {', '    __qg_read_size();']
+        args = []
+        first_array = None
+        for i, param in enumerate(params):
+            base, _, depth = _parse_c_declaration(param)
+            kind = _c_value_kind(base, depth)
+            var = f'__qg_arg{i}'
+            if kind is None:
+                raise ValueError(f"Unsupported parameter type '{param.strip()}' for compiled tests")
+            if kind == 'string':
+                lines.append(f'    char *{var} = __qg_read_string();')
+            elif kind == 'char':
+                lines.append(f'    char {var} = __qg_read_char();')
+            elif kind.startswith('array:'):
+                reader = 'real' if kind == 'array:real' else 'integer'
+                lines += [
+                    f'    size_t {var}_length = __qg_read_size();',
+                    f'    {base} *{var} = ({base} *)calloc({var}_length + 1, sizeof({base}));',
+                    f'    for (size_t __qg_i = 0; __qg_i < {var}_length; __qg_i++) '
+                    f'{var}[__qg_i] = ({base})__qg_read_{reader}();'
                 ]
-            },
-            'loop': {
-                DifficultyLevel.BEGINNER: [
-                    {"template": "Analyze the effect of removing the {type} loop on program output.", "bloom": "analyze"},
-                    {"template": "Evaluate the necessity of the {type} loop on line {line_num} for program correctness.", "bloom": "evaluate"},
-                    {"template": "Apply the {type} loop on line {line_num} to a new input and describe the result.", "bloom": "apply"},
-                    {"template": "Demonstrate the use of a different loop type for the same logic.", "bloom": "apply"},
-                    {"template": "Analyze the effect of changing the loop's start value.", "bloom": "analyze"},
-                    {"template": "Evaluate the maintainability of the {type} loop on line {line_num}.", "bloom": "evaluate"},
-                    # ...existing code...
-                ],
-                DifficultyLevel.INTERMEDIATE: [
-                    {"template": "Analyze the interaction between nested loops in the code.", "bloom": "analyze"},
-                    {"template": "Evaluate the impact of the {type} loop on memory usage.", "bloom": "evaluate"},
-                    {"template": "Apply the {type} loop to process a reversed list and explain the output.", "bloom": "apply"},
-                    {"template": "Demonstrate how to break out of the {type} loop early.", "bloom": "apply"},
-                    {"template": "Analyze the impact of nested loops on performance.", "bloom": "analyze"},
-                    {"template": "Evaluate the scalability of the {type} loop for large data sets.", "bloom": "evaluate"},
-                    {"template": "Recall a common mistake when writing {type} loops and how to avoid it.", "bloom": "remember"},
-                    {"template": "List all {type} loops in the code and their purposes.", "bloom": "remember"},
-                    {"template": "Explain why a {type} loop was chosen over other loop types on line {line_num}.", "bloom": "understand"},
-                    {"template": "Summarize the effect of changing the loop variable's increment in the {type} loop.", "bloom": "understand"},
-                    {"template": "Create a new {type} loop that achieves the same result with fewer lines of code.", "bloom": "create"},
-                    # ...existing code...
-                    {"template": "Recall the type of loop used on line {line_num}.", "bloom": "remember"},
-                    {"template": "List all variables modified inside the {type} loop on line {line_num}.", "bloom": "remember"},
-                    {"template": "Describe a real-world scenario where a {type} loop is appropriate.", "bloom": "understand"},
-                    {"template": "Summarize the changes you would make to the {type} loop to handle a new requirement.", "bloom": "create"},
-                ],
-                DifficultyLevel.ADVANCED: [
-                    {"template": "Analyze the concurrency issues that may arise in the {type} loop.", "bloom": "analyze"},
-                    {"template": "Evaluate the trade-offs of using the {type} loop versus recursion.", "bloom": "evaluate"},
-                    {"template": "Apply the {type} loop in a parallel processing context.", "bloom": "apply"},
-                    {"template": "Demonstrate loop fusion to optimize performance.", "bloom": "apply"},
-                    {"template": "Analyze the bottlenecks caused by the {type} loop.", "bloom": "analyze"},
-                    {"template": "Evaluate the effect of loop invariants on correctness.", "bloom": "evaluate"},
-                    {"template": "Recall a scenario where a poorly designed loop caused performance issues. How would you address it here?", "bloom": "remember"},
-                    {"template": "Explain the impact of loop unrolling on the {type} loop on line {line_num}.", "bloom": "understand"},
-                    {"template": "Summarize the trade-offs between different loop structures for this problem.", "bloom": "understand"},
-                    {"template": "Invent a new loop structure to optimize the code's performance.", "bloom": "create"},
-                    {"template": "Design a parallel version of the {type} loop for distributed systems.", "bloom": "create"},
-                    # ...existing code...
-                    {"template": "Recall the main variable controlling the {type} loop on line {line_num}.", "bloom": "remember"},
-                    {"template": "Describe the most complex aspect of the {type} loop on line {line_num}.", "bloom": "understand"},
-                    {"template": "Invent a new loop structure to optimize the code on line {line_num}.", "bloom": "create"},
+                if first_array is None:
+                    first_array = (var, kind[len('array:'):])
+            else:
+                reader = 'real' if kind == 'real' else 'integer'
+                lines.append(f'    {base} {var} = ({base})__qg_read_{reader}();')
+            args.append(var)
+
+        call = f'{function_name}({", ".join(args)})'
+        emitters = {
+            'integer': '__qg_emit_integer((long long){})',
+            'bool': '__qg_emit_bool((int){})',
+            'real': '__qg_emit_real((double){})',
+            'char': '__qg_emit_char({})',
+            'string': '__qg_emit_string({})'
+        }
+        if return_base == 'void' and return_depth == 0:
+            # A void function's result is its first array argument, e.g. an in-place sort
+            lines += [f'    {call};', '    __qg_begin_result();']
+            if first_array:
+                var, element = first_array
+                lines += [
+                    '    putchar(\'[\');',
+                    f'    for (size_t __qg_i = 0; __qg_i < {var}_length; __qg_i++) {{',
+                    '        if (__qg_i) putchar(\',\');',
+                    '        ' + emitters[element].format(f'{var}[__qg_i]') + ';',
+                    '    }',
+                    '    putchar(\']\');'
                 ]
-            },
+            else:
+                lines.append('    printf("null");')
+        else:
+            kind = _c_value_kind(return_base, return_depth)
+            if kind not in emitters:
+                raise ValueError(f"Unsupported return type '{match.group(1).strip()}' for compiled tests")
+            result_type = 'const char *' if kind == 'string' else return_base
+            lines += [f'    {result_type} __qg_result = {call};', '    __qg_begin_result();',
+                      '    ' + emitters[kind].format('__qg_result') + ';']
+
+        lines += ['    fflush(stdout);', '    return 0;', '}']
+        return '\n'.join(lines) + '\n'
+
+    def _driver_sources(self, language: str, code: str, function_name: str) -> Tuple[Dict[str, str], List[str], List[str]]:
+        """
+        Return the source files, the files passed to the compiler and the
+        command that runs the driver ({build} stands for the build directory)
+        """
+        if not re.fullmatch(r'[A-Za-z_]\w*', function_name):
+            raise ValueError(f"Invalid function name '{function_name}'")
+
+        # The submission is #included by the driver so compiler messages point at its own lines
+        if language == 'c':
+            driver = (self._read_driver('driver_prelude.c')
+                      + '#define main __qg_submission_main\n#include "submission.c"\n#undef main\n\n'
+                      + self._c_driver_main(code, function_name))
+            return {'submission.c': code, 'qg_driver.c': driver}, ['qg_driver.c'], ['{build}/program']
+
+        if language == 'cpp':
+            driver = ('#define main __qg_submission_main\n#include "submission.cpp"\n#undef main\n\n'
+                      + self._read_driver('driver.cpp').replace('__QG_FUNCTION__', function_name))
+            return {'submission.cpp': code, 'qg_driver.cpp': driver}, ['qg_driver.cpp'], ['{build}/program']
+
+        class_match = (re.search(r'\bpublic\s+(?:final\s+|abstract\s+)*class\s+(\w+)', code)
+                       or re.search(r'\bclass\s+(\w+)', code))
+        if not class_match:
+            raise ValueError('No class found in Java code')
+        package_match = re.search(r'(?m)^\s*package\s+([\w.]+)\s*;', code)
+        package = package_match.group(1) + '.' if package_match else ''
+        driver = self._read_driver('QgTestDriver.java')
+        driver = driver.replace('__QG_CLASS__', package + class_match.group(1)).replace('__QG_FUNCTION__', function_name)
+        if package:
+            driver = f'package {package_match.group(1)};\n' + driver
+        sources = {class_match.group(1) + '.java': code, 'QgTestDriver.java': driver}
+        return sources, sorted(sources), ['java', '-cp', '{build}/classes', package + 'QgTestDriver']
+
+    def _compiler_version(self, compiler: str) -> str:
+        with self._lock:
+            if compiler not in self._compiler_versions:
+                try:
+                    process = subprocess.run([compiler, '-version' if compiler == 'javac' else '--version'],
+                                             capture_output=True, text=True, timeout=self.compile_timeout)
+                except FileNotFoundError:
+                    raise CompilationError(f'{compiler} is not installed')
+                output = (process.stdout + process.stderr).strip()
+                self._compiler_versions[compiler] = output.splitlines()[0] if output else compiler
+            return self._compiler_versions[compiler]
+
+    def _compile_command(self, language: str, inputs: List[str]) -> List[str]:
+        if language == 'java':
+            return ['javac', *self.flags['java'], '-d', 'classes', *inputs]
+        return [self.COMPILERS[language], *self.flags[language], '-o', 'program', *inputs, '-lm']
+
+    def build(self, language: str, code: str, function_name: str) -> Tuple[str, List[str]]:
+        """
+        Compile the driver for function_name, reusing a cached build if any
+
+        Returns the build directory and the command that runs the driver
+        there. Raises CompilationError or ValueError (unsupported signature).
+        """
+        sources, inputs, run_command = self._driver_sources(language, code, function_name)
+        compile_command = self._compile_command(language, inputs)
+        key = hashlib.sha256(json.dumps([
+            language, self._compiler_version(self.COMPILERS[language]), compile_command,
+            sorted(sources.items())
+        ]).encode('utf-8')).hexdigest()
+        build_dir = os.path.join(self.cache_dir, key)
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            if os.path.isdir(build_dir):
+                with self._lock:
+                    self.cache_hits += 1
+                # Touch the build so pruning treats it as recently used
+                try:
+                    os.utime(build_dir)
+                except OSError:
+                    pass
+            else:
+                self._compile(language, sources, compile_command, build_dir)
+                with self._lock:
+                    if self._cache_bytes is not None:
+                        self._cache_bytes += self._tree_bytes(build_dir)
+                    prune = self._cache_bytes is None or self._cache_bytes > self.max_cache_bytes
+                if prune:
+                    self.prune_cache(keep=build_dir)
+
+        error_path = os.path.join(build_dir, 'compile_error.txt')
+        if os.path.exists(error_path):
+            with open(error_path, 'r', encoding='utf-8') as f:
+                raise CompilationError(f.read())
+        return build_dir, run_command
+
+    @staticmethod
+    def _tree_bytes(path: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    continue
+        return total
+
+    def prune_cache(self, keep: Optional[str] = None):
+        """Remove builds older than max_age, then the least recently used ones past max_cache_bytes (never keep)"""
+        builds = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                mtime = os.lstat(path).st_mtime
+            except OSError:
+                continue
+            # build-* directories are compilations still in progress
+            if name.startswith('build-') and now - mtime < self.compile_timeout * 2:
+                continue
+            builds.append((mtime, self._tree_bytes(path), path))
+        builds.sort()
+        total = sum(size for _, size, _ in builds)
+        for mtime, size, path in builds:
+            if path == keep:
+                continue
+            if now - mtime <= self.max_age and total <= self.max_cache_bytes * 0.8:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+        with self._lock:
+            self._cache_bytes = total
+
+    def _compile(self, language: str, sources: Dict[str, str], compile_command: List[str], build_dir: str):
+        work_dir = tempfile.mkdtemp(prefix='build-', dir=self.cache_dir)
+        try:
+            for filename, source in sources.items():
+                with open(os.path.join(work_dir, filename), 'w', encoding='utf-8') as f:
+                    f.write(source)
+            try:
+                process = subprocess.run(compile_command, capture_output=True,
+                                         text=True, cwd=work_dir, timeout=self.compile_timeout)
+                error = None if process.returncode == 0 else (process.stderr or process.stdout).strip()
+            except FileNotFoundError:
+                raise CompilationError(f'{self.COMPILERS[language]} is not installed')
+            except subprocess.TimeoutExpired:
+                error = 'Compilation timed out'
+            if error is not None:
+                with open(os.path.join(work_dir, 'compile_error.txt'), 'w', encoding='utf-8') as f:
+                    f.write(error)
+            with self._lock:
+                self.compilations += 1
+            # Publish atomically; another process may have finished the same build first
+            os.rename(work_dir, build_dir)
+        except OSError:
+            if not os.path.isdir(build_dir):
+                raise
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _run_driver(self, build_dir: str, run_command: List[str], stdin: bytes, sandbox_dir: str,
+                    timeout: float, limits: Optional[ResourceLimits] = None) -> Dict[str, Any]:
+        """Run one test; returns a response dict like the Python workers send"""
+        command = [arg.replace('{build}', build_dir) for arg in run_command]
+        limit_options = {}
+        if command[0] == 'java':
+            # The JVM reserves far more address space than it uses and runs
+            # many threads, so its heap is capped with -Xmx instead
+            limit_options = {'memory': False, 'processes': False}
+            if limits and limits.memory is not None:
+                command.insert(1, f'-Xmx{max(limits.memory // 2**20, 16)}m')
+        process = _run_limited(command, stdin, sandbox_dir, timeout, limits, **limit_options)
+        usage = dict(_cpu_fields(process['rusage']), wall_time=process['wall_time'])
+        if process['timed_out']:
+            return dict(usage, status='error', message='Test timed out (possibly infinite loop)')
+        if process['output_exceeded']:
+            return dict(usage, status='error', message='Output limit exceeded')
+        stderr = process['stderr'].decode('utf-8', 'replace').strip()
+
+        if process['returncode'] == 3 and stderr.startswith('ERROR:'):
+            message = stderr.splitlines()[0]
+            return dict(usage, status='error', exception_type=message[len('ERROR:'):].split(': ')[0].strip(),
+                        message=message)
+        if process['returncode'] < 0:
+            return dict(usage, **termination_error(process['returncode']))
+        if process['returncode'] != 0 or DRIVER_RESULT_MARKER not in process['stdout']:
+            return dict(usage, status='error',
+                        message=stderr or f"Runtime error: exit status {process['returncode']}")
+
+        head, output = process['stdout'].rsplit(DRIVER_RESULT_MARKER, 1)
+        peak_rss = DRIVER_PEAK_RSS_PATTERN.search(head)
+        if peak_rss:
+            usage['peak_rss'] = int(peak_rss.group(1))
+        try:
+            value = decode_value(json.loads(output.decode('utf-8', 'replace')))
+        except ValueError as e:
+            return dict(usage, status='error', message=f'Error evaluating output: {str(e)}')
+        return dict(usage, status='ok', value=value)
+
+    def run_tests(self, code: str, language: str, test_cases: List[Dict[str, Any]],
+                  timeout: float = 5, limits: Optional[ResourceLimits] = None) -> List[Dict[str, Any]]:
+        """
+        Run every test case against code ('c', 'cpp' or 'java'), returning one result per test
+
+        Each test runs in its own process under limits (a default
+        ResourceLimits if None); its CPU time and peak RSS come from the
+        kernel's accounting for that process.
+        """
+        limits = limits or ResourceLimits()
+        timeout = limits.wall_timeout(timeout)
+        test_results = []
+        builds = {}
+        sandbox_dir = tempfile.mkdtemp(prefix='qg_sandbox_')
+        try:
+            for test_case in test_cases:
+                test_id = test_case.get('id', 'unknown')
+                function_name = test_case.get('function_name')
+                expected_output = test_case.get('expected_output')
+
+                if not function_name or expected_output is None:
+                    test_results.append(_test_result(
+                        test_id, 'error', 'Invalid test case: missing function name or expected output'))
+                    continue
+
+                if function_name not in builds:
+                    try:
+                        builds[function_name] = (self.build(language, code, function_name), None)
+                    except (CompilationError, ValueError) as e:
+                        message = f'Compilation failed: {e}' if isinstance(e, CompilationError) else str(e)
+                        builds[function_name] = (None, {'status': 'error', 'message': message,
+                                                        'exception_type': type(e).__name__})
+                build, build_error = builds[function_name]
+                if build_error:
+                    test_results.append(_test_result(test_id, 'error', build_error['message'], build_error))
+                    continue
+
+                stdin = bytearray()
+                try:
+                    inputs = list(test_case.get('inputs', []))
+                    _encode_driver_input(len(inputs), stdin)
+                    for value in inputs:
+                        _encode_driver_input(value, stdin)
+                except TypeError as e:
+                    test_results.append(_test_result(test_id, 'error', str(e)))
+                    continue
+
+                response = self._run_driver(*build, bytes(stdin), sandbox_dir, timeout, limits)
+                test_results.append(_test_outcome(test_id, response, expected_output))
+        finally:
+            shutil.rmtree(sandbox_dir, ignore_errors=True)
+
+        return test_results
+
+
+class TestResultCache:
+    """
+    Two-tier cache of unit test results
+
+    A result is stored under its submission (a hash of the normalized
+    source, see source_hash), its test case (function, inputs and expected
+    output, see test_case_hash) and the runtime it ran on (interpreter or
+    compiler version, harness, execution mode and limits). The memory tier
+    is an LRU of at most max_entries results; the disk tier keeps one JSON
+    file per result under cache_dir (a private per-user directory, see
+    private_cache_dir) and, past max_disk_bytes, removes the
+    least recently used files. Only deterministic outcomes are stored:
+    passes, failures and exceptions, not timeouts, limit kills or crashes.
+    Results served from the cache are marked 'cached': True with their
+    'cache_tier', and keep the timings of the run that produced them.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 4096,
+                 max_disk_bytes: int = 64 * 2**20, disk: bool = True):
+        self.cache_dir = private_cache_dir('test_results', cache_dir) if disk else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._source_hashes = OrderedDict()
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+
+    def source_hash(self, code: str, language: Language) -> str:
+        """
+        Hash of the submission with formatting and comments normalized away
+
+        Python code is hashed by its AST (without line numbers); other
+        languages by their text with line endings and trailing whitespace
+        normalized, since compiler messages refer to line numbers.
+        """
+        raw_key = hashlib.sha256(f'{language.value}\0{code}'.encode('utf-8')).hexdigest()
+        with self._lock:
+            if raw_key in self._source_hashes:
+                self._source_hashes.move_to_end(raw_key)
+                return self._source_hashes[raw_key]
+
+        normalized = None
+        if language == Language.PYTHON:
+            try:
+                normalized = ast.dump(ast.parse(code))
+            except (SyntaxError, ValueError):
+                pass
+        if normalized is None:
+            normalized = '\n'.join(line.rstrip() for line in code.replace('\r\n', '\n').split('\n')).strip()
+        digest = hashlib.sha256(f'{language.value}\0{normalized}'.encode('utf-8')).hexdigest()
+
+        with self._lock:
+            self._source_hashes[raw_key] = digest
+            if len(self._source_hashes) > self.max_entries:
+                self._source_hashes.popitem(last=False)
+        return digest
+
+    def test_case_hash(self, test_case: Dict[str, Any]) -> str:
+        """Hash of what a test checks; its id is not part of it"""
+        content = [test_case.get('function_name'),
+                   encode_value(list(test_case.get('inputs', [])), bytearray()),
+                   encode_value(test_case.get('expected_output'), bytearray())]
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def key(self, source_hash: str, test_hash: str, runtime: str) -> str:
+        return hashlib.sha256(f'{source_hash}\0{test_hash}\0{runtime}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, key: str, test_id: Any = None) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for key, marked as cached, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return dict(entry, test_id=test_id, cached=True, cache_tier='memory')
+
+        entry = None
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                entry = dict(stored, value=decode_value(stored['value']))
+                # Touch the file so pruning treats it as recently used
+                os.utime(path)
+            except (OSError, ValueError, KeyError):
+                entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return dict(entry, test_id=test_id, cached=True, cache_tier='disk')
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a fresh result if its outcome is deterministic"""
+        exception_type = result.get('exception_type')
+        if result.get('cached') or not (
+                result['status'] in ('passed', 'failed')
+                or (result['status'] == 'error' and exception_type and not exception_type.startswith('SIG'))):
+            return
+        entry = {k: v for k, v in result.items() if k not in ('test_id', 'cached', 'cache_tier')}
+        with self._lock:
+            self._remember(key, entry)
+
+        if self.cache_dir:
+            try:
+                data = json.dumps(dict(entry, value=encode_value(entry['value'], bytearray())))
+            except (TypeError, ValueError):
+                return
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            with self._lock:
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_disk_bytes()
+                else:
+                    self._disk_bytes += len(data)
+                prune = self._disk_bytes > self.max_disk_bytes
+            if prune:
+                self._prune_disk()
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Add to the memory tier; the caller holds self._lock"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_files(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._disk_files())
+
+    def _prune_disk(self):
+        """Remove least recently used files until the disk tier is below 80% of its budget"""
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes * 0.8:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear(self):
+        """Empty both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self._source_hashes.clear()
+            self._disk_bytes = 0
+        if self.cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            private_cache_dir('test_results', self.cache_dir)
+
+
+_harness_fingerprint = None
+
+
+def _test_harness_fingerprint() -> str:
+    """Hash of the files that run tests, so changing them invalidates cached results"""
+    global _harness_fingerprint
+    if _harness_fingerprint is None:
+        digest = hashlib.sha256()
+        paths = [SANDBOX_WORKER_SCRIPT] + sorted(
+            os.path.join(TEST_DRIVERS_DIR, name) for name in os.listdir(TEST_DRIVERS_DIR))
+        for path in paths:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _harness_fingerprint = digest.hexdigest()
+    return _harness_fingerprint
+
+
+# Candidate classes for empirical complexity, simplest first, named like _estimate_complexity
+COMPLEXITY_CLASSES = [
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: math.log2(n)),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * math.log2(n)),
+    ('O(n²)', lambda n: float(n) ** 2),
+    ('O(n³)', lambda n: float(n) ** 3),
+    ('O(2^n)', lambda n: 2.0 ** n)
+]
+
+
+def _shingles(text: str, size: int = 2) -> Set[str]:
+    """Lower-cased word n-grams of text; placeholders such as {name} count as words"""
+    words = re.findall(r"\{\w+\}|[\w']+", text.lower())
+    if len(words) <= size:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles
+
+    The fraction of positions where two signatures agree estimates the
+    Jaccard similarity of the two texts' shingle sets. Shingles are hashed
+    with BLAKE2b, so signatures are the same in every process.
+    """
+
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm: int = 128, seed: int = 0):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [(rng.randrange(1, self.PRIME), rng.randrange(self.PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+                  for shingle in _shingles(text)]
+        return tuple(min((a * h + b) % self.PRIME for h in hashes) for a, b in self._permutations)
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class WeightedReservoir:
+    """
+    A weighted random sample of at most size items from a stream of unknown length
+
+    Efraimidis-Spirakis sampling: each offered item gets the key
+    log(u) / weight for a uniform u and the size largest keys are kept in a
+    heap, so an item is kept with probability proportional to its weight,
+    each offer costs O(log size) and memory never exceeds size items.
+    """
+
+    def __init__(self, size: int, rng: Any = None):
+        self.size = size
+        self.rng = make_rng(rng)
+        self.offered = 0
+        self._heap: List[Tuple[float, int, Any]] = []
+
+    def offer(self, item: Any, weight: float = 1.0) -> None:
+        self.offered += 1
+        if weight <= 0 or self.size <= 0:
+            return
+        # 1 - random() is in (0, 1], so the log is always defined
+        key = math.log(1.0 - self.rng.random()) / weight
+        entry = (key, self.offered, item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        """The kept items in the order they were offered"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[1])]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class AliasTable:
+    """
+    Vose's alias method: O(n) to build from n weights, then O(1) per weighted draw
+
+    Each of the n columns holds the probability of keeping its own index
+    and an alias index to take otherwise, so a draw is one uniform column
+    and one biased coin flip. Non-positive total weight draws uniformly.
+    """
+
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        if n == 0 or total <= 0:
+            return
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def draw(self, rng: Any = None) -> int:
+        rng = rng or random
+        column = rng.randrange(len(self.probability))
+        return column if rng.random() < self.probability[column] else self.alias[column]
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+
+def question_importance(question: Dict[str, Any]) -> float:
+    """The sampling weight of a question: the importance of its code element, 1 if unknown"""
+    return question.get('importance', 1.0)
+
+
+def sampling_table(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The alias table over the importance of questions and their number of Bloom levels, so each draw is O(1)"""
+    return {
+        'alias': AliasTable([question_importance(q) for q in questions]),
+        'levels': len({q.get('bloom', 'other') for q in questions})
+    }
+
+
+def question_element(question: Dict[str, Any]) -> str:
+    """The code element a question asks about, such as 'function:bubble_sort' or 'loop:12'"""
+    if 'element' in question:
+        return question['element']
+    for field in ('function_name', 'variable_name', 'line_num', 'algorithm_name'):
+        if field in question:
+            return f"{question.get('category')}:{question[field]}"
+    return str(question.get('category'))
+
+
+QUESTION_FIELDS = ['question', 'difficulty', 'category', 'bloom', 'template_id', 'function_name', 'loop_type',
+                   'line_num', 'variable_name', 'algorithm_name', 'answer', 'answer_key']
+
+
+def _open_output(file: Any):
+    """An open text file for a path or an already open file, and whether to close it"""
+    if hasattr(file, 'write'):
+        return file, False
+    return open(file, 'w', encoding='utf-8', newline=''), True
+
+
+def write_questions_csv(questions: Iterable[Dict[str, Any]], file: Any, fieldnames: List[str] = QUESTION_FIELDS) -> int:
+    """
+    Write question records to CSV as they arrive, returning how many were written
+
+    The columns are fixed up front (fields outside fieldnames are dropped and
+    missing ones left empty), so questions can come from iter_questions and
+    are never collected. Nested values such as answer_key are written as JSON.
+    """
+    out, close = _open_output(file)
+    try:
+        writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        count = 0
+        for q in questions:
+            writer.writerow({k: json.dumps(v, default=repr) if isinstance(v, (dict, list)) else v
+                             for k, v in q.items()})
+            count += 1
+        return count
+    finally:
+        if close:
+            out.close()
+
+
+def write_questions_jsonl(questions: Iterable[Dict[str, Any]], file: Any) -> int:
+    """Write question records as JSON lines as they arrive, returning how many were written"""
+    out, close = _open_output(file)
+    try:
+        count = 0
+        for q in questions:
+            out.write(json.dumps(q, ensure_ascii=False, default=repr))
+            out.write('\n')
+            count += 1
+        return count
+    finally:
+        if close:
+            out.close()
+
+
+def make_rng(seed: Union[None, int, str, random.Random] = None) -> Any:
+    """
+    The random source for a seed argument
+
+    A random.Random instance is used as it is and any other seed, None
+    included, starts a new random.Random, so calls with the same seed give
+    the same output and no call disturbs another across threads. Passing
+    the random module itself uses the shared module-level functions.
+    """
+    if seed is random or isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that have the same key into one computation
+
+    The first caller of do() for a key runs the function; callers that
+    arrive while it runs wait for it and get the same result (or
+    exception). Nothing is kept once the call finishes, so this only saves
+    work that overlaps in time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key: Any, function, *args) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event()}
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call['done'].wait()
+            if 'error' in call:
+                raise call['error']
+            return call['result']
+        
+        try:
+            call['result'] = function(*args)
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result']
+
+
+class QuestionBank:
+    """
+    SQLite store of every candidate question, for fast quiz serving
+
+    build() renders all (element, template) candidates of a code sample for
+    every difficulty once, with the code's language and algorithm, and
+    stores one row per candidate, indexed by code ID, category, difficulty
+    and Bloom level. Code is looked up by the hash of its text. When a
+    generator has a bank, generate_quiz serves banked code by sampling
+    light (Bloom level, template, element, importance, digest) rows, which are read once per code and then kept
+    in memory, and loading only the chosen questions; with the same seed
+    the quiz is the same as without the bank. Rebuild after changing the
+    templates.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS codes (
+            code_id INTEGER PRIMARY KEY,
+            source_hash TEXT NOT NULL UNIQUE,
+            path TEXT,
+            language TEXT NOT NULL,
+            algorithm TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            code_id INTEGER NOT NULL REFERENCES codes(code_id) ON DELETE CASCADE,
+            difficulty TEXT NOT NULL,
+            category TEXT,
+            bloom TEXT,
+            template_id TEXT,
+            element TEXT NOT NULL,
+            importance REAL NOT NULL DEFAULT 1,
+            digest TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS questions_by_level ON questions (code_id, difficulty, bloom);
+        CREATE INDEX IF NOT EXISTS questions_by_category ON questions (code_id, category);
+        CREATE INDEX IF NOT EXISTS questions_by_digest ON questions (code_id, digest);
+    """
+
+    # Banks written with another schema version are rebuilt from scratch
+    SCHEMA_VERSION = 3
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        if self._connection.execute('PRAGMA user_version').fetchone()[0] != self.SCHEMA_VERSION:
+            self._connection.executescript('DROP TABLE IF EXISTS questions; DROP TABLE IF EXISTS codes;')
+            self._connection.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+        self._connection.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+        # (code_id, language, algorithm, {difficulty: light rows}, {difficulty: sampling table}) by source hash
+        self._rows = {}
+
+    @staticmethod
+    def source_hash(code: str) -> str:
+        return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+    def build(self, generator: 'MultiLanguageQuestionGenerator', code: str, path: Optional[str] = None) -> int:
+        """Render and store all candidates of code (replacing earlier ones); returns its code ID"""
+        prepared = generator.prepare_quiz(code, mixed_difficulty=True)
+        source_hash = self.source_hash(code)
+        rows = []
+        for difficulty, candidates in prepared['candidates'].items():
+            for question in candidates:
+                data = json.dumps(question, sort_keys=True)
+                rows.append((difficulty, question.get('category'), question.get('bloom'),
+                             question.get('template_id'), question_element(question), question_importance(question),
+                             hashlib.sha256(data.encode('utf-8')).hexdigest(), data))
+        
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM codes WHERE source_hash = ?', (source_hash,))
+            code_id = self._connection.execute(
+                'INSERT INTO codes (source_hash, path, language, algorithm) VALUES (?, ?, ?, ?)',
+                (source_hash, path, prepared['language'], prepared['algorithm'])).lastrowid
+            self._connection.executemany(
+                'INSERT INTO questions (code_id, difficulty, category, bloom, template_id, element, importance, digest, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(code_id,) + row for row in rows])
+            self._rows.pop(source_hash, None)
+        return code_id
+
+    def build_corpus(self, generator: 'MultiLanguageQuestionGenerator', root: str = 'code_samples',
+                     extensions: Tuple[str, ...] = ('.py', '.java', '.cpp', '.c')) -> Dict[str, Any]:
+        """Build every code file under root; returns the code IDs by path and the files that failed"""
+        built, failed = {}, {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if not name.lower().endswith(extensions):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        built[path] = self.build(generator, f.read(), path)
+                except Exception as e:
+                    failed[path] = f'{type(e).__name__}: {e}'
+        return {'built': built, 'failed': failed}
+
+    def code_id(self, code: str) -> Optional[int]:
+        row = self._connection.execute('SELECT code_id FROM codes WHERE source_hash = ?',
+                                       (self.source_hash(code),)).fetchone()
+        return row[0] if row else None
+
+    def query(self, code_id: int, category: Optional[str] = None, difficulty: Optional[str] = None,
+              bloom: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The stored questions of a code, optionally filtered by category, difficulty and Bloom level"""
+        sql = 'SELECT data FROM questions WHERE code_id = ?'
+        args = [code_id]
+        for column, value in (('category', category), ('difficulty', difficulty), ('bloom', bloom)):
+            if value is not None:
+                sql += f' AND {column} = ?'
+                args.append(value)
+        with self._lock:
+            return [json.loads(data) for data, in self._connection.execute(sql + ' ORDER BY id', args)]
+
+    def prepared_quiz(self, code: str, mixed_difficulty: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        A prepare_quiz result for banked code, or None if code is not banked
+
+        The candidates are light rows holding only the Bloom level, template
+        ID, element, importance and digest of each question, which assemble_quiz samples
+        like full questions (equal questions have equal digests); load()
+        then fetches the chosen ones.
+        """
+        source_hash = self.source_hash(code)
+        entry = self._rows.get(source_hash)
+        if entry is None:
+            with self._lock:
+                code_row = self._connection.execute(
+                    'SELECT code_id, language, algorithm FROM codes WHERE source_hash = ?', (source_hash,)).fetchone()
+                if code_row is None:
+                    return None
+                candidates = {difficulty.value: [] for difficulty in DifficultyLevel}
+                for difficulty, bloom, template_id, element, importance, digest in self._connection.execute(
+                        'SELECT difficulty, bloom, template_id, element, importance, digest FROM questions '
+                        'WHERE code_id = ? ORDER BY id', (code_row[0],)):
+                    row = {'template_id': template_id, 'element': element, 'importance': importance, 'digest': digest}
+                    if bloom is not None:
+                        row['bloom'] = bloom
+                    candidates[difficulty].append(row)
+                tables = {difficulty: sampling_table(rows) for difficulty, rows in candidates.items()}
+                entry = self._rows[source_hash] = code_row + (candidates, tables)
+        
+        code_id, language, algorithm, candidates, tables = entry
+        if not mixed_difficulty:
+            candidates = {DifficultyLevel.INTERMEDIATE.value: candidates[DifficultyLevel.INTERMEDIATE.value]}
+        return {'code_id': code_id, 'language': language, 'algorithm': algorithm,
+                'mixed_difficulty': mixed_difficulty, 'candidates': candidates, 'tables': tables}
+
+    def load(self, code_id: int, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The full questions for light rows from prepared_quiz, in the same order"""
+        digests = sorted({row['digest'] for row in rows})
+        if not digests:
+            return []
+        with self._lock:
+            found = dict(self._connection.execute(
+                f"SELECT digest, data FROM questions WHERE code_id = ? AND digest IN ({', '.join('?' * len(digests))})",
+                [code_id] + digests))
+        return [json.loads(found[row['digest']]) for row in rows]
+
+    def close(self):
+        self._connection.close()
+
+
+def fit_complexity(sizes: List[int], times: List[float], tolerance: float = 0.25) -> Tuple[Optional[str], Dict[str, float]]:
+    """
+    Fit running times against COMPLEXITY_CLASSES
+
+    Each class g is fitted as time = a + b * g(n) with a, b >= 0, by least
+    squares on the relative residuals (time - fit) / time, and scored by
+    their root mean square. Returns the best class and the score of every
+    class that could be fitted; a simpler class wins if its score is within
+    tolerance of the best, so noise does not push the answer up the
+    hierarchy. The best class is None with fewer than four timed sizes.
+    """
+    points = [(n, t) for n, t in zip(sizes, times) if t > 0]
+    if len(points) < 4:
+        return None, {}
+    scores = {}
+    for name, g in COMPLEXITY_CLASSES:
+        try:
+            xs = [g(n) for n, _ in points]
+        except OverflowError:
+            continue
+        if max(xs) > 1e100:
+            continue
+        # Weighted least squares with weights 1 / t², i.e. on relative residuals
+        ws = [1 / t ** 2 for _, t in points]
+        w_sum = sum(ws)
+        wx = sum(w * x for w, x in zip(ws, xs))
+        wt = sum(w * t for w, (_, t) in zip(ws, points))
+        wxx = sum(w * x * x for w, x in zip(ws, xs))
+        wxt = sum(w * x * t for w, x, (_, t) in zip(ws, xs, points))
+        det = w_sum * wxx - wx * wx
+        if det <= 1e-12 * w_sum * wxx:
+            a, b = wt / w_sum, 0.0
+        else:
+            b = (w_sum * wxt - wx * wt) / det
+            a = (wt - b * wx) / w_sum
+            if b < 0:
+                continue
+            if a < 0:
+                a, b = 0.0, wxt / wxx
+        scores[name] = math.sqrt(sum(((t - (a + b * x)) / t) ** 2 for x, (_, t) in zip(xs, points)) / len(points))
+    if not scores:
+        return None, scores
+    best_score = min(scores.values())
+    best = next(name for name, _ in COMPLEXITY_CLASSES
+                if name in scores and scores[name] <= best_score * (1 + tolerance) + 0.01)
+    return best, scores
+
+
+class MultiLanguageQuestionGenerator:
+    def print_bloom_template_distribution(self):
+        """Print the number of templates per Bloom level for each category and difficulty."""
+        from collections import Counter, defaultdict
+        print("\nBloom's Template Distribution by Category and Difficulty:")
+        summary = defaultdict(lambda: Counter())
+        for category, diff_dict in self.question_templates.items():
+            for difficulty, templates in diff_dict.items():
+                blooms = [t['bloom'] for t in templates]
+                bloom_counts = Counter(blooms)
+                summary[category, difficulty] = bloom_counts
+        # Print nicely
+        for (category, difficulty), bloom_counts in summary.items():
+            print(f"  {category} [{difficulty.name}]:")
+            for bloom, count in sorted(bloom_counts.items()):
+                print(f"    {bloom:10}: {count}")
+        # Also print total per Bloom level
+        total = Counter()
+        for bloom_counts in summary.values():
+            total.update(bloom_counts)
+        print("\nTotal templates per Bloom level:")
+        for bloom, count in sorted(total.items()):
+            print(f"  {bloom:10}: {count}")
+
+    """
+    Enhanced question generator for multiple programming languages
+    with difficulty levels and more sophisticated templates
+    """
+    
+    def __init__(self):
+        self.parsers = {
+            Language.PYTHON: PythonParser(),
+            Language.JAVA: JavaParser(),
+            Language.CPP: CppParser(),
+            Language.C: CParser()
+        }
+        
+        self.question_templates = self._initialize_question_templates()
+        # Limits for every unit test process; change before the first test run
+        self.test_limits = ResourceLimits()
+        # Cache of unit test results (a default TestResultCache is created on first use)
+        self.test_result_cache = None
+        self._test_worker_pools = {}
+        self._compiled_test_runner = None
+        # Concurrent candidate generation for the same code and parameters runs once
+        self._candidate_flights = SingleFlight()
+        # Sampling tables of the candidates of recently seen code, by the same key
+        # as the candidate flights, least recently used first
+        self.max_sampling_tables = 256
+        self._sampling_tables = OrderedDict()
+        self._sampling_tables_lock = threading.Lock()
+        # Optional QuestionBank that generate_quiz serves banked code from
+        self.question_bank = None
+        # Estimated template similarity (MinHash) at which two questions about the
+        # same element count as near-duplicates when sampling; None disables the filter
+        self.near_duplicate_threshold = 0.55
+        self._minhasher = MinHasher()
+        self._near_duplicates = None
+    
+    def _initialize_question_templates(self) -> Dict[str, Dict[DifficultyLevel, List[Dict[str, str]]]]:
+        """Initialize question templates for different code elements and difficulty levels, with Bloom's taxonomy annotation"""
+        # Each template is a dict with 'template' and 'bloom' keys
+        # --- BEGIN PATCH: Add more templates for underrepresented Bloom levels ---
+        return {
+            'function': {
+                DifficultyLevel.BEGINNER: [
+                    {"template": "Analyze the consequences of removing function '{name}' from the code.", "bloom": "analyze"},
+                    {"template": "Evaluate the impact of function '{name}' on code maintainability.", "bloom": "evaluate"},
+                    {"template": "Apply the function '{name}' to a new set of inputs and predict the output.", "bloom": "apply"},
+                    {"template": "Demonstrate how to use function '{name}' in a real-world scenario.", "bloom": "apply"},
+                    {"template": "Analyze the effect of changing a parameter in function '{name}'.", "bloom": "analyze"},
+                    {"template": "Evaluate the readability of function '{name}' and suggest improvements.", "bloom": "evaluate"},
+                    # ...existing code...
+                ],
+                DifficultyLevel.INTERMEDIATE: [
+                    {"template": "Analyze the dependencies between function '{name}' and other functions.", "bloom": "analyze"},
+                    {"template": "Evaluate the testability of function '{name}'.", "bloom": "evaluate"},
+                    {"template": "Apply function '{name}' to a boundary case and explain the result.", "bloom": "apply"},
+                    {"template": "Demonstrate the use of function '{name}' in a different context.", "bloom": "apply"},
+                    {"template": "Analyze the impact of removing a parameter from function '{name}'.", "bloom": "analyze"},
+                    {"template": "Evaluate the efficiency of function '{name}' for large datasets.", "bloom": "evaluate"},
+                    {"template": "Recall a scenario where function '{name}' would be most useful.", "bloom": "remember"},
+                    {"template": "List the possible outputs of function '{name}' given different inputs.", "bloom": "remember"},
+                    {"template": "Explain in detail how function '{name}' transforms its inputs to outputs.", "bloom": "understand"},
+                    {"template": "Summarize the changes you would make to function '{name}' to adapt it for a new requirement.", "bloom": "create"},
+                    {"template": "Devise a new use case for function '{name}' in a different context.", "bloom": "create"},
+                    # ...existing code...
+                    {"template": "Recall the return type of function '{name}'.", "bloom": "remember"},
+                    {"template": "List all parameters and their types for function '{name}'.", "bloom": "remember"},
+                    {"template": "Describe a scenario where function '{name}' would be useful.", "bloom": "understand"},
+                    {"template": "Summarize the changes you would make to function '{name}' to add a new feature.", "bloom": "create"},
+                    {"template": "Propose a modification to function '{name}' to improve its efficiency.", "bloom": "create"},
+                ],
+                DifficultyLevel.ADVANCED: [
+                    {"template": "Analyze the security implications of function '{name}'.", "bloom": "analyze"},
+                    {"template": "Evaluate the scalability of function '{name}' in distributed systems.", "bloom": "evaluate"},
+                    {"template": "Apply function '{name}' in a multi-threaded environment and discuss the outcome.", "bloom": "apply"},
+                    {"template": "Demonstrate how to refactor function '{name}' for better modularity.", "bloom": "apply"},
+                    {"template": "Analyze the trade-offs between time and space complexity in function '{name}'.", "bloom": "analyze"},
+                    {"template": "Evaluate the robustness of function '{name}' under invalid input.", "bloom": "evaluate"},
+                    {"template": "Recall a time when a similar function to '{name}' caused a bug. How would you prevent it here?", "bloom": "remember"},
+                    {"template": "Explain the rationale behind the design of function '{name}'.", "bloom": "understand"},
+                    {"template": "Summarize the improvements you would make to function '{name}' for scalability.", "bloom": "understand"},
+                    {"template": "Invent a new function that extends the capabilities of '{name}'.", "bloom": "create"},
+                    {"template": "Design a test suite to validate all edge cases for function '{name}'.", "bloom": "create"},
+                    # ...existing code...
+                    {"template": "Recall the signature and return type of function '{name}'.", "bloom": "remember"},
+                    {"template": "Describe the most complex part of function '{name}'.", "bloom": "understand"},
+                    {"template": "Summarize the improvements you would make to function '{name}' for scalability.", "bloom": "create"},
+                    {"template": "Invent a new function inspired by '{name}' that solves a related problem.", "bloom": "create"},
+                ]
+            },
+            'loop': {
+                DifficultyLevel.BEGINNER: [
+                    {"template": "Analyze the effect of removing the {type} loop on program output.", "bloom": "analyze"},
+                    {"template": "Evaluate the necessity of the {type} loop on line {line_num} for program correctness.", "bloom": "evaluate"},
+                    {"template": "Apply the {type} loop on line {line_num} to a new input and describe the result.", "bloom": "apply"},
+                    {"template": "Demonstrate the use of a different loop type for the same logic.", "bloom": "apply"},
+                    {"template": "Analyze the effect of changing the loop's start value.", "bloom": "analyze"},
+                    {"template": "Evaluate the maintainability of the {type} loop on line {line_num}.", "bloom": "evaluate"},
+                    # ...existing code...
+                ],
+                DifficultyLevel.INTERMEDIATE: [
+                    {"template": "Analyze the interaction between nested loops in the code.", "bloom": "analyze"},
+                    {"template": "Evaluate the impact of the {type} loop on memory usage.", "bloom": "evaluate"},
+                    {"template": "Apply the {type} loop to process a reversed list and explain the output.", "bloom": "apply"},
+                    {"template": "Demonstrate how to break out of the {type} loop early.", "bloom": "apply"},
+                    {"template": "Analyze the impact of nested loops on performance.", "bloom": "analyze"},
+                    {"template": "Evaluate the scalability of the {type} loop for large data sets.", "bloom": "evaluate"},
+                    {"template": "Recall a common mistake when writing {type} loops and how to avoid it.", "bloom": "remember"},
+                    {"template": "List all {type} loops in the code and their purposes.", "bloom": "remember"},
+                    {"template": "Explain why a {type} loop was chosen over other loop types on line {line_num}.", "bloom": "understand"},
+                    {"template": "Summarize the effect of changing the loop variable's increment in the {type} loop.", "bloom": "understand"},
+                    {"template": "Create a new {type} loop that achieves the same result with fewer lines of code.", "bloom": "create"},
+                    # ...existing code...
+                    {"template": "Recall the type of loop used on line {line_num}.", "bloom": "remember"},
+                    {"template": "List all variables modified inside the {type} loop on line {line_num}.", "bloom": "remember"},
+                    {"template": "Describe a real-world scenario where a {type} loop is appropriate.", "bloom": "understand"},
+                    {"template": "Summarize the changes you would make to the {type} loop to handle a new requirement.", "bloom": "create"},
+                ],
+                DifficultyLevel.ADVANCED: [
+                    {"template": "Analyze the concurrency issues that may arise in the {type} loop.", "bloom": "analyze"},
+                    {"template": "Evaluate the trade-offs of using the {type} loop versus recursion.", "bloom": "evaluate"},
+                    {"template": "Apply the {type} loop in a parallel processing context.", "bloom": "apply"},
+                    {"template": "Demonstrate loop fusion to optimize performance.", "bloom": "apply"},
+                    {"template": "Analyze the bottlenecks caused by the {type} loop.", "bloom": "analyze"},
+                    {"template": "Evaluate the effect of loop invariants on correctness.", "bloom": "evaluate"},
+                    {"template": "Recall a scenario where a poorly designed loop caused performance issues. How would you address it here?", "bloom": "remember"},
+                    {"template": "Explain the impact of loop unrolling on the {type} loop on line {line_num}.", "bloom": "understand"},
+                    {"template": "Summarize the trade-offs between different loop structures for this problem.", "bloom": "understand"},
+                    {"template": "Invent a new loop structure to optimize the code's performance.", "bloom": "create"},
+                    {"template": "Design a parallel version of the {type} loop for distributed systems.", "bloom": "create"},
+                    # ...existing code...
+                    {"template": "Recall the main variable controlling the {type} loop on line {line_num}.", "bloom": "remember"},
+                    {"template": "Describe the most complex aspect of the {type} loop on line {line_num}.", "bloom": "understand"},
+                    {"template": "Invent a new loop structure to optimize the code on line {line_num}.", "bloom": "create"},
+                ]
+            },
             'condition': {
                 DifficultyLevel.BEGINNER: [
                     {"template": "Analyze the effect of removing the condition on line {line_num}.", "bloom": "analyze"},
@@ -1162,37 +2790,130 @@ class MultiLanguageQuestionGenerator:
         # Return UNKNOWN if the language can't be determined
         return Language.UNKNOWN
       
+    def _param_kind(self, param: str) -> Optional[str]:
+        """Guess what a parameter holds from its name (or C/Java declaration)"""
+        param = param.lower()
+        if 'index' in param or 'idx' in param or 'position' in param:
+            return 'index'
+        elif 'list' in param or 'array' in param or '[]' in param:
+            return 'list'
+        elif 'str' in param or 'name' in param or 'text' in param:
+            return 'string'
+        elif 'num' in param or 'count' in param or 'size' in param:
+            return 'number'
+        elif 'bool' in param or 'flag' in param:
+            return 'bool'
+        elif 'map' in param or 'dict' in param:
+            return 'map'
+        return None
+    
+    def _algorithm_input_kind(self, algorithm: Optional[str]) -> Optional[str]:
+        """The kind of example input an algorithm takes: 'sort', 'search', 'path' or None"""
+        if not algorithm:
+            return None
+        if 'sort' in algorithm:
+            return 'sort'
+        elif 'search' in algorithm:
+            return 'search'
+        elif 'path' in algorithm:
+            return 'path'
+        return None
+    
     def generate_params_example(self, params: List[str]) -> str:
         """Generate example parameter values for function calls"""
         if not params:
             return "()"
-            
-        examples = []
+        
+        examples = {'index': "0", 'list': "[1, 2, 3]", 'string': "'example'", 'number': "5",
+                    'bool': "True", 'map': "{key: value}"}
+        return ", ".join(examples.get(self._param_kind(param), "x") for param in params)
+    
+    def generate_sized_inputs(self, params: List[str], size: int, algorithm: Optional[str] = None,
+                              rng: Optional[random.Random] = None) -> List[Any]:
+        """
+        Generate arguments of the given size for a function call
+
+        The sized counterpart of generate_params_example: parameters are
+        classified the same way, and algorithm-specific inputs follow the
+        examples of generate_algorithm_questions (an unsorted list for sorts,
+        a sorted list and an absent target for searches, a graph with start
+        vertex 0 for graph algorithms). algorithm may also be any other hint
+        such as the function name. Collections get `size` elements and
+        numbers are `size`, so the running time grows with it.
+        """
+        rng = rng or random.Random(0)
+        input_kind = self._algorithm_input_kind(algorithm)
+        args = []
         for param in params:
-            param = param.lower()
-            if 'index' in param or 'idx' in param or 'position' in param:
-                examples.append("0")
-            elif 'list' in param or 'array' in param or '[]' in param:
-                examples.append("[1, 2, 3]")
-            elif 'str' in param or 'name' in param or 'text' in param:
-                examples.append("'example'")
-            elif 'num' in param or 'count' in param or 'size' in param:
-                examples.append("5")
-            elif 'bool' in param or 'flag' in param:
-                examples.append("True")
-            elif 'map' in param or 'dict' in param:
-                examples.append("{key: value}")
+            kind = self._param_kind(param)
+            # Bare name of a C/Java declaration such as "int arr[]"
+            name = re.sub(r'\[\s*\]', ' ', param).split()[-1].lstrip('*&').lower() if param.strip() else ''
+            if name == 'graph' or name.endswith('_graph') or name in ('adj', 'adjacency', 'edges'):
+                args.append(self._sized_graph(size, algorithm, rng))
+            elif kind == 'index' or name in ('start', 'source', 'src', 'root') or name.startswith('start_vertex'):
+                args.append(0)
+            elif name in ('target', 'key', 'goal', 'value', 'x', 'item'):
+                # Absent from the generated data, so searches take their worst case
+                args.append(-1)
+            elif kind == 'list' or (kind is None and (name in ('arr', 'a', 'lst', 'seq', 'data', 'left', 'right')
+                                                      or name.endswith('s'))):
+                if input_kind == 'search':
+                    args.append(list(range(0, 2 * size, 2)))
+                elif input_kind == 'sort':
+                    values = list(range(size))
+                    rng.shuffle(values)
+                    args.append(values)
+                else:
+                    args.append([rng.randint(1, size) for _ in range(size)])
+            elif kind == 'string' or name in ('pattern', 's', 'word'):
+                args.append(''.join(rng.choice('ab') for _ in range(size)))
+            elif kind == 'bool':
+                args.append(True)
+            elif kind == 'map':
+                args.append({i: i for i in range(size)})
             else:
-                examples.append("x")
-        
-        return ", ".join(examples)
+                args.append(size)
+        return args
+    
+    def _sized_graph(self, size: int, algorithm: Optional[str], rng: random.Random) -> Any:
+        """A random graph on `size` vertices in the representation the algorithm expects"""
+        # Every vertex links to the next one, so all are reachable from vertex 0, plus up
+        # to two random later ones; edges only point forward, so the graph is acyclic
+        edges = []
+        for u in range(size - 1):
+            targets = {u + 1} | set(rng.sample(range(u + 1, size), min(2, size - u - 1)))
+            edges += [(u, v, rng.randint(1, 10)) for v in sorted(targets)]
+        algorithm = algorithm or ''
+        if 'floyd' in algorithm:
+            matrix = [[0 if i == j else float('inf') for j in range(size)] for i in range(size)]
+            for u, v, weight in edges:
+                matrix[u][v] = weight
+            return matrix
+        if 'kruskal' in algorithm:
+            return [(weight, u, v) for u, v, weight in edges]
+        if 'prim' in algorithm:
+            graph = [[] for _ in range(size)]
+            for u, v, weight in edges:
+                graph[u].append((v, weight))
+                graph[v].append((u, weight))
+            return graph
+        if 'dijkstra' in algorithm or 'a_star' in algorithm or self._algorithm_input_kind(algorithm) == 'path':
+            graph = {vertex: {} for vertex in range(size)}
+            for u, v, weight in edges:
+                graph[u][v] = weight
+                graph[v][u] = weight
+            return graph
+        graph = {vertex: [] for vertex in range(size)}
+        for u, v, _ in edges:
+            graph[u].append(v)
+        return graph
     
     def generate_function_questions(self, functions: List[Dict[str, Any]], difficulty: DifficultyLevel) -> List[Dict[str, Any]]:
         """Generate all possible questions about functions at the specified difficulty level (no Bloom enforcement here)"""
         all_questions = []
         for func in functions:
             templates = self.question_templates['function'][difficulty]
-            for template_info in templates:
+            for index, template_info in enumerate(templates):
                 template = template_info["template"]
                 bloom = template_info["bloom"]
                 if '{params_example}' in template and 'params' in func:
@@ -1204,6 +2925,7 @@ class MultiLanguageQuestionGenerator:
                     'question': question,
                     'difficulty': difficulty.value,
                     'category': 'function',
+                    'template_id': f'function/{difficulty.value}/{index}',
                     'function_name': func['name'],
                     'bloom': bloom,
                 })
@@ -1214,7 +2936,7 @@ class MultiLanguageQuestionGenerator:
         all_questions = []
         for loop in loops:
             templates = self.question_templates['loop'][difficulty]
-            for template_info in templates:
+            for index, template_info in enumerate(templates):
                 template = template_info["template"]
                 bloom = template_info["bloom"]
                 try:
@@ -1225,6 +2947,7 @@ class MultiLanguageQuestionGenerator:
                     'question': question,
                     'difficulty': difficulty.value,
                     'category': 'loop',
+                    'template_id': f'loop/{difficulty.value}/{index}',
                     'loop_type': loop.get('type', 'loop'),
                     'line_num': loop.get('line_num', 'unknown'),
                     'bloom': bloom,
@@ -1236,7 +2959,7 @@ class MultiLanguageQuestionGenerator:
         all_questions = []
         for cond in conditionals:
             templates = self.question_templates['condition'][difficulty]
-            for template_info in templates:
+            for index, template_info in enumerate(templates):
                 template = template_info["template"]
                 bloom = template_info["bloom"]
                 try:
@@ -1247,6 +2970,7 @@ class MultiLanguageQuestionGenerator:
                     'question': question,
                     'difficulty': difficulty.value,
                     'category': 'condition',
+                    'template_id': f'condition/{difficulty.value}/{index}',
                     'line_num': cond.get('line_num', 'unknown'),
                     'bloom': bloom,
                 })
@@ -1257,7 +2981,7 @@ class MultiLanguageQuestionGenerator:
         all_questions = []
         for var in variables:
             templates = self.question_templates['variable'][difficulty]
-            for template_info in templates:
+            for index, template_info in enumerate(templates):
                 template = template_info["template"]
                 bloom = template_info["bloom"]
                 try:
@@ -1268,6 +2992,7 @@ class MultiLanguageQuestionGenerator:
                     'question': question,
                     'difficulty': difficulty.value,
                     'category': 'variable',
+                    'template_id': f'variable/{difficulty.value}/{index}',
                     'variable_name': var.get('name', 'unknown'),
                     'bloom': bloom,
                 })
@@ -1278,17 +3003,15 @@ class MultiLanguageQuestionGenerator:
         all_questions = []
         if algorithm:
             templates = self.question_templates['algorithm'][difficulty]
-            for template_info in templates:
+            for index, template_info in enumerate(templates):
                 template = template_info["template"]
                 bloom = template_info["bloom"]
                 # Generate example input based on algorithm type
-                example_input = "[1, 3, 5, 7, 9]"  # Default
-                if 'sort' in algorithm:
-                    example_input = "[5, 2, 9, 1, 7]"
-                elif 'search' in algorithm:
-                    example_input = "[1, 2, 3, 4, 5], target=3"
-                elif 'path' in algorithm:
-                    example_input = "graph={'A': ['B', 'C'], 'B': ['D'], 'C': ['D']}, start='A', end='D'"
+                example_input = {
+                    'sort': "[5, 2, 9, 1, 7]",
+                    'search': "[1, 2, 3, 4, 5], target=3",
+                    'path': "graph={'A': ['B', 'C'], 'B': ['D'], 'C': ['D']}, start='A', end='D'"
+                }.get(self._algorithm_input_kind(algorithm), "[1, 3, 5, 7, 9]")  # Default
                 try:
                     question = template.format(algorithm=algorithm, example_input=example_input)
                 except Exception:
@@ -1297,108 +3020,370 @@ class MultiLanguageQuestionGenerator:
                     'question': question,
                     'difficulty': difficulty.value,
                     'category': 'algorithm',
+                    'template_id': f'algorithm/{difficulty.value}/{index}',
                     'algorithm_name': algorithm,
                     'bloom': bloom,
                 })
         return all_questions
-    def _enforce_bloom_distribution(self, questions: List[Dict[str, Any]], num_questions: int = 6) -> List[Dict[str, Any]]:
-        """Randomly sample questions, but limit the max per Bloom level to avoid domination. Distribution is random but not strictly even, allowing some levels to be more frequent."""
-        import collections, math, random
-        if not questions:
-            return []
+    def near_duplicate_templates(self) -> Dict[str, Dict[str, float]]:
+        """
+        Near-duplicate templates of each template, by template ID
 
-        # Group questions by Bloom level
-        bloom_groups = collections.defaultdict(list)
-        for q in questions:
-            bloom = q.get('bloom', 'other')
-            bloom_groups[bloom].append(q)
+        Templates are compared by the MinHash signatures of their word
+        bigrams, computed once per template. Candidate pairs come from
+        locality-sensitive hashing (bands of 3 signature rows) and are
+        kept when their estimated similarity reaches
+        near_duplicate_threshold. Maps template_id to {template_id:
+        similarity}; recomputed when the threshold changes.
+        """
+        threshold = self.near_duplicate_threshold
+        cached = self._near_duplicates
+        if cached is not None and cached[0] == threshold:
+            return cached[1]
+        
+        signatures = {}
+        for category, levels in self.question_templates.items():
+            for difficulty, templates in levels.items():
+                for index, template_info in enumerate(templates):
+                    signatures[f'{category}/{difficulty.value}/{index}'] = \
+                        self._minhasher.signature(template_info['template'])
+        
+        rows = 3
+        buckets = defaultdict(list)
+        for template_id, signature in signatures.items():
+            for start in range(0, len(signature) - rows + 1, rows):
+                buckets[(start, signature[start:start + rows])].append(template_id)
+        near_duplicates = defaultdict(dict)
+        for bucket in buckets.values():
+            for first, second in itertools.combinations(bucket, 2):
+                if second in near_duplicates.get(first, {}):
+                    continue
+                similarity = MinHasher.similarity(signatures[first], signatures[second])
+                if threshold is not None and similarity >= threshold:
+                    near_duplicates[first][second] = near_duplicates[second][first] = similarity
+        
+        self._near_duplicates = (threshold, dict(near_duplicates))
+        return self._near_duplicates[1]
+    
+    def near_duplicate_report(self) -> List[Dict[str, Any]]:
+        """
+        Groups of near-duplicate templates across all categories and difficulties
+
+        Each group lists its templates (ID, text and Bloom level), the
+        lowest similarity between linked templates, and whether the group
+        mixes Bloom levels, which usually means the same question was filed
+        under two levels. Groups are sorted from the most similar down.
+        """
+        near_duplicates = self.near_duplicate_templates()
+        templates = {}
+        for category, levels in self.question_templates.items():
+            for difficulty, level_templates in levels.items():
+                for index, template_info in enumerate(level_templates):
+                    templates[f'{category}/{difficulty.value}/{index}'] = template_info
+        
+        groups, seen = [], set()
+        for template_id in templates:
+            if template_id in seen or template_id not in near_duplicates:
+                continue
+            members, stack = [], [template_id]
+            seen.add(template_id)
+            while stack:
+                current = stack.pop()
+                members.append(current)
+                for other in near_duplicates.get(current, {}):
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            members.sort(key=list(templates).index)
+            blooms = {templates[member]['bloom'] for member in members}
+            groups.append({
+                'templates': [{'template_id': member, 'template': templates[member]['template'],
+                               'bloom': templates[member]['bloom']} for member in members],
+                'min_similarity': min(similarity for member in members
+                                      for similarity in near_duplicates[member].values()),
+                'mixed_bloom': len(blooms) > 1
+            })
+        groups.sort(key=lambda group: (-group['min_similarity'], group['templates'][0]['template_id']))
+        return groups
+    
+    def _picked_templates(self, questions: List[Dict[str, Any]], picked: Optional[Dict[str, Set[str]]] = None) -> Dict[str, Set[str]]:
+        """Add the template IDs of questions to picked, by the element they ask about"""
+        picked = {} if picked is None else picked
+        for question in questions:
+            if question.get('template_id') is not None:
+                picked.setdefault(question_element(question), set()).add(question['template_id'])
+        return picked
+    
+    def _is_near_duplicate(self, question: Dict[str, Any], picked: Dict[str, Set[str]]) -> bool:
+        """Whether a question about the same element from the same or a near-duplicate template was picked"""
+        if self.near_duplicate_threshold is None or question.get('template_id') is None:
+            return False
+        templates = picked.get(question_element(question))
+        if not templates:
+            return False
+        return question['template_id'] in templates or \
+            not templates.isdisjoint(self.near_duplicate_templates().get(question['template_id'], ()))
+    
+    def _weighted_order(self, questions: List[Dict[str, Any]], rng: Any, table: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the questions in a random order where more important ones tend to come first
 
-        bloom_levels = list(bloom_groups.keys())
-        n_levels = len(bloom_levels)
-        if n_levels == 0:
-            return random.sample(questions, min(num_questions, len(questions)))
+        Repeated alias draws skip questions already yielded; once as many
+        draws as there are questions have hit such repeats, the rest follow
+        in a weighted shuffle (Efraimidis-Spirakis keys), so taking a few
+        questions costs a few draws and taking all of them stays O(n log n).
+        """
+        alias = table['alias']
+        drawn = set()
+        misses = 0
+        while len(drawn) < len(questions) and misses < len(questions):
+            index = alias.draw(rng)
+            if index in drawn:
+                misses += 1
+                continue
+            drawn.add(index)
+            yield questions[index]
+        rest = [i for i in range(len(questions)) if i not in drawn]
+        keys = {i: math.log(1.0 - rng.random()) / max(question_importance(questions[i]), 1e-9) for i in rest}
+        for i in sorted(rest, key=keys.__getitem__, reverse=True):
+            yield questions[i]
+    
+    def _enforce_bloom_distribution(self, questions: List[Dict[str, Any]], num_questions: int = 6, rng: Optional[random.Random] = None, avoid: Optional[List[Dict[str, Any]]] = None, table: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Sample num_questions by importance with at most 40% per Bloom level, skipping near-duplicates of questions picked or in avoid (table: see sampling_table)"""
+        rng = make_rng(rng)
+        picked_templates = self._picked_templates(avoid or [])
+        if not questions:
+            return []
+        if table is None or len(table['alias']) != len(questions):
+            table = sampling_table(questions)
 
         # Set a soft cap for each Bloom level (allowing some levels to be more frequent, e.g., up to 40% for any one level)
+        n_levels = table['levels']
         min_cap = max(1, num_questions // n_levels)
         max_cap = max(min_cap + 1, int(num_questions * 0.4))  # No more than 40% from any one level
-        # Shuffle all questions for randomness
-        all_qs = questions[:]
-        random.shuffle(all_qs)
 
         # Track how many picked per Bloom level
-        picked_per_bloom = collections.defaultdict(int)
+        picked_per_bloom = defaultdict(int)
         result = []
-        for q in all_qs:
+        skipped = []
+        for q in self._weighted_order(questions, rng, table):
             bloom = q.get('bloom', 'other')
-            if picked_per_bloom[bloom] < max_cap:
+            if picked_per_bloom[bloom] < max_cap and not self._is_near_duplicate(q, picked_templates):
                 result.append(q)
                 picked_per_bloom[bloom] += 1
+                self._picked_templates([q], picked_templates)
+            else:
+                skipped.append(q)
             if len(result) >= num_questions:
                 break
 
-        # If not enough, fill with any remaining
+        # If not enough, fill with the skipped ones, still in weighted order
         if len(result) < num_questions:
-            leftovers = [q for q in all_qs if q not in result]
-            random.shuffle(leftovers)
-            result.extend(leftovers[:num_questions - len(result)])
+            for q in skipped:
+                if len(result) >= num_questions:
+                    break
+                if not self._is_near_duplicate(q, picked_templates):
+                    result.append(q)
+                    self._picked_templates([q], picked_templates)
 
         return result[:num_questions]
-    def generate_questions(self, code: str, num_questions: int = 6, difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE, min_remember: int = 1, min_evaluate: int = 1) -> List[Dict[str, Any]]:
-        """Generate questions for the given code with the specified difficulty level, enforcing Bloom's rule only at the end."""
-        language = self.detect_language(code)
-        parser = self.parsers[language]
+    def generate_questions(self, code: str, num_questions: int = 6, difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE, min_remember: int = 1, min_evaluate: int = 1, answer_keys: bool = False, seed: Union[None, int, str, random.Random] = None, bounded_memory: bool = False) -> List[Dict[str, Any]]:
+        """Generate questions for the given code with the specified difficulty level, enforcing Bloom's rule only at the end. Reproducible for a given seed (see make_rng)."""
+        rng = make_rng(seed)
+        if bounded_memory:
+            candidates = self.reservoir_candidates(self.iter_question_candidates(code, difficulty), num_questions, rng)
+            questions = self.sample_questions(candidates, num_questions, rng)
+            return self.generate_answer_keys(code, questions) if answer_keys else questions
+        candidates = self.generate_question_candidates(code, difficulty, answer_keys)
+        return self.sample_questions(candidates, num_questions, rng,
+                                     table=self._candidate_table(code, difficulty, candidates, answer_keys))
+    
+    def reservoir_candidates(self, candidates: Iterable[Dict[str, Any]], num_questions: int, rng: Any = None, per_level: Optional[int] = None, weight=None) -> List[Dict[str, Any]]:
+        """
+        Keep a weighted random sample of per_level candidates for each Bloom level of a stream
 
-        parsed_code = parser.parse(code)
-        if not parsed_code:
-            return [{'question': f"There seems to be a syntax error in the {language.value} code. Can you fix it?", 'difficulty': difficulty.value, 'category': 'general'}]
+        This is enough for sample_questions to pick num_questions under
+        Bloom's rule, which never takes more than num_questions from a level;
+        per_level defaults to twice that so near-duplicates can still be
+        skipped. Candidates are consumed one at a time, so time is linear in
+        the candidates and the reservoirs hold O(K) of them, K being the
+        number of levels times per_level (plus O(elements) for the element
+        lists of iter_question_candidates). weight maps a candidate to its
+        relative chance (1 for all by default, which keeps each level a
+        uniform sample as in the unbounded path).
+        """
+        rng = make_rng(rng)
+        per_level = 2 * num_questions if per_level is None else per_level
+        reservoirs: Dict[str, WeightedReservoir] = {}
+        for q in candidates:
+            bloom = q.get('bloom', 'other')
+            if bloom not in reservoirs:
+                reservoirs[bloom] = WeightedReservoir(per_level, rng)
+            reservoirs[bloom].offer(q, weight(q) if weight else 1.0)
+        return [q for bloom in reservoirs for q in reservoirs[bloom].items()]
+    
+    def generate_question_candidates(self, code: str, difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE, answer_keys: bool = False) -> List[Dict[str, Any]]:
+        """
+        All questions generate_questions samples from, before Bloom's rule
 
-        functions = parser.get_functions(parsed_code)
-        loops = parser.get_loops(parsed_code)
-        conditionals = parser.get_conditionals(parsed_code)
-        variables = parser.get_variables(parsed_code)
-        algorithm = parser.identify_algorithm(code)
+        This is the deterministic, expensive part of generate_questions:
+        parsing, analysis, templating and, with answer_keys, tracing. Calls
+        for the same code (by hash) and parameters that overlap in time are
+        coalesced into one computation whose result they share, so it must
+        not be modified; sample_questions returns copies.
+        """
+        key = (hashlib.sha256(code.encode('utf-8')).hexdigest(), difficulty, answer_keys)
+        return self._candidate_flights.do(key, self._generate_question_candidates, code, difficulty, answer_keys)
+    
+    def _candidate_table(self, code: str, difficulty: DifficultyLevel, candidates: List[Dict[str, Any]], answer_keys: bool = False) -> Dict[str, Any]:
+        """
+        The sampling_table of generate_question_candidates(code, difficulty, answer_keys)
 
-        all_questions = []
+        Tables are kept for the max_sampling_tables most recently used code
+        hashes and parameters, so repeated requests for the same code reuse
+        the table instead of rebuilding it for every sample.
+        """
+        key = (hashlib.sha256(code.encode('utf-8')).hexdigest(), difficulty, answer_keys)
+        with self._sampling_tables_lock:
+            table = self._sampling_tables.get(key)
+            if table is not None and len(table['alias']) == len(candidates):
+                self._sampling_tables.move_to_end(key)
+                return table
 
-        if functions:
-            all_questions.extend(self.generate_function_questions(functions, difficulty))
+        table = sampling_table(candidates)
+        with self._sampling_tables_lock:
+            self._sampling_tables[key] = table
+            self._sampling_tables.move_to_end(key)
+            while len(self._sampling_tables) > self.max_sampling_tables:
+                self._sampling_tables.popitem(last=False)
+        return table
+    
+    def _generate_question_candidates(self, code: str, difficulty: DifficultyLevel, answer_keys: bool) -> List[Dict[str, Any]]:
+        all_questions = list(self.iter_question_candidates(code, difficulty))
+        if answer_keys:
+            all_questions = self.generate_answer_keys(code, all_questions)
+        return all_questions
+    
+    def iter_question_candidates(self, code: str, difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE, algorithm: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the candidates of generate_question_candidates one element at a time
+
+        The same questions in the same order, but only the questions of the
+        current code element are rendered at any moment. The parser still
+        extracts every function, loop, conditional and variable up front, so
+        memory is O(elements) for those lists, and only the rendered
+        questions stay flat.
 
-        if loops:
-            all_questions.extend(self.generate_loop_questions(loops, difficulty))
+        algorithm replaces the one identified from the code, as for the
+        cross-language vote of generate_algorithm_bundle.
+        """
+        language = self.detect_language(code)
+        parser = self.parsers[language]
 
-        if conditionals:
-            all_questions.extend(self.generate_conditional_questions(conditionals, difficulty))
+        parsed_code = parser.parse(code)
+        if not parsed_code:
+            yield {'question': f"There seems to be a syntax error in the {language.value} code. Can you fix it?", 'difficulty': difficulty.value, 'category': 'general'}
+            return
 
-        if variables:
-            all_questions.extend(self.generate_variable_questions(variables, difficulty))
+        # Every question carries the importance of its element (see CodeParser.element_importance)
+        context = parser.importance_context(code)
+        for kind, extract, generate in (('function', parser.get_functions, self.generate_function_questions),
+                                        ('loop', parser.get_loops, self.generate_loop_questions),
+                                        ('conditional', parser.get_conditionals, self.generate_conditional_questions),
+                                        ('variable', parser.get_variables, self.generate_variable_questions)):
+            for element in extract(parsed_code):
+                importance = parser.element_importance(kind, element, context)
+                for question in generate([element], difficulty):
+                    question['importance'] = importance
+                    yield question
 
+        algorithm = algorithm or parser.identify_algorithm(code)
         if algorithm:
-            all_questions.extend(self.generate_algorithm_questions(algorithm, code, difficulty))
-
-        return self._enforce_bloom_distribution(all_questions, num_questions)
+            importance = parser.element_importance('algorithm', {'name': algorithm}, context)
+            for question in self.generate_algorithm_questions(algorithm, code, difficulty):
+                question['importance'] = importance
+                yield question
+    
+    def iter_questions(self, code: str, num_questions: Optional[int] = None, difficulty: Optional[DifficultyLevel] = DifficultyLevel.INTERMEDIATE, seed: Union[None, int, str, random.Random] = None, answer_keys: bool = False, bounded_memory: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield question records one at a time, for the streaming writers
 
-        return final_questions
+        With num_questions, these are the questions generate_questions
+        returns for the same arguments, in sampled order. Without it, every
+        candidate for difficulty (each difficulty in turn if difficulty is
+        None) is yielded as it is rendered by iter_question_candidates, so
+        bank-building jobs over large files only hold the extracted code
+        elements, O(elements), never all rendered candidates; answer_keys
+        only applies to sampled questions. bounded_memory is passed on to
+        generate_questions.
+        """
+        if num_questions is not None:
+            yield from self.generate_questions(code, num_questions, difficulty or DifficultyLevel.INTERMEDIATE,
+                                               answer_keys=answer_keys, seed=seed, bounded_memory=bounded_memory)
+            return
+        for level in ([difficulty] if difficulty else list(DifficultyLevel)):
+            yield from self.iter_question_candidates(code, level)
     
-    def generate_mixed_difficulty_questions(self, code: str, num_beginner: int = 2, num_intermediate: int = 2, num_advanced: int = 1) -> List[Dict[str, Any]]:
-        """Generate questions with mixed difficulty levels, always 1 remember and rest evaluate, no duplicates, correct difficulty fields."""
+    def sample_questions(self, candidates: List[Dict[str, Any]], num_questions: int = 6, rng: Optional[random.Random] = None, avoid: Optional[List[Dict[str, Any]]] = None, table: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Sample num_questions of the candidates as _enforce_bloom_distribution does, as copies the caller may change"""
+        return [dict(q) for q in self._enforce_bloom_distribution(candidates, num_questions, rng, avoid, table)]
+    
+    def generate_mixed_difficulty_questions(self, code: str, num_beginner: int = 2, num_intermediate: int = 2, num_advanced: int = 1, seed: Union[None, int, str, random.Random] = None) -> List[Dict[str, Any]]:
+        """Generate questions with mixed difficulty levels, always 1 remember and rest evaluate, no duplicates, correct difficulty fields. Reproducible for a given seed (see make_rng)."""
+        rng = make_rng(seed)
         slot_difficulties = (
             [DifficultyLevel.BEGINNER] * num_beginner +
             [DifficultyLevel.INTERMEDIATE] * num_intermediate +
             [DifficultyLevel.ADVANCED] * num_advanced
         )
         num_questions = len(slot_difficulties)
-        all_questions = (
-            self.generate_questions(code, num_beginner, DifficultyLevel.BEGINNER)
-            + self.generate_questions(code, num_intermediate, DifficultyLevel.INTERMEDIATE)
-            + self.generate_questions(code, num_advanced, DifficultyLevel.ADVANCED)
-        )
-        return self._enforce_bloom_distribution(all_questions, num_questions)
+        all_questions = []
+        for difficulty, count in ((DifficultyLevel.BEGINNER, num_beginner),
+                                  (DifficultyLevel.INTERMEDIATE, num_intermediate),
+                                  (DifficultyLevel.ADVANCED, num_advanced)):
+            # Each difficulty avoids near-duplicates of the questions already drawn
+            candidates = self.generate_question_candidates(code, difficulty)
+            all_questions += self.sample_questions(candidates, count, rng, avoid=all_questions,
+                                                   table=self._candidate_table(code, difficulty, candidates))
+        return self._enforce_bloom_distribution(all_questions, num_questions, rng)
+    
+    def generate_quiz(self, code: str, num_questions: int = 5, mixed_difficulty: bool = True, seed: Union[None, int, str, random.Random] = None) -> Dict[str, Any]:
+        """Generate a complete quiz for the given code, always 1 remember and rest evaluate, correct difficulty fields. Reproducible for a given seed (see make_rng). Code in self.question_bank is served from the bank."""
+        rng = make_rng(seed)
+        if self.question_bank is not None:
+            prepared = self.question_bank.prepared_quiz(code, mixed_difficulty)
+            if prepared is not None:
+                quiz = self.assemble_quiz(prepared, num_questions, rng)
+                quiz['questions'] = self.question_bank.load(prepared['code_id'], quiz['questions'])
+                return quiz
+        return self.assemble_quiz(self.prepare_quiz(code, mixed_difficulty), num_questions, rng)
     
-    def generate_quiz(self, code: str, num_questions: int = 5, mixed_difficulty: bool = True) -> Dict[str, Any]:
-        """Generate a complete quiz for the given code, always 1 remember and rest evaluate, correct difficulty fields."""
+    def prepare_quiz(self, code: str, mixed_difficulty: bool = True) -> Dict[str, Any]:
+        """
+        The shareable part of generate_quiz: the language, the algorithm and
+        the candidate questions for each difficulty the quiz draws from, with
+        their sampling tables
+        """
         language = self.detect_language(code)
+        difficulties = list(DifficultyLevel) if mixed_difficulty else [DifficultyLevel.INTERMEDIATE]
+        algorithm = self.parsers[language].identify_algorithm(code)
+        candidates = {difficulty.value: self.generate_question_candidates(code, difficulty)
+                      for difficulty in difficulties}
+        return {
+            'language': language.value,
+            'algorithm': algorithm if algorithm else "Unknown",
+            'mixed_difficulty': mixed_difficulty,
+            'candidates': candidates,
+            'tables': {difficulty: self._candidate_table(code, DifficultyLevel(difficulty), questions)
+                       for difficulty, questions in candidates.items()}
+        }
+    
+    def assemble_quiz(self, prepared: Dict[str, Any], num_questions: int = 5, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+        """Sample a quiz of num_questions from the output of prepare_quiz"""
+        candidates = prepared['candidates']
+        tables = prepared.get('tables', {})
         # Determine slot difficulties
-        if mixed_difficulty:
+        if prepared['mixed_difficulty']:
             num_beginner = max(1, num_questions // 2)
             num_advanced = max(1, num_questions // 5)
             num_intermediate = num_questions - num_beginner - num_advanced
@@ -1407,24 +3392,268 @@ class MultiLanguageQuestionGenerator:
                 [DifficultyLevel.INTERMEDIATE] * num_intermediate +
                 [DifficultyLevel.ADVANCED] * num_advanced
             )
-            all_questions = (
-                self.generate_questions(code, num_beginner, DifficultyLevel.BEGINNER)
-                + self.generate_questions(code, num_intermediate, DifficultyLevel.INTERMEDIATE)
-                + self.generate_questions(code, num_advanced, DifficultyLevel.ADVANCED)
-            )
+            all_questions = []
+            for difficulty, count in ((DifficultyLevel.BEGINNER, num_beginner),
+                                      (DifficultyLevel.INTERMEDIATE, num_intermediate),
+                                      (DifficultyLevel.ADVANCED, num_advanced)):
+                all_questions += self.sample_questions(candidates[difficulty.value], count, rng, avoid=all_questions,
+                                                       table=tables.get(difficulty.value))
         else:
             slot_difficulties = [DifficultyLevel.INTERMEDIATE] * num_questions
-            all_questions = self.generate_questions(code, num_questions, DifficultyLevel.INTERMEDIATE)
-        final_questions = self._enforce_bloom_distribution(all_questions, slot_difficulties)
-        algorithm = self.parsers[language].identify_algorithm(code)
-        algorithm_name = algorithm if algorithm else "Unknown"
+            all_questions = self.sample_questions(candidates[DifficultyLevel.INTERMEDIATE.value], num_questions, rng,
+                                                 table=tables.get(DifficultyLevel.INTERMEDIATE.value))
+        final_questions = self._enforce_bloom_distribution(all_questions, len(slot_difficulties), rng)
         return {
-            'language': language.value,
-            'algorithm': algorithm_name,
+            'language': prepared['language'],
+            'algorithm': prepared['algorithm'],
             'num_questions': len(final_questions),
             'questions': final_questions
         }
     
+    def generate_class_quizzes(self, code: str, num_students: int, num_questions: int = 5, max_overlap: int = 2,
+                               bloom_quotas: Optional[Dict[str, int]] = None, mixed_difficulty: bool = True,
+                               seed: Union[None, int, str, random.Random] = None, max_attempts: int = 100) -> Dict[str, Any]:
+        """
+        Build a different quiz for each of num_students students
+
+        The code is analyzed once (prepare_quiz) and every quiz draws
+        bloom_quotas[level] questions of each Bloom level from the combined
+        candidates, where questions with the same text count as the same
+        question. Without bloom_quotas, num_questions is spread evenly over
+        the available levels, at most 40% per level where possible. No two quizzes share more
+        than max_overlap questions: a quiz sharing max_overlap + 1 questions
+        with an earlier one would share one of its (max_overlap + 1)-subsets,
+        so each accepted quiz registers its subsets in a set and a new quiz
+        is rejected and redrawn if any of its subsets is already there. This
+        keeps the cost linear in num_students. Draws favour the least used
+        questions, which spreads them over the class, then the more important
+        ones (see CodeParser.element_importance), and skip
+        near-duplicates of questions already in the quiz. Raises ValueError if
+        the pool cannot supply the quotas or num_students quizzes, either by
+        the counting bound or after max_attempts draws for one student.
+        """
+        rng = make_rng(seed)
+        prepared = self.prepare_quiz(code, mixed_difficulty)
+        pools = defaultdict(list)
+        seen = set()
+        for candidates in prepared['candidates'].values():
+            for question in candidates:
+                if question['question'] not in seen:
+                    seen.add(question['question'])
+                    pools[question.get('bloom', 'other')].append(question)
+        
+        if bloom_quotas is None:
+            levels = [level for level in BLOOM_LEVELS if pools.get(level)] + \
+                     [level for level in pools if level not in BLOOM_LEVELS]
+            bloom_quotas = dict.fromkeys(levels, 0)
+            # Round-robin over the levels, first capped at 40% per level, then without the cap
+            for cap in (max(1, int(num_questions * 0.4)), num_questions):
+                added = True
+                while added and sum(bloom_quotas.values()) < num_questions:
+                    added = False
+                    for level in levels:
+                        if sum(bloom_quotas.values()) < num_questions and \
+                                bloom_quotas[level] < min(cap, len(pools[level])):
+                            bloom_quotas[level] += 1
+                            added = True
+            bloom_quotas = {level: count for level, count in bloom_quotas.items() if count}
+            if sum(bloom_quotas.values()) < num_questions:
+                raise ValueError(f'Only {len(seen)} candidate questions for quizzes of {num_questions}')
+        quiz_size = sum(bloom_quotas.values())
+        if quiz_size == 0 or any(len(pools.get(level, [])) < count for level, count in bloom_quotas.items()):
+            raise ValueError(f'Not enough candidate questions for Bloom quotas {bloom_quotas}')
+        
+        # Counting bound: every (max_overlap + 1)-subset can belong to one quiz only
+        subset_size = max_overlap + 1
+        if subset_size <= quiz_size:
+            capacity = math.comb(len(seen), subset_size) // math.comb(quiz_size, subset_size)
+            if num_students > capacity:
+                raise ValueError(f'At most {capacity} quizzes of {quiz_size} questions from {len(seen)} '
+                                 f'candidates can pairwise share {max_overlap} or fewer questions')
+        
+        usage = Counter()
+        used_subsets = set()
+        quizzes = []
+        for student in range(num_students):
+            for _ in range(max_attempts):
+                chosen = []
+                picked_templates = {}
+                for level, count in bloom_quotas.items():
+                    drawn = 0
+                    # Least used first; within equal use, a weighted shuffle by importance
+                    for question in sorted(pools[level], key=lambda q: usage[q['question']] + 1.0 - rng.random() ** (1.0 / question_importance(q))):
+                        if drawn == count:
+                            break
+                        if not self._is_near_duplicate(question, picked_templates):
+                            chosen.append(question)
+                            self._picked_templates([question], picked_templates)
+                            drawn += 1
+                texts = sorted(q['question'] for q in chosen)
+                if len(texts) < quiz_size:
+                    raise ValueError(f'Not enough distinct candidate questions for Bloom quotas {bloom_quotas}')
+                subsets = set(itertools.combinations(texts, subset_size)) if subset_size <= quiz_size else set()
+                if used_subsets.isdisjoint(subsets):
+                    break
+            else:
+                raise ValueError(f'Could not build quiz {student + 1} of {num_students} with at most '
+                                 f'{max_overlap} shared questions in {max_attempts} attempts')
+            used_subsets.update(subsets)
+            usage.update(texts)
+            rng.shuffle(chosen)
+            quizzes.append({
+                'student': student,
+                'language': prepared['language'],
+                'algorithm': prepared['algorithm'],
+                'num_questions': len(chosen),
+                'questions': [dict(q) for q in chosen]
+            })
+        
+        return {
+            'language': prepared['language'],
+            'algorithm': prepared['algorithm'],
+            'bloom_quotas': bloom_quotas,
+            'max_overlap': max_overlap,
+            'quizzes': quizzes
+        }
+    
+    def vote_algorithm(self, identified: Dict[str, Optional[str]], hint: Optional[str] = None) -> Optional[str]:
+        """
+        The algorithm of a set of implementations
+
+        identified maps each implementation to what identify_algorithm found
+        in it. A hint that names a known algorithm (such as the folder name
+        'quick_sort', or 'breadth_first_search' for 'bfs') decides. The
+        pattern matching is often wrong in the same way for every language,
+        so a unanimous vote can still be wrong, while the folder name is
+        chosen by the author. Without a usable hint, the algorithm most
+        implementations were identified as wins, and ties go to the first
+        implementation.
+        """
+        known = set()
+        for parser in self.parsers.values():
+            known.update(getattr(parser, 'algorithm_patterns', {}))
+        hinted = None
+        if hint:
+            hint = re.sub(r'\W+', '_', hint.lower()).strip('_')
+            initials = ''.join(word[0] for word in hint.split('_') if word)
+            for name in (hint, initials):
+                matches = sorted(key for key in known if key == name or key.startswith(name + '_'))
+                if matches:
+                    hinted = matches[0]
+                    break
+        
+        if hinted:
+            return hinted
+        votes = Counter(algorithm for algorithm in identified.values() if algorithm)
+        if not votes:
+            return None
+        top = max(votes.values())
+        return next(algorithm for algorithm in identified.values() if votes.get(algorithm) == top)
+    
+    def _bundle_member(self, code: str, difficulty: str, algorithm: Optional[str]) -> Dict[str, Any]:
+        """The candidates and metrics of one implementation of a bundle"""
+        return {
+            'candidates': list(self.iter_question_candidates(code, DifficultyLevel(difficulty), algorithm)),
+            'metrics': self.evaluate_code_quality(code)
+        }
+    
+    def generate_algorithm_bundle(self, folder: str, num_questions: int = 6, difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE,
+                                  seed: Union[None, int, str, random.Random] = None, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyze the sibling implementations of one algorithm together
+
+        folder holds one algorithm in several languages (as in
+        code_samples/<algorithm>/), analyzed in parallel worker processes
+        (in this process with max_workers=1). The algorithm is identified
+        once for all of them (vote_algorithm). The i-th question is the same
+        template in every language, about a same-named element where there
+        is one; languages sharing no templates are sampled on their own. The
+        same seed gives the same bundle.
+        """
+        rng = make_rng(seed)
+        members = {}
+        skipped = []
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if not (os.path.isfile(path) and name.lower().endswith(('.py', '.java', '.cpp', '.c'))):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                code = f.read()
+            language = self.detect_language(code)
+            if language.value in members:
+                skipped.append(name)
+                continue
+            members[language.value] = {'file': name, 'code': code,
+                                       'identified_algorithm': self.parsers[language].identify_algorithm(code)}
+        # Fixed language order, so a seed always draws in the same sequence
+        members = {language.value: members[language.value] for language in Language if language.value in members}
+        
+        algorithm = self.vote_algorithm({language: member['identified_algorithm'] for language, member in members.items()},
+                                        os.path.basename(os.path.normpath(folder)))
+        tasks = [(member['code'], difficulty.value, algorithm) for member in members.values()]
+        if max_workers == 1 or len(tasks) <= 1:
+            analyses = [self._bundle_member(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers or min(len(tasks), os.cpu_count() or 1)) as executor:
+                analyses = list(executor.map(_analyze_bundle_member, tasks))
+        
+        by_template = {}
+        for language, analysis in zip(members, analyses):
+            templates = defaultdict(list)
+            for question in analysis['candidates']:
+                if question.get('template_id'):
+                    templates[question['template_id']].append(question)
+            if templates:
+                by_template[language] = templates
+        common = [template_id for template_id in next(iter(by_template.values()), {})
+                  if all(template_id in templates for templates in by_template.values())]
+        
+        # One representative per shared template; its element is the category (see question_element)
+        slots = []
+        for template_id in common:
+            first = by_template[next(iter(by_template))][template_id][0]
+            slots.append({'template_id': template_id, 'category': first.get('category'), 'bloom': first.get('bloom'),
+                          'importance': sum(max(question_importance(q) for q in templates[template_id])
+                                            for templates in by_template.values()) / len(by_template)})
+        chosen = self._enforce_bloom_distribution(slots, num_questions, rng)
+        
+        # The same element under another naming convention, such as quick_sort and quickSort
+        def element_key(question):
+            return question_element(question).replace('_', '').lower()
+        
+        languages = {}
+        first_elements = {}
+        for language, analysis in zip(members, analyses):
+            if language in by_template and chosen:
+                questions = []
+                for slot in chosen:
+                    pool = by_template[language][slot['template_id']]
+                    same = [q for q in pool if element_key(q) == first_elements.get(slot['template_id'])]
+                    question = same[0] if same else pool[AliasTable([question_importance(q) for q in pool]).draw(rng)]
+                    first_elements.setdefault(slot['template_id'], element_key(question))
+                    questions.append(dict(question))
+            else:
+                questions = self.sample_questions(analysis['candidates'], num_questions, rng)
+            languages[language] = {
+                'file': members[language]['file'],
+                'identified_algorithm': members[language]['identified_algorithm'],
+                'num_candidates': len(analysis['candidates']),
+                'aligned': language in by_template and bool(chosen),
+                'metrics': analysis['metrics'],
+                'questions': questions
+            }
+        
+        return {
+            'folder': folder,
+            'algorithm': algorithm if algorithm else "Unknown",
+            'skipped': skipped,
+            'languages': languages,
+            'aligned': [{'template_id': slot['template_id'], 'category': slot['category'], 'bloom': slot['bloom'],
+                         'questions': {language: entry['questions'][index]['question']
+                                       for language, entry in languages.items() if entry['aligned']}}
+                        for index, slot in enumerate(chosen)]
+        }
+    
     def evaluate_code_quality(self, code: str) -> Dict[str, Any]:
         """Evaluate code quality based on various metrics"""
         language = self.detect_language(code)
@@ -1508,9 +3737,298 @@ class MultiLanguageQuestionGenerator:
         
         return explanation
     
-    def run_unit_tests(self, code: str, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Run unit tests on the provided code"""
+    def profile_complexity(self, code: str, function_name: Optional[str] = None, min_size: int = 8,
+                           max_size: int = 2**14, repeats: int = 3, min_time: float = 0.02,
+                           time_budget: float = 0.25, timeout: float = 2, seed: int = 0) -> List[Dict[str, Any]]:
+        """
+        Measure how each function's running time grows with its input size
+
+        Top-level functions (or just function_name) with at least one
+        parameter are run in the unit test sandbox on inputs from
+        generate_sized_inputs, hinted with the detected algorithm and the
+        function name, for sizes growing by a factor of
+        about sqrt(2) from min_size until a call takes longer than
+        time_budget seconds, fails or reaches max_size. A run repeats the
+        call until the calls take min_time seconds and yields the time per
+        call, so fast functions are not timed at clock resolution; the
+        fastest of `repeats` runs at each size is fitted with fit_complexity.
+        Each entry reports the static estimate from _estimate_complexity next
+        to the empirical class (None if too few sizes could be measured), the
+        fit scores and the (size, seconds) measurements. A function whose
+        generated inputs raise is reported with the exception in 'error' and
+        only the sizes measured before it are fitted.
+        """
+        language = self.detect_language(code)
+        if language not in self.parsers:
+            return []
+        parser = self.parsers[language]
+        parsed_code = parser.parse(code)
+        if not parsed_code:
+            return []
+        algorithm = parser.identify_algorithm(code)
+        
+        # Only module-level Python functions can be called by the sandbox, and
+        # parameters with default values are left to their defaults
+        required = None
+        if language == Language.PYTHON:
+            required = {node.name: len(node.args.args) - len(node.args.defaults)
+                        for node in parsed_code.body if isinstance(node, ast.FunctionDef)}
+        
+        sizes = []
+        size = min_size
+        while size <= max_size:
+            sizes.append(size)
+            size = max(size + 1, round(size * math.sqrt(2)))
+        
+        pool = PythonTestWorkerPool(size=1, timeout=timeout, limits=self.test_limits)
+        profiles = []
+        try:
+            for func in parser.get_functions(parsed_code):
+                if function_name and func['name'] != function_name:
+                    continue
+                params = func.get('params', [])
+                if required is not None:
+                    if func['name'] not in required:
+                        continue
+                    params = params[:required[func['name']]]
+                if not params:
+                    continue
+                hint = f"{algorithm or ''} {func['name']}".strip()
+                rng = random.Random(seed)
+                measurements = []
+                error = None
+                for size in sizes:
+                    inputs = self.generate_sized_inputs(params, size, hint, rng)
+                    # The expected output is irrelevant: only timings and errors are used
+                    test_cases = [{'id': f'{size}/{i}', 'function_name': func['name'], 'inputs': inputs,
+                                   'expected_output': '', 'min_time': min_time} for i in range(repeats)]
+                    test_results, error = self._execute_tests(code, language, test_cases, 'pool', pool,
+                                                              1024, False, timeout, use_cache=False)
+                    failures = [r for r in test_results if r['status'] == 'error']
+                    if error or failures or not test_results:
+                        error = error or (failures[0]['message'] if failures else 'No test results')
+                        break
+                    seconds = min(r['wall_time'] for r in test_results)
+                    measurements.append((size, seconds))
+                    if seconds > time_budget:
+                        break
+                
+                empirical, scores = fit_complexity([n for n, _ in measurements], [t for _, t in measurements])
+                profiles.append({
+                    'function_name': func['name'],
+                    'static_complexity': func.get('complexity', 'Unknown'),
+                    'empirical_complexity': empirical,
+                    'fit_scores': scores,
+                    'measurements': measurements,
+                    'error': error
+                })
+        finally:
+            pool.close()
+        
+        return profiles
+    
+    def generate_example_inputs(self, params: List[str], algorithm: Optional[str] = None) -> List[Any]:
+        """
+        Small example arguments for a function call
+
+        Inputs of size 5 from generate_sized_inputs, except that sorts and
+        searches get the example lists of generate_algorithm_questions, and a
+        search looks for a target that is present.
+        """
+        inputs = self.generate_sized_inputs(params, 5, algorithm, random.Random(0))
+        input_kind = self._algorithm_input_kind(algorithm)
+        if input_kind in ('sort', 'search'):
+            example = [5, 2, 9, 1, 7] if input_kind == 'sort' else [1, 2, 3, 4, 5]
+            for i, value in enumerate(inputs):
+                if isinstance(value, list) and value and not isinstance(value[0], (list, tuple)):
+                    inputs[i] = example
+                    break
+            if input_kind == 'search':
+                inputs = [3 if value == -1 else value for value in inputs]
+        return inputs
+    
+    def generate_answer_keys(self, code: str, questions: List[Dict[str, Any]], max_steps: int = 10000,
+                             timeout: float = 5) -> List[Dict[str, Any]]:
+        """
+        Attach answers taken from an execution trace to generated questions
+
+        Every top-level Python function the questions refer to is run once in
+        the unit test sandbox on generate_example_inputs and traced line by
+        line (with sys.monitoring where available, settrace otherwise) for at
+        most max_steps lines. Function questions are answered with the call
+        and its result, loop questions with the number of iterations,
+        condition questions with how often the condition was true and false,
+        and variable questions with the values the variable took. Answers are
+        added as text ('answer') and data ('answer_key') to copies of the
+        questions; questions the trace cannot answer, and questions about
+        other languages, are returned as they are. Counts from a trace that
+        hit max_steps are lower bounds and say so.
+        """
+        language = self.detect_language(code)
+        if language != Language.PYTHON:
+            return questions
+        parser = self.parsers[language]
+        parsed_code = parser.parse(code)
+        if not parsed_code:
+            return questions
+        algorithm = parser.identify_algorithm(code)
+        
+        functions = [node for node in parsed_code.body if isinstance(node, ast.FunctionDef)]
+        blocks = {node.lineno: node for node in ast.walk(parsed_code)
+                  if isinstance(node, (ast.For, ast.While, ast.If))}
+        
+        def containing_function(line):
+            for node in functions:
+                if node.lineno <= line <= node.end_lineno:
+                    return node.name
+            return None
+        
+        needed = set()
+        for question in questions:
+            category = question.get('category')
+            if category == 'function':
+                needed.add(question.get('function_name'))
+            elif category in ('loop', 'condition') and isinstance(question.get('line_num'), int):
+                needed.add(containing_function(question['line_num']))
+            elif category == 'variable':
+                needed.update(node.name for node in functions)
+        functions = [node for node in functions if node.name in needed]
+        if not functions:
+            return questions
+        
+        traces = {}
+        worker = _PythonTestWorker(self.test_limits)
+        try:
+            message = {'op': 'load', 'code': code}
+            if self.test_limits.cpu_time is not None:
+                message.update(cpu_time=self.test_limits.cpu_time,
+                               cpu_budget=self.test_limits.cpu_time * (len(functions) + 1))
+            if worker.request(message, timeout)['status'] == 'ok':
+                for node in functions:
+                    # Parameters with default values are left to their defaults
+                    params = [arg.arg for arg in node.args.args][:len(node.args.args) - len(node.args.defaults)]
+                    inputs = self.generate_example_inputs(params, f"{algorithm or ''} {node.name}".strip())
+                    trace = worker.request({'op': 'trace', 'function': node.name,
+                                            'inputs': encode_value(inputs, bytearray()),
+                                            'max_steps': max_steps}, timeout)
+                    traces[node.name] = (inputs, trace)
+        except (TimeoutError, EOFError):
+            # Keep the traces finished before the worker hung or died
+            pass
+        finally:
+            worker.kill()
+        
+        answered = []
+        for question in questions:
+            answer_key = self._trace_answer(question, traces, blocks, containing_function)
+            if answer_key:
+                question = dict(question, answer=answer_key.pop('text'), answer_key=answer_key)
+            answered.append(question)
+        return answered
+    
+    def _trace_answer(self, question: Dict[str, Any], traces: Dict[str, Any], blocks: Dict[int, ast.AST],
+                      containing_function) -> Optional[Dict[str, Any]]:
+        """Answer one question from the traces of generate_answer_keys, or return None"""
+        category = question.get('category')
+        line = question.get('line_num')
+        if category == 'function':
+            function_name = question.get('function_name')
+        elif category in ('loop', 'condition') and isinstance(line, int):
+            function_name = containing_function(line)
+        elif category == 'variable':
+            function_name = next((name for name, (_, trace) in traces.items()
+                                  if question.get('variable_name') in trace.get('variables', {})), None)
+        else:
+            return None
+        if function_name not in traces:
+            return None
+        
+        inputs, trace = traces[function_name]
+        call = f"{function_name}({', '.join(repr(value) for value in inputs)})"
+        
+        hits = {int(number): count for number, count in trace.get('lines', {}).items()}
+        
+        def entries(node, body):
+            """
+            How often the traced frames went from node's header into body, and how often not
+
+            Taken from the line transitions, so a nested header or an elif
+            sharing lines with the body cannot be mistaken for an entry. A
+            header evaluated last before its frame returned has no
+            transition and counts as not entering for a one-line header.
+            """
+            first, last = body[0].lineno, max(getattr(child, 'end_lineno', child.lineno) for child in body)
+            header_end = getattr(node.test if isinstance(node, (ast.If, ast.While)) else node.iter, 'end_lineno', line)
+            into = elsewhere = 0
+            for source, target, count in trace.get('transitions', []):
+                if not line <= source <= header_end or line <= target <= header_end:
+                    continue
+                if first <= target <= last:
+                    into += count
+                else:
+                    elsewhere += count
+            return into, max(elsewhere, hits.get(line, 0) - into)
+        
+        answer_key = {'call': call, 'tracer': trace.get('tracer'), 'steps': trace.get('steps'),
+                      'truncated': trace.get('truncated', False)}
+        
+        if category == 'function':
+            if trace['status'] != 'ok':
+                answer_key['error'] = trace['message']
+                text = f"{call} raises {trace.get('exception_type') or 'an error'}"
+            elif answer_key['truncated']:
+                text = f"{call} does not finish within {trace['steps']} traced steps"
+            else:
+                answer_key['output'] = trace['value']
+                text = f"{call} returns {trace['value']!r}"
+        elif category == 'loop':
+            node = blocks.get(line)
+            if not isinstance(node, (ast.For, ast.While)) or node.body[0].lineno == node.lineno:
+                return None
+            answer_key['iterations'] = entries(node, node.body)[0]
+            text = f"For {call}, the loop on line {line} runs {answer_key['iterations']} iteration(s)"
+        elif category == 'condition':
+            node = blocks.get(line)
+            if not isinstance(node, ast.If) or node.body[0].lineno == node.lineno:
+                return None
+            answer_key['true'], answer_key['false'] = entries(node, node.body)
+            text = (f"For {call}, the condition on line {line} is true {answer_key['true']} time(s) "
+                    f"and false {answer_key['false']} time(s)")
+        else:
+            name = question['variable_name']
+            answer_key['values'] = trace['variables'][name]
+            text = f"For {call}, {name} takes the values " + ', '.join(value for _, value in answer_key['values'])
+        
+        if answer_key['truncated']:
+            text += f" (trace stopped after {trace['steps']} steps, so counts are lower bounds)"
+        answer_key['text'] = text
+        return answer_key
+    
+    def run_unit_tests(self, code: str, test_cases: List[Dict[str, Any]], mode: Optional[str] = None,
+                       binary_threshold: Optional[int] = None, measure_memory: bool = True,
+                       use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Run unit tests on the provided code
+
+        mode selects how Python tests are executed: 'pool' runs all of a
+        submission's tests in one pre-started sandboxed worker (the default on
+        POSIX systems), 'fork' loads the submission once into a pre-started
+        fork server and runs each test in a fork of it (POSIX only), and
+        'subprocess' starts a fresh interpreter per test case.
+        Each test result also carries the returned value, the exception type,
+        wall time, user and system CPU time, peak RSS and (for Python) peak
+        traced memory; binary_threshold and measure_memory are described in
+        PythonTestWorkerPool.run_tests. Tests run under self.test_limits, and
+        a test that exceeds a limit is an error naming the limit.
+
+        With use_cache, results of tests already run against the same
+        (normalized) code are taken from self.test_result_cache instead of
+        being executed again; they are marked 'cached': True and counted in
+        'cache_hits'. Tests are then assumed not to depend on each other.
+        """
         language = self.detect_language(code)
+        if mode is None:
+            mode = 'pool' if os.name == 'posix' else 'subprocess'
         
         results = {
             'language': language.value,
@@ -1518,118 +4036,263 @@ class MultiLanguageQuestionGenerator:
             'passed': 0,
             'failed': 0,
             'errors': 0,
+            'cache_hits': 0,
             'test_results': []
         }
         
-        if language == Language.PYTHON:
-            for i, test in enumerate(test_cases):
-                test_result = self._run_python_test(code, test)
-                results['test_results'].append(test_result)
-                
-                if test_result['status'] == 'passed':
-                    results['passed'] += 1
-                elif test_result['status'] == 'failed':
-                    results['failed'] += 1
-                else:
-                    results['errors'] += 1
-        else:
-            # For other languages, we'd implement language-specific testing logic
-            results['error'] = f"Automated testing for {language.value} is not implemented yet."
+        test_results, error = self._execute_tests(code, language, test_cases, mode, None,
+                                                  binary_threshold, measure_memory, use_cache=use_cache)
+        self._tally_test_results(results, test_results, error)
         
         return results
+
+    def run_unit_tests_batch(self, submissions: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                             tests_per_task: int = 16, timeout: float = 5,
+                             binary_threshold: Optional[int] = None, measure_memory: bool = True,
+                             limits: Optional[ResourceLimits] = None, mode: str = 'pool',
+                             use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Run unit tests for many submissions in parallel
+
+        submissions is a list of {'code': ..., 'test_cases': [...]} dicts; an
+        optional 'id' is copied to the result as 'submission_id'. Test cases
+        are split into tasks of at most tests_per_task tests, which are queued
+        round-robin across submissions so a submission with many tests cannot
+        hold back the others, and run on at most max_workers sandboxed workers
+        at a time (one per CPU by default). timeout and limits (default
+        self.test_limits) apply to each test; mode is 'pool' or 'fork' and
+        use_cache works as in run_unit_tests.
+
+        Each entry of 'results' has the same shape as run_unit_tests; the top
+        level adds batch totals, elapsed time and tests per second.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        limits = limits or self.test_limits
+        start_time = time.perf_counter()
+        
+        results = []
+        languages = []
+        submission_tasks = []
+        for index, submission in enumerate(submissions):
+            test_cases = submission.get('test_cases', [])
+            languages.append(self.detect_language(submission['code']))
+            results.append({
+                'submission_id': submission.get('id', index),
+                'language': languages[index].value,
+                'total_tests': len(test_cases),
+                'passed': 0,
+                'failed': 0,
+                'errors': 0,
+                'cache_hits': 0,
+                'test_results': []
+            })
+            submission_tasks.append([test_cases[start:start + tests_per_task]
+                                     for start in range(0, len(test_cases), tests_per_task)] or [[]])
+        
+        # Round-robin order: every submission's first task, then every second task, ...
+        queue = []
+        for round_index in range(max(map(len, submission_tasks), default=0)):
+            for index, tasks in enumerate(submission_tasks):
+                if round_index < len(tasks):
+                    queue.append((index, tasks[round_index]))
+        
+        if mode not in ('pool', 'fork'):
+            raise ValueError(f"Unknown batch test execution mode: {mode}")
+        pool = PythonTestWorkerPool(size=max_workers, timeout=timeout, limits=limits, fork=mode == 'fork')
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (index, executor.submit(self._execute_tests, submissions[index]['code'],
+                                            languages[index], chunk, mode, pool,
+                                            binary_threshold, measure_memory, timeout, limits, use_cache))
+                    for index, chunk in queue
+                ]
+                # Tasks of one submission were queued in test order
+                for index, future in futures:
+                    test_results, error = future.result()
+                    self._tally_test_results(results[index], test_results, error)
+        finally:
+            pool.close()
+        
+        elapsed = time.perf_counter() - start_time
+        total_tests = sum(result['total_tests'] for result in results)
+        return {
+            'total_submissions': len(results),
+            'total_tests': total_tests,
+            'passed': sum(result['passed'] for result in results),
+            'failed': sum(result['failed'] for result in results),
+            'errors': sum(result['errors'] for result in results),
+            'cache_hits': sum(result['cache_hits'] for result in results),
+            'workers': max_workers,
+            'elapsed': elapsed,
+            'tests_per_second': total_tests / elapsed if elapsed > 0 else 0.0,
+            'results': results
+        }
+
+    def _execute_tests(self, code: str, language: Language, test_cases: List[Dict[str, Any]], mode: str,
+                       pool: Optional[PythonTestWorkerPool], binary_threshold: Optional[int],
+                       measure_memory: bool, timeout: float = 5, limits: Optional[ResourceLimits] = None,
+                       use_cache: bool = True) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Run test cases for code in the given language; returns (test_results, error)"""
+        limits = limits or self.test_limits
+        if not use_cache or not test_cases or language not in (Language.PYTHON, Language.C, Language.CPP, Language.JAVA):
+            return self._dispatch_tests(code, language, test_cases, mode, pool, binary_threshold,
+                                        measure_memory, timeout, limits)
+        
+        cache = self._get_test_result_cache()
+        source_hash = cache.source_hash(code, language)
+        runtime = self._test_runtime(language, mode, measure_memory, limits)
+        keys = [cache.key(source_hash, cache.test_case_hash(test), runtime) for test in test_cases]
+        test_results = [cache.get(key, test.get('id', 'unknown')) for key, test in zip(keys, test_cases)]
+        
+        misses = [i for i, result in enumerate(test_results) if result is None]
+        if misses:
+            fresh, error = self._dispatch_tests(code, language, [test_cases[i] for i in misses], mode, pool,
+                                                binary_threshold, measure_memory, timeout, limits)
+            if error:
+                return fresh, error
+            for i, result in zip(misses, fresh):
+                cache.put(keys[i], result)
+                test_results[i] = result
+        return test_results, None
+    
+    def _dispatch_tests(self, code: str, language: Language, test_cases: List[Dict[str, Any]], mode: str,
+                        pool: Optional[PythonTestWorkerPool], binary_threshold: Optional[int],
+                        measure_memory: bool, timeout: float,
+                        limits: ResourceLimits) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Run test cases with the runner for their language, bypassing the result cache"""
+        if language == Language.PYTHON:
+            if mode in ('pool', 'fork'):
+                pool = pool or self._get_test_worker_pool(fork=mode == 'fork')
+                return pool.run_tests(code, test_cases, binary_threshold=binary_threshold,
+                                      measure_memory=measure_memory), None
+            if mode == 'subprocess':
+                return [self._run_python_test(code, test, binary_threshold, measure_memory, limits, timeout)
+                        for test in test_cases], None
+            raise ValueError(f"Unknown test execution mode: {mode}")
+        
+        if language in (Language.C, Language.CPP, Language.JAVA):
+            return self._get_compiled_test_runner().run_tests(code, language.value, test_cases,
+                                                              timeout, limits), None
+        
+        # For other languages, we'd implement language-specific testing logic
+        return [], f"Automated testing for {language.value} is not implemented yet."
+
+    def _tally_test_results(self, results: Dict[str, Any], test_results: List[Dict[str, Any]],
+                            error: Optional[str] = None):
+        """Append test results to a run_unit_tests results dict and update its counters"""
+        for test_result in test_results:
+            results['test_results'].append(test_result)
+            
+            if test_result.get('cached'):
+                results['cache_hits'] += 1
+            if test_result['status'] == 'passed':
+                results['passed'] += 1
+            elif test_result['status'] == 'failed':
+                results['failed'] += 1
+            else:
+                results['errors'] += 1
+        if error:
+            results['error'] = error
+
+    def _test_runtime(self, language: Language, mode: str, measure_memory: bool, limits: ResourceLimits) -> str:
+        """Describe what test results depend on besides the code and the test, for cache keys"""
+        if language == Language.PYTHON:
+            version = f'{sys.implementation.name} {sys.version}'
+        else:
+            mode = 'compiled'
+            try:
+                version = self._get_compiled_test_runner()._compiler_version(CompiledTestRunner.COMPILERS[language.value])
+            except CompilationError:
+                version = 'no compiler'
+        return json.dumps([version, mode, measure_memory, vars(limits), _test_harness_fingerprint()], sort_keys=True)
+    
+    def _get_test_result_cache(self) -> TestResultCache:
+        """Create the test result cache on first use"""
+        if self.test_result_cache is None:
+            self.test_result_cache = TestResultCache()
+        return self.test_result_cache
+    
+    def _get_compiled_test_runner(self) -> CompiledTestRunner:
+        """Create the C/C++/Java test runner on first use"""
+        if self._compiled_test_runner is None:
+            self._compiled_test_runner = CompiledTestRunner()
+        return self._compiled_test_runner
+
+    def _get_test_worker_pool(self, fork: bool = False) -> PythonTestWorkerPool:
+        """Start the Python test worker pool (or the fork-server pool) on first use"""
+        if fork not in self._test_worker_pools:
+            pool = PythonTestWorkerPool(limits=self.test_limits, fork=fork)
+            atexit.register(pool.close)
+            self._test_worker_pools[fork] = pool
+        return self._test_worker_pools[fork]
     
-    def _run_python_test(self, code: str, test_case: Dict[str, Any]) -> Dict[str, Any]:
-        """Run a single Python test case"""
+    def _run_python_test(self, code: str, test_case: Dict[str, Any], binary_threshold: Optional[int] = None,
+                         measure_memory: bool = True, limits: Optional[ResourceLimits] = None,
+                         timeout: float = 5) -> Dict[str, Any]:
+        """Run a single Python test case in a fresh sandbox_worker.py interpreter"""
+        limits = limits or self.test_limits
+        test_id = test_case.get('id', 'unknown')
         function_name = test_case.get('function_name')
-        inputs = test_case.get('inputs', [])
         expected_output = test_case.get('expected_output')
         
         if not function_name or expected_output is None:
-            return {
-                'test_id': test_case.get('id', 'unknown'),
-                'status': 'error',
-                'message': 'Invalid test case: missing function name or expected output'
-            }
+            return _test_result(test_id, 'error', 'Invalid test case: missing function name or expected output')
         
-        # Create a temporary test file
-        with tempfile.NamedTemporaryFile(suffix='.py', delete=False) as temp_file:
-            test_code = code + '\n\n'
-            
-            # Add the test case
-            params = ', '.join(repr(inp) for inp in inputs)
-            test_code += f"""
-import sys
-try:
-    result = {function_name}({params})
-    print(repr(result))
-except Exception as e:
-    print(f"ERROR: {{type(e).__name__}}: {{e}}")
-    sys.exit(1)
-"""
-            temp_file.write(test_code.encode('utf-8'))
-            temp_file_path = temp_file.name
+        # Send the load and call requests up front; the worker exits at EOF
+        load_message = {'op': 'load', 'code': code}
+        if limits.cpu_time is not None:
+            load_message.update(cpu_time=limits.cpu_time, cpu_budget=2 * limits.cpu_time)
+        call_message, call_payload = _call_request(test_case, binary_threshold, measure_memory)
+        request = pack_message(load_message) + pack_message(call_message, call_payload)
+        sandbox_dir = tempfile.mkdtemp(prefix='qg_sandbox_')
         
         try:
             # Run the test
-            process = subprocess.run(
-                ['python', temp_file_path], 
-                capture_output=True, 
-                text=True,
-                timeout=5  # 5 seconds timeout
-            )
-            
-            os.unlink(temp_file_path)  # Clean up
+            # Loading and the call share a CPU budget of twice cpu_time
+            process = _run_limited([sys.executable, '-I', SANDBOX_WORKER_SCRIPT], request, sandbox_dir,
+                                   limits.wall_timeout(timeout, budget=2), limits, cpu_time=False)
+            if process['timed_out']:
+                return _test_result(test_id, 'error', 'Test timed out (possibly infinite loop)')
             
-            if process.returncode != 0:
-                return {
-                    'test_id': test_case.get('id', 'unknown'),
-                    'status': 'error',
-                    'message': process.stderr.strip() or process.stdout.strip()
-                }
+            # Parse the load and call responses
+            buffer = process['stdout']
+            responses = []
+            while len(responses) < 2:
+                received = unpack_message(buffer)
+                if received is None:
+                    break
+                response, payload, consumed = received
+                responses.append(_decode_response(response, payload))
+                buffer = buffer[consumed:]
             
-            # Parse the output
-            actual_output = process.stdout.strip()
+            if responses and responses[0]['status'] != 'ok':
+                return _test_result(test_id, 'error', responses[0]['message'], responses[0])
+            if len(responses) < 2:
+                if process['returncode'] < 0:
+                    error = dict(_cpu_fields(process['rusage']), **termination_error(process['returncode']))
+                    return _test_result(test_id, 'error', error['message'], error)
+                message = process['stderr'].decode('utf-8', 'replace').strip()
+                return _test_result(test_id, 'error', message or 'Unexpected error: test worker exited unexpectedly')
             
-            # Evaluate using safe eval
-            try:
-                actual_value = eval(actual_output)
-                
-                if actual_value == expected_output:
-                    return {
-                        'test_id': test_case.get('id', 'unknown'),
-                        'status': 'passed',
-                        'message': 'Test passed successfully'
-                    }
-                else:
-                    return {
-                        'test_id': test_case.get('id', 'unknown'),
-                        'status': 'failed',
-                        'message': f'Expected {expected_output}, but got {actual_value}'
-                    }
-            except Exception as e:
-                return {
-                    'test_id': test_case.get('id', 'unknown'),
-                    'status': 'error',
-                    'message': f'Error evaluating output: {str(e)}'
-                }
+            return _test_outcome(test_id, responses[1], expected_output)
                 
-        except subprocess.TimeoutExpired:
-            os.unlink(temp_file_path)  # Clean up
-            return {
-                'test_id': test_case.get('id', 'unknown'),
-                'status': 'error',
-                'message': 'Test timed out (possibly infinite loop)'
-            }
         except Exception as e:
-            try:
-                os.unlink(temp_file_path)  # Clean up
-            except:
-                pass
-            return {
-                'test_id': test_case.get('id', 'unknown'),
-                'status': 'error',
-                'message': f'Unexpected error: {str(e)}'
-            }
+            return _test_result(test_id, 'error', f'Unexpected error: {str(e)}')
+        finally:
+            shutil.rmtree(sandbox_dir, ignore_errors=True)
+
+# The generator of a generate_algorithm_bundle worker process, made on first use
+_bundle_generator = None
+
+
+def _analyze_bundle_member(task: Tuple[str, str, Optional[str]]) -> Dict[str, Any]:
+    """Worker process side of generate_algorithm_bundle"""
+    global _bundle_generator
+    if _bundle_generator is None:
+        _bundle_generator = MultiLanguageQuestionGenerator()
+    return _bundle_generator._bundle_member(*task)
+
 
 # Add a main function to demonstrate usage
 def main():
@@ -1690,23 +4353,10 @@ def main():
         print(f"{i}. [{q['difficulty']}] {q['question']}")
 
     # Save generated questions to a file (CSV and JSON)
-    import csv, json
     base_name = f"{selected_algo}_{os.path.splitext(selected_file)[0]}_questions"
     csv_path = os.path.join(algo_path, base_name + ".csv")
     json_path = os.path.join(algo_path, base_name + ".json")
-    # Compute all fieldnames across all questions for CSV
-    all_fieldnames = set()
-    for q in questions:
-        all_fieldnames.update(q.keys())
-    fieldnames = sorted(all_fieldnames)
-    # Save as CSV
-    with open(csv_path, "w", encoding="utf-8", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for q in questions:
-            # Fill missing fields with empty string
-            row = {k: q.get(k, "") for k in fieldnames}
-            writer.writerow(row)
+    write_questions_csv(questions, csv_path)
     # Save as JSON
     with open(json_path, "w", encoding="utf-8") as jsonfile:
         json.dump(questions, jsonfile, indent=2, ensure_ascii=False)
@@ -1,38 +1,189 @@
-import glob
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+import csv
+import json
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-# Find all question CSVs recursively in code_samples
-files = glob.glob(os.path.join('code_samples', '**', '*_questions.csv'), recursive=True)
-
-# Aggregate Bloom's levels
+import pandas as pd
 
 # Only count real, actually generated questions for each Bloom's level
 bloom_levels = ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
-bloom_counts = {level: 0 for level in bloom_levels}
-for file in files:
-    df = pd.read_csv(file)
-    for level in df['bloom']:
-        if level in bloom_counts:
-            bloom_counts[level] += 1
+
+QUESTION_SUFFIXES = ('_questions.csv', '_questions.json', '_questions.jsonl')
+DEFAULT_CACHE = 'bloom_counts_cache.json'
+
+
+def find_question_files(root):
+    """
+    Find all question files under root
+
+    main() in MultiProgrammingCodeQG.py writes the same questions as both
+    <name>_questions.csv and <name>_questions.json, so when both exist only
+    the CSV is counted. A <name>_questions.jsonl file (write_questions_jsonl)
+    is only counted when neither of those exists.
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        names = set(filenames)
+        for name in sorted(filenames):
+            if not name.endswith(QUESTION_SUFFIXES):
+                continue
+            stem = name.rsplit('.', 1)[0]
+            if name.endswith('.json') and stem + '.csv' in names:
+                continue
+            if name.endswith('.jsonl') and (stem + '.csv' in names or stem + '.json' in names):
+                continue
+            files.append(os.path.join(dirpath, name))
+    return files
+
+
+def count_bloom_levels(path):
+    """Count the Bloom's levels in one question file, reading only the bloom field"""
+    counts = Counter()
+    if path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                q = json.loads(line)
+                level = q.get('bloom') if isinstance(q, dict) else None
+                if level:
+                    counts[level] += 1
+        return dict(counts)
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        for q in questions:
+            level = q.get('bloom') if isinstance(q, dict) else None
+            if level:
+                counts[level] += 1
+        return dict(counts)
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or 'bloom' not in header:
+            return {}
+        col = header.index('bloom')
+        for row in reader:
+            # pd.read_csv treated empty cells as NaN, which never matched a level
+            if len(row) > col and row[col]:
+                counts[row[col]] += 1
+    return dict(counts)
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_cache(cache_path):
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def save_cache(cache_path, cache):
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def aggregate_bloom_counts(files, max_workers=None, cache_path=DEFAULT_CACHE):
+    """
+    Aggregate Bloom's level counts over question files
+
+    Per-file counts are kept in cache_path keyed by path, modification time
+    and size, so only new or changed files are re-read. Files are counted in
+    parallel worker processes.
+    """
+    cache = load_cache(cache_path)
+    signatures = {path: _file_signature(path) for path in files}
+    stale = [path for path in files
+             if cache.get(path, {}).get('signature') != signatures[path]]
+
+    if stale:
+        if max_workers == 1 or len(stale) == 1:
+            partials = [count_bloom_levels(path) for path in stale]
         else:
-            bloom_counts[level] = 1  # In case of unexpected label
-
-# Convert to DataFrame for table/plot
-bloom_df = pd.DataFrame(list(bloom_counts.items()), columns=['Bloom_Level', 'Count'])
-bloom_df['Percent'] = 100 * bloom_df['Count'] / bloom_df['Count'].sum()
-
-# Print the table
-print('Bloom\'s Level Distribution Table:')
-print(bloom_df)
-
-# Plot
-plt.figure(figsize=(8,5))
-plt.bar(bloom_df['Bloom_Level'], bloom_df['Percent'], color='skyblue')
-plt.ylabel('Percent of Questions')
-plt.xlabel('Bloom\'s Level')
-plt.title("Bloom's Taxonomy Distribution of Generated Questions")
-plt.tight_layout()
-plt.savefig('blooms_distribution_plot.png')
-plt.show()
+            workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Batch many small files per task to keep IPC overhead low
+                partials = list(executor.map(count_bloom_levels, stale,
+                                             chunksize=max(1, len(stale) // (workers * 4))))
+        for path, counts in zip(stale, partials):
+            cache[path] = {'signature': signatures[path], 'counts': counts}
+
+    bloom_counts = {level: 0 for level in bloom_levels}
+    for path in files:
+        for level, count in cache[path]['counts'].items():
+            # Unexpected labels are appended after the known levels
+            bloom_counts[level] = bloom_counts.get(level, 0) + count
+
+    if cache_path:
+        # Drop entries for files that no longer exist under the searched root
+        if stale or len(cache) != len(files):
+            save_cache(cache_path, {path: cache[path] for path in files})
+
+    print(f"Counted {len(stale)} new or changed of {len(files)} question files")
+    return bloom_counts
+
+
+def plot_bloom_distribution(bloom_df, output='blooms_distribution_plot.png', headless=False):
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8,5))
+    plt.bar(bloom_df['Bloom_Level'], bloom_df['Percent'], color='skyblue')
+    plt.ylabel('Percent of Questions')
+    plt.xlabel('Bloom\'s Level')
+    plt.title("Bloom's Taxonomy Distribution of Generated Questions")
+    plt.tight_layout()
+    plt.savefig(output)
+    if headless:
+        plt.close()
+    else:
+        plt.show()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bloom's level distribution of generated questions")
+    parser.add_argument('root', nargs='?', default='code_samples',
+                        help='directory searched recursively for *_questions.csv/.json/.jsonl files')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (1 reads files inline)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help="per-file count cache ('' disables it)")
+    parser.add_argument('--output', default='blooms_distribution_plot.png')
+    parser.add_argument('--headless', action='store_true',
+                        help='save the plot without opening a window')
+    args = parser.parse_args()
+
+    files = find_question_files(args.root)
+
+    # Aggregate Bloom's levels
+    bloom_counts = aggregate_bloom_counts(files, max_workers=args.workers, cache_path=args.cache)
+
+    # Convert to DataFrame for table/plot
+    bloom_df = pd.DataFrame(list(bloom_counts.items()), columns=['Bloom_Level', 'Count'])
+    bloom_df['Percent'] = 100 * bloom_df['Count'] / bloom_df['Count'].sum()
+
+    # Print the table
+    print('Bloom\'s Level Distribution Table:')
+    print(bloom_df)
+
+    # Plot
+    plot_bloom_distribution(bloom_df, output=args.output, headless=args.headless)
+
+
+if __name__ == '__main__':
+    main()
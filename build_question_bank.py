@@ -0,0 +1,27 @@
+import argparse
+import time
+
+from MultiProgrammingCodeQG import MultiLanguageQuestionGenerator, QuestionBank
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render every candidate question of a code corpus into a SQLite bank')
+    parser.add_argument('root', nargs='?', default='code_samples',
+                        help='directory searched recursively for .py/.java/.cpp/.c files')
+    parser.add_argument('--db', default='question_bank.sqlite3', help='bank file (created or updated)')
+    args = parser.parse_args()
+
+    generator = MultiLanguageQuestionGenerator()
+    bank = QuestionBank(args.db)
+    start = time.perf_counter()
+    report = bank.build_corpus(generator, args.root)
+    elapsed = time.perf_counter() - start
+
+    for path, error in report['failed'].items():
+        print(f'Skipped {path}: {error}')
+    print(f"Banked {len(report['built'])} code files in {elapsed:.2f}s into {args.db}")
+    bank.close()
+
+
+if __name__ == '__main__':
+    main()
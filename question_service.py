@@ -0,0 +1,520 @@
+"""
+HTTP service for MultiLanguageQuestionGenerator
+
+    python question_service.py --port 8000 --workers 4
+
+Endpoints (JSON in, JSON out):
+
+    POST /generate  {"code": "...", "num_questions": 6, "difficulty": "intermediate", "answer_keys": false,
+                     "seed": 42}
+        -> {"questions": [...]}
+    POST /quiz      {"code": "...", "num_questions": 5, "mixed_difficulty": true, "seed": 42}
+        -> {"quiz": {...}}
+    POST /explain   {"code": "..."}
+        -> {"explanation": "..."}
+    GET  /metrics
+        -> request, batch, queue and latency statistics
+
+The asyncio event loop only parses HTTP and JSON. Parsing code and
+generating questions runs in a pool of worker processes, each holding its
+own generator. Requests that arrive close together are grouped into
+micro-batches of up to max_batch_size jobs (waiting at most
+max_batch_delay seconds for a batch to fill), and at most one batch per
+worker is in flight, so under load the batches grow instead of the
+executor queue. At most max_pending jobs wait for a batch; beyond that
+requests are refused at once with 503 and a Retry-After header rather than
+queued without bound, and a request that is not answered within timeout
+seconds gets 504. Together these keep tail latency bounded by the queue
+length instead of the offered load.
+
+Only the expensive, deterministic part of a request runs in a worker: the
+analysis and candidate questions (prepare_quiz for quizzes). Concurrent
+requests for the same code (by hash) and the same SHARED_PARAMS wait on one
+such job instead of each queueing their own, which is what happens when a
+whole class submits the same starter file at once. Each request then draws
+its own sample from the shared candidates with its "seed" (a fresh random
+seed if none is given), so students still get different question mixes.
+Sampling runs in the loop's default thread pool, not on the loop itself.
+Parameters are validated before anything is queued, and invalid ones get
+400.
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import random
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from MultiProgrammingCodeQG import MultiLanguageQuestionGenerator, DifficultyLevel
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    408: 'Request Timeout', 411: 'Length Required', 413: 'Payload Too Large',
+    500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout'
+}
+
+# Endpoints handled by the worker processes, and the key of their result
+JOB_ENDPOINTS = {'/generate': 'questions', '/quiz': 'quiz', '/explain': 'explanation'}
+
+# Parameters (besides the code) of the work requests share, with their defaults;
+# the rest, such as num_questions and seed, only affect sampling
+SHARED_PARAMS = {
+    '/generate': {'difficulty': DifficultyLevel.INTERMEDIATE.value, 'answer_keys': False},
+    '/quiz': {'mixed_difficulty': True},
+    '/explain': {}
+}
+
+# Largest num_questions a request may ask for
+MAX_QUESTIONS = 100
+
+_generator = None
+
+
+def _init_worker():
+    """Process pool initializer: build the worker's generator once"""
+    global _generator
+    _generator = MultiLanguageQuestionGenerator()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _run_job(endpoint, params):
+    """The shareable part of a request: candidate questions, a prepared quiz or an explanation"""
+    code = params['code']
+    if endpoint == '/generate':
+        return _generator.generate_question_candidates(code, DifficultyLevel(params['difficulty']),
+                                                       params['answer_keys'])
+    elif endpoint == '/quiz':
+        return _generator.prepare_quiz(code, params['mixed_difficulty'])
+    return _generator.generate_code_explanation(code)
+
+
+def _shared_params(endpoint, params):
+    """The code and SHARED_PARAMS of a request, with defaults filled in"""
+    shared = {'code': params['code']}
+    for name, default in SHARED_PARAMS[endpoint].items():
+        value = params.get(name, default)
+        shared[name] = bool(value) if isinstance(default, bool) else value
+    return shared
+
+
+def _validate_params(endpoint, params):
+    """
+    Check and coerce the parameters of a request before it is queued
+
+    Returns a copy with num_questions as an int. Raises ValueError, which
+    the handler turns into 400, instead of letting the worker fail on it.
+    """
+    params = dict(params)
+    if 'num_questions' in params and endpoint != '/explain':
+        value = params['num_questions']
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        elif isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_QUESTIONS:
+            raise ValueError(f"'num_questions' must be an integer from 1 to {MAX_QUESTIONS}")
+        params['num_questions'] = value
+    for name, default in SHARED_PARAMS[endpoint].items():
+        if name not in params:
+            continue
+        if isinstance(default, bool) and not isinstance(params[name], bool):
+            raise ValueError(f"'{name}' must be true or false")
+    if 'difficulty' in SHARED_PARAMS[endpoint] and 'difficulty' in params:
+        levels = [level.value for level in DifficultyLevel]
+        if params['difficulty'] not in levels:
+            raise ValueError(f"'difficulty' must be one of {', '.join(levels)}")
+    seed = params.get('seed')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, str))):
+        raise ValueError("'seed' must be an integer or a string")
+    return params
+
+
+def _flight_key(endpoint, shared):
+    """Source hash plus the shared parameters"""
+    source_hash = hashlib.sha256(shared['code'].encode('utf-8')).hexdigest()
+    options = {name: value for name, value in shared.items() if name != 'code'}
+    return endpoint, source_hash, json.dumps(options, sort_keys=True)
+
+
+def _run_batch(jobs):
+    """
+    Run a micro-batch of (endpoint, params) jobs in a worker process
+
+    Returns one (ok, result or error message) pair per job, so one failing
+    job does not fail the others.
+    """
+    results = []
+    for endpoint, params in jobs:
+        try:
+            results.append((True, _run_job(endpoint, params)))
+        except Exception as e:
+            results.append((False, f'{type(e).__name__}: {e}'))
+    return results
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the pending job queue is full"""
+
+
+class _Job:
+    __slots__ = ('endpoint', 'params', 'future')
+
+    def __init__(self, endpoint, params, future):
+        self.endpoint = endpoint
+        self.params = params
+        self.future = future
+
+
+class QuestionService:
+    """
+    Asyncio HTTP front end that micro-batches jobs onto a process pool
+
+    See the module docstring for the endpoints and the batching,
+    backpressure and timeout behaviour.
+    """
+
+    def __init__(self, workers=None, max_batch_size=16, max_batch_delay=0.005, max_pending=1024,
+                 timeout=10.0, max_body=1 << 20, read_timeout=10.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_body = max_body
+        self.read_timeout = read_timeout
+        self._executor = None
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._batch_tasks = set()
+        self._server = None
+        # In-flight shared jobs by _flight_key, and a generator for per-request sampling
+        self._flights = {}
+        self._sampler = MultiLanguageQuestionGenerator()
+        self._coalesced = 0
+        self._started = time.monotonic()
+        self._latencies = deque(maxlen=4096)
+        self._requests = Counter()
+        self._responses = Counter()
+        self._batches = 0
+        self._batched_jobs = 0
+        self._largest_batch = 0
+        self._in_flight = 0
+
+    async def start(self, host='127.0.0.1', port=8000):
+        """Start the worker processes and begin accepting connections"""
+        loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        # Start every worker up front so the first requests do not pay for it
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        for task in list(self._batch_tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, endpoint, params):
+        """
+        Queue one job and wait for its result
+
+        Raises ServiceOverloaded if max_pending jobs are already waiting,
+        asyncio.TimeoutError after timeout seconds and RuntimeError with the
+        worker's message if the job failed.
+        """
+        job = _Job(endpoint, params, asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ServiceOverloaded
+        # On timeout wait_for cancels the future, and the batcher drops the job
+        return await asyncio.wait_for(job.future, self.timeout)
+
+    async def submit_shared(self, endpoint, params):
+        """
+        Like submit, but joins an identical job already in flight
+
+        params must be _shared_params output. The shared job is shielded,
+        so a waiter that goes away does not cancel it for the others.
+        """
+        key = _flight_key(endpoint, params)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self.submit(endpoint, params))
+            self._flights[key] = flight
+            flight.add_done_callback(functools.partial(self._end_flight, key))
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _end_flight(self, key, flight):
+        del self._flights[key]
+        if not flight.cancelled():
+            # Mark the exception as retrieved even if every waiter has gone
+            flight.exception()
+
+    def _finish(self, endpoint, params, shared_result):
+        """Sample this request's questions from the shared result"""
+        if endpoint == '/explain':
+            return shared_result
+        seed = params.get('seed')
+        rng = random.Random(seed) if seed is not None else random.Random()
+        if endpoint == '/generate':
+            return self._sampler.sample_questions(shared_result, params.get('num_questions', 6), rng)
+        return self._sampler.assemble_quiz(shared_result, params.get('num_questions', 5), rng)
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free worker first: while all are busy, jobs pile up
+            # in the queue and the next batch gets bigger
+            await self._slots.acquire()
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_batch_delay
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+
+            batch = [job for job in batch if not job.future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        self._batches += 1
+        self._batched_jobs += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+        self._in_flight += 1
+        executor = self._executor
+        try:
+            results = await loop.run_in_executor(executor, _run_batch,
+                                                 [(job.endpoint, job.params) for job in batch])
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); replace the pool for later batches. Every
+            # batch in flight on it fails the same way, and only the first one swaps it
+            if self._executor is executor:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+                executor.shutdown(wait=False, cancel_futures=True)
+            results = [(False, f'Worker process failed: {e}')] * len(batch)
+        except Exception as e:
+            results = [(False, f'{type(e).__name__}: {e}')] * len(batch)
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+        for job, (ok, value) in zip(batch, results):
+            if job.future.done():
+                continue
+            if ok:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(RuntimeError(value))
+
+    async def handle_request(self, method, path, body):
+        """Route one request; returns (status, response object, extra headers)"""
+        if path == '/metrics':
+            if method != 'GET':
+                return 405, {'error': 'Use GET'}, {'Allow': 'GET'}
+            return 200, self.metrics(), {}
+        if path not in JOB_ENDPOINTS:
+            return 404, {'error': f'Unknown endpoint {path}'}, {}
+        if method != 'POST':
+            return 405, {'error': 'Use POST'}, {'Allow': 'POST'}
+
+        try:
+            params = json.loads(body or b'{}')
+        except ValueError as e:
+            return 400, {'error': f'Invalid JSON: {e}'}, {}
+        if not isinstance(params, dict) or not isinstance(params.get('code'), str):
+            return 400, {'error': "Expected a JSON object with a 'code' string"}, {}
+        try:
+            params = _validate_params(path, params)
+        except ValueError as e:
+            return 400, {'error': str(e)}, {}
+
+        try:
+            shared_result = await self.submit_shared(path, _shared_params(path, params))
+        except ServiceOverloaded:
+            return 503, {'error': 'Too many pending requests'}, {'Retry-After': '1'}
+        except asyncio.TimeoutError:
+            return 504, {'error': f'Request did not finish within {self.timeout} seconds'}, {}
+        except RuntimeError as e:
+            return 500, {'error': str(e)}, {}
+        try:
+            # Sampling is linear in the candidates; keep it off the event loop
+            result = await asyncio.get_running_loop().run_in_executor(None, self._finish, path, params, shared_result)
+        except Exception as e:
+            return 500, {'error': f'{type(e).__name__}: {e}'}, {}
+        return 200, {JOB_ENDPOINTS[path]: result}, {}
+
+    async def _read_request(self, reader):
+        """Read one request; returns (method, path, headers, body), None at EOF, or an error status"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3:
+            return 400
+        method, path, version = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            return 411
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return 400
+        if length > self.max_body:
+            return 413
+        body = await reader.readexactly(length) if length else b''
+        headers[':version'] = version
+        return method, path.split('?', 1)[0], headers, body
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.read_timeout)
+                except asyncio.TimeoutError:
+                    request = 408
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                    request = 400
+                if request is None:
+                    break
+                if isinstance(request, int):
+                    self._write_response(writer, request, {'error': HTTP_REASONS[request]}, {}, False)
+                    await writer.drain()
+                    break
+
+                method, path, headers, body = request
+                start = time.perf_counter()
+                self._requests[path if path in JOB_ENDPOINTS or path == '/metrics' else 'other'] += 1
+                status, payload, extra_headers = await self.handle_request(method, path, body)
+                self._responses[status] += 1
+                if path in JOB_ENDPOINTS:
+                    self._latencies.append(time.perf_counter() - start)
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (headers[':version'] != 'HTTP/1.0' or connection == 'keep-alive')
+                self._write_response(writer, status, payload, extra_headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _write_response(self, writer, status, payload, extra_headers, keep_alive):
+        body = json.dumps(payload, default=repr).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'Content-Length': str(len(body)),
+                   'Connection': 'keep-alive' if keep_alive else 'close'}
+        headers.update(extra_headers)
+        head = f'HTTP/1.1 {status} {HTTP_REASONS.get(status, "")}\r\n'
+        head += ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+
+    def metrics(self):
+        """Request counts, batching, queue and latency statistics"""
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            'uptime': round(time.monotonic() - self._started, 3),
+            'workers': self.workers,
+            'requests': dict(self._requests),
+            'responses': {str(status): count for status, count in sorted(self._responses.items())},
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'max_pending': self.max_pending,
+            'batches_in_flight': self._in_flight,
+            'batches': self._batches,
+            'mean_batch_size': round(self._batched_jobs / self._batches, 3) if self._batches else None,
+            'largest_batch': self._largest_batch,
+            'shared_jobs_in_flight': len(self._flights),
+            'coalesced': self._coalesced,
+            # Over the most recent job requests
+            'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'p99': percentile(0.99),
+                           'max': percentile(1.0), 'samples': len(latencies)}
+        }
+
+
+async def serve(args):
+    service = QuestionService(workers=args.workers, max_batch_size=args.max_batch_size,
+                              max_batch_delay=args.max_batch_delay, max_pending=args.max_pending,
+                              timeout=args.timeout)
+    server = await service.start(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP service for code question generation')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--max-batch-size', type=int, default=16,
+                        help='most requests sent to a worker at once')
+    parser.add_argument('--max-batch-delay', type=float, default=0.005,
+                        help='seconds to wait for a batch to fill')
+    parser.add_argument('--max-pending', type=int, default=1024,
+                        help='queued requests before new ones get 503')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help='seconds before a request gets 504')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
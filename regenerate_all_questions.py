@@ -20,13 +20,9 @@ code_files = glob.glob(os.path.join('code_samples', '**', '*.py'), recursive=Tru
 for code_file in code_files:
     with open(code_file, 'r', encoding='utf-8') as f:
         code = f.read()
-    # Generate questions (6 per sample, one for each Bloom's level)
-    questions = gen.generate_questions(code, num_questions=6)
-    # Save to CSV
-    import pandas as pd
-    import os
+    # Generate questions (6 per sample, one for each Bloom's level) and stream them to CSV
+    questions = gen.iter_questions(code, num_questions=6)
     out_dir = os.path.dirname(code_file)
     out_csv = os.path.join(out_dir, os.path.splitext(os.path.basename(code_file))[0] + '_questions.csv')
-    df = pd.DataFrame(questions)
-    df.to_csv(out_csv, index=False)
+    mod.write_questions_csv(questions, out_csv)
     print(f'Generated: {out_csv}')
@@ -0,0 +1,609 @@
+"""
+Test worker process for MultiLanguageQuestionGenerator.run_unit_tests
+
+The parent starts this script with ``python -I`` in an empty temporary
+directory and talks to it over stdin/stdout. Every message is framed as
+
+    >II header length, payload length | JSON header | binary payload
+
+    {"op": "load", "code": "...", "cpu_time": s, "cpu_budget": s}
+        -> {"status": "ok"}
+    {"op": "call", "function": "f", "inputs": [...], "binary_threshold": n, "measure_memory": true,
+     "fork": false, "timeout": s, "min_time": s}
+        -> {"status": "ok", "value": ..., "wall_time": s, "cpu_user": s, "cpu_system": s,
+            "peak_rss": bytes, "peak_memory": bytes, "calls": n}
+    {"op": "trace", "function": "f", "inputs": [...], "max_steps": n}
+        -> {"status": "ok", "value": ..., "tracer": "sys.monitoring", "steps": n, "truncated": false,
+            "lines": {"12": hits, ...}, "transitions": [[from_line, to_line, count], ...],
+            "variables": {"name": [[line, "repr"], ...], ...}}
+
+With "fork" set the worker acts as a fork server: the submission was
+compiled and executed once at load, and every call runs in a forked copy
+of the worker, so a test cannot change what the next one sees. The worker
+kills a child that runs longer than "timeout" seconds.
+
+With "min_time" the function is called again until the calls add up to at
+least that many seconds (as timeit.Timer.autorange does), on freshly
+decoded inputs if the first call changed them, and wall and CPU times are
+per call. This makes calls of a few microseconds measurable.
+
+A trace runs the function like a call while recording every line of the
+submission it executes: how often each line ran and, for each local
+variable, the values it took and the line that assigned them. It uses
+sys.monitoring (Python 3.12+) and falls back to sys.settrace. After
+max_steps line events the function is stopped and the trace comes back
+with "truncated" set.
+
+On load the worker caps its total CPU time at cpu_budget seconds (the hard
+RLIMIT_CPU) and before every call allows cpu_time more seconds (the soft
+limit), so a runaway test is killed by SIGXCPU.
+
+Failures come back with status "error", the exception type and a message.
+Values are JSON with tagged objects for tuples, sets, dicts, bytes and
+values that have no faithful encoding (see encode_value). With
+binary_threshold set, int and float lists of at least that many items are
+sent as packed arrays in the payload instead of JSON. The submission's own
+stdin/stdout are detached from the protocol pipes so that print() or input()
+in student code cannot corrupt the stream.
+"""
+import base64
+import gc
+import json
+import math
+import os
+import reprlib
+import select
+import signal
+import struct
+import sys
+import time
+import tracemalloc
+import traceback
+from array import array
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+_FRAME = struct.Struct('>II')
+
+# Signals that mean a resource limit was hit rather than a crash
+LIMIT_SIGNALS = {
+    'SIGXCPU': 'CPU time limit exceeded',
+    'SIGXFSZ': 'File size limit exceeded'
+}
+
+
+class OpaqueValue:
+    """A returned value that could not be encoded; compares unequal to everything"""
+
+    def __init__(self, type_name, text):
+        self.type_name = type_name
+        self.text = text
+
+    def __eq__(self, other):
+        return False
+
+    __hash__ = None
+
+    def __repr__(self):
+        return self.text
+
+
+def pack_message(message, payload=b''):
+    header = json.dumps(message).encode('utf-8')
+    return _FRAME.pack(len(header), len(payload)) + header + payload
+
+
+def unpack_message(buffer):
+    """
+    Split one message off the front of buffer
+
+    Returns (message, payload, bytes consumed), or None if buffer does not yet
+    hold a complete message.
+    """
+    if len(buffer) < _FRAME.size:
+        return None
+    header_length, payload_length = _FRAME.unpack_from(buffer)
+    header_end = _FRAME.size + header_length
+    end = header_end + payload_length
+    if len(buffer) < end:
+        return None
+    message = json.loads(bytes(buffer[_FRAME.size:header_end]))
+    return message, bytes(buffer[header_end:end]), end
+
+
+def _read_exactly(stream, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def read_message(stream):
+    """Blocking read of one message; returns (message, payload) or None at EOF"""
+    frame = _read_exactly(stream, _FRAME.size)
+    if frame is None:
+        return None
+    header_length, payload_length = _FRAME.unpack(frame)
+    body = _read_exactly(stream, header_length + payload_length)
+    if body is None:
+        return None
+    return json.loads(bytes(body[:header_length])), bytes(body[header_length:])
+
+
+def _encode_array(values, payload):
+    """Pack a homogeneous int or float list into payload, or return None"""
+    if all(type(v) is int for v in values):
+        typecode = 'q'
+    elif all(type(v) is float for v in values):
+        typecode = 'd'
+    else:
+        return None
+    try:
+        packed = array(typecode, values).tobytes()
+    except OverflowError:
+        return None
+    start = len(payload)
+    payload += packed
+    return {'__array__': typecode, 'start': start, 'count': len(values)}
+
+
+def encode_value(value, payload, binary_threshold=None):
+    """
+    Encode value as JSON-compatible data, appending packed arrays to payload
+
+    JSON objects only ever appear as tags, so they cannot be confused with
+    user data: dicts become {"__dict__": [[key, value], ...]}, and tuples,
+    sets, bytes and packed arrays get their own tags. Anything else is sent
+    as its repr and decoded into an OpaqueValue.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, list):
+        if binary_threshold is not None and len(value) >= binary_threshold:
+            node = _encode_array(value, payload)
+            if node is not None:
+                return node
+        return [encode_value(v, payload, binary_threshold) for v in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [encode_value(v, payload, binary_threshold) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': [encode_value(v, payload, binary_threshold) for v in value],
+                'frozen': isinstance(value, frozenset)}
+    if isinstance(value, dict):
+        return {'__dict__': [[encode_value(k, payload, binary_threshold),
+                              encode_value(v, payload, binary_threshold)]
+                             for k, v in value.items()]}
+    if isinstance(value, (bytes, bytearray)):
+        return {'__bytes__': base64.b64encode(value).decode('ascii')}
+    if isinstance(value, OpaqueValue):
+        return {'__repr__': value.text, 'type': value.type_name}
+    return {'__repr__': repr(value), 'type': type(value).__name__}
+
+
+def decode_value(data, payload=b''):
+    """Inverse of encode_value"""
+    if isinstance(data, list):
+        return [decode_value(v, payload) for v in data]
+    if not isinstance(data, dict):
+        return data
+    if '__tuple__' in data:
+        return tuple(decode_value(v, payload) for v in data['__tuple__'])
+    if '__set__' in data:
+        items = (decode_value(v, payload) for v in data['__set__'])
+        return frozenset(items) if data['frozen'] else set(items)
+    if '__dict__' in data:
+        return {decode_value(k, payload): decode_value(v, payload) for k, v in data['__dict__']}
+    if '__bytes__' in data:
+        return base64.b64decode(data['__bytes__'])
+    if '__array__' in data:
+        values = array(data['__array__'])
+        start = data['start']
+        values.frombytes(payload[start:start + data['count'] * values.itemsize])
+        return values.tolist()
+    return OpaqueValue(data['type'], data['__repr__'])
+
+
+def termination_error(returncode):
+    """Error response for a test process killed by signal -returncode"""
+    signal_name = signal.Signals(-returncode).name
+    message = LIMIT_SIGNALS.get(signal_name, f'Runtime error: terminated by {signal_name}')
+    return {'status': 'error', 'exception_type': signal_name, 'message': message}
+
+
+def _cpu_seconds_used():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _limit_cpu(seconds, hard=False):
+    """Allow this process `seconds` more CPU time (soft limit, or hard limit too)"""
+    if resource is None or seconds is None:
+        return
+    limit = math.ceil(_cpu_seconds_used() + seconds)
+    current_soft, current_hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if current_hard != resource.RLIM_INFINITY:
+        limit = min(limit, current_hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, limit if hard else current_hard))
+
+
+def _reset_peak_rss():
+    """Reset the kernel's resident set high-water mark (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss():
+    """Peak resident set size in bytes since the last _reset_peak_rss, where supported"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # Fallback: the process-wide peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _detach_protocol_streams():
+    """Keep private copies of the pipes and point fds 0/1 away from them"""
+    proto_in = os.fdopen(os.dup(0), 'rb')
+    proto_out = os.fdopen(os.dup(1), 'wb')
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+    sys.stdin = open(os.devnull, 'r')
+    sys.stdout = sys.stderr
+    return proto_in, proto_out
+
+
+def _load(namespace, request):
+    namespace.clear()
+    namespace['__name__'] = '__submission__'
+    namespace['__cpu_time__'] = request.get('cpu_time')
+    code = request['code']
+    _limit_cpu(request.get('cpu_budget'), hard=True)
+    try:
+        exec(compile(code, '<submission>', 'exec'), namespace)
+    except BaseException as e:
+        return {'status': 'error',
+                'exception_type': type(e).__name__,
+                'message': ''.join(traceback.format_exception_only(type(e), e)).strip()}, b''
+    return {'status': 'ok'}, b''
+
+
+def _call(namespace, request, request_payload):
+    function_name = request['function']
+    measure_memory = request.get('measure_memory', True)
+    response = {'status': 'ok'}
+    payload = bytearray()
+
+    try:
+        args = decode_value(request['inputs'], request_payload)
+        func = namespace.get(function_name)
+        if func is None:
+            raise NameError(f"name '{function_name}' is not defined")
+    except BaseException as e:
+        return {'status': 'error', 'exception_type': type(e).__name__,
+                'message': f"ERROR: {type(e).__name__}: {e}"}, b''
+
+    min_time = request.get('min_time') or 0
+    _limit_cpu(namespace.get('__cpu_time__'))
+    _reset_peak_rss()
+    if measure_memory:
+        tracemalloc.start()
+    usage_before = resource.getrusage(resource.RUSAGE_SELF) if resource else None
+    wall_time = 0.0
+    calls = 0
+    changes_inputs = None
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                result = func(*args)
+            finally:
+                wall_time += time.perf_counter() - start
+                calls += 1
+            if wall_time >= min_time:
+                break
+            # A call that changed its inputs in place (a sort) is repeated on fresh ones;
+            # the others reuse them, since decoding can cost more than the call
+            if changes_inputs is None:
+                changes_inputs = decode_value(request['inputs'], request_payload) != args
+            if changes_inputs:
+                args = decode_value(request['inputs'], request_payload)
+    except BaseException as e:
+        response = {'status': 'error', 'exception_type': type(e).__name__,
+                    'message': f"ERROR: {type(e).__name__}: {e}"}
+    finally:
+        response['wall_time'] = wall_time / calls
+        response['calls'] = calls
+        if usage_before is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            response['cpu_user'] = (usage.ru_utime - usage_before.ru_utime) / calls
+            response['cpu_system'] = (usage.ru_stime - usage_before.ru_stime) / calls
+        response['peak_rss'] = _peak_rss()
+        if measure_memory:
+            response['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if response['status'] == 'ok':
+        try:
+            response['value'] = encode_value(result, payload, request.get('binary_threshold'))
+        except BaseException as e:
+            payload = bytearray()
+            response.update(status='error', exception_type=type(e).__name__,
+                            message=f"Error encoding output: {type(e).__name__}: {e}")
+    return response, bytes(payload)
+
+
+def _forked_call(namespace, request, request_payload, protocol_fds):
+    """Run _call in a forked child and relay its response"""
+    read_fd, write_fd = os.pipe()
+    # Keep the collector away from the loaded objects so the child does not copy their pages
+    gc.freeze()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            for fd in protocol_fds:
+                os.close(fd)
+            response, payload = _call(namespace, request, request_payload)
+            data = memoryview(pack_message(response, payload))
+            while data:
+                data = data[os.write(write_fd, data):]
+        finally:
+            os._exit(0)
+    # Only the child needs them frozen; the server's permanent generation must not grow call by call
+    gc.unfreeze()
+    os.close(write_fd)
+
+    timeout = request.get('timeout')
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    buffer = bytearray()
+    timed_out = False
+    while True:
+        remaining = deadline - time.monotonic() if deadline is not None else None
+        if (remaining is not None and remaining <= 0) or not select.select([read_fd], [], [], remaining)[0]:
+            timed_out = True
+            os.kill(pid, signal.SIGKILL)
+            break
+        chunk = os.read(read_fd, 1 << 20)
+        if not chunk:
+            break
+        buffer += chunk
+    os.close(read_fd)
+    _, status = os.waitpid(pid, 0)
+
+    if timed_out:
+        return {'status': 'error', 'message': 'Test timed out (possibly infinite loop)'}, b''
+    received = unpack_message(buffer)
+    if received is not None:
+        return received[0], received[1]
+    if os.WIFSIGNALED(status):
+        return termination_error(-os.WTERMSIG(status)), b''
+    return {'status': 'error', 'exception_type': None,
+            'message': f'Unexpected error: test process exited with status {os.WEXITSTATUS(status)}'}, b''
+
+
+class _StepBudgetExceeded(BaseException):
+    """Raised into traced code once the trace step budget is used up"""
+
+
+class _LineRecorder:
+    """
+    Line hit counts, line-to-line transitions and variable value histories of traced submission code
+
+    Everything is tracked per frame, so recursive calls do not mix up each
+    other's previous line or last seen values. A transition (a, b) means a
+    frame executed line a and then line b. A branch or loop header's
+    transitions into its body show which way it actually went.
+    """
+
+    def __init__(self, max_steps, max_history=50):
+        self.max_steps = max_steps
+        self.max_history = max_history
+        self.steps = 0
+        self.lines = {}
+        self.variables = {}
+        # Short reprs, so recording a large list costs no more than a small one
+        self._repr = reprlib.Repr()
+        self._repr.maxstring = self._repr.maxother = 60
+        self.transitions = {}
+        # Last seen value reprs and last executed line of each live frame, by id(frame)
+        self._last_values = {}
+        self._frame_lines = {}
+
+    def line(self, frame, line):
+        """Record that frame is about to execute line"""
+        self.steps += 1
+        if self.steps > self.max_steps:
+            raise _StepBudgetExceeded
+        self.lines[line] = self.lines.get(line, 0) + 1
+        self._snapshot(frame)
+        previous_line = self._frame_lines.get(id(frame))
+        if previous_line is not None:
+            edge = (previous_line, line)
+            self.transitions[edge] = self.transitions.get(edge, 0) + 1
+        self._frame_lines[id(frame)] = line
+
+    def finish(self, frame):
+        """Record the values left by the last line frame executed before returning, then forget the frame"""
+        self._snapshot(frame)
+        self._frame_lines.pop(id(frame), None)
+        self._last_values.pop(id(frame), None)
+
+    def _snapshot(self, frame):
+        # Values seen at a line event were assigned by the frame's previous line
+        previous_line = self._frame_lines.get(id(frame))
+        if previous_line is None:
+            previous_line = frame.f_code.co_firstlineno
+        last_values = self._last_values.setdefault(id(frame), {})
+        for name, value in list(frame.f_locals.items()):
+            try:
+                text = self._repr.repr(value)
+            except BaseException:
+                text = f'<{type(value).__name__}>'
+            if last_values.get(name) == text:
+                continue
+            last_values[name] = text
+            history = self.variables.setdefault(name, [])
+            if len(history) < self.max_history:
+                history.append([previous_line, text])
+
+
+def _is_submission(code):
+    return code.co_filename == '<submission>'
+
+
+def _monitoring_tool_id():
+    """Claim a free sys.monitoring tool id, or return None to fall back to settrace"""
+    if not hasattr(sys, 'monitoring'):
+        return None
+    for tool_id in (sys.monitoring.COVERAGE_ID, 3, 4):
+        try:
+            sys.monitoring.use_tool_id(tool_id, 'qg-trace')
+            return tool_id
+        except ValueError:
+            continue
+    return None
+
+
+def _run_monitored(func, args, recorder, tool_id):
+    """Run func(*args) with recorder attached through sys.monitoring"""
+    monitoring = sys.monitoring
+    events = monitoring.events
+
+    def on_line(code, line):
+        if not _is_submission(code):
+            return monitoring.DISABLE
+        recorder.line(sys._getframe(1), line)
+
+    def on_return(code, offset, value):
+        if not _is_submission(code):
+            return monitoring.DISABLE
+        recorder.finish(sys._getframe(1))
+
+    def on_unwind(code, offset, exception):
+        # PY_UNWIND cannot be disabled per location
+        if _is_submission(code):
+            recorder.finish(sys._getframe(1))
+
+    monitoring.register_callback(tool_id, events.LINE, on_line)
+    monitoring.register_callback(tool_id, events.PY_RETURN, on_return)
+    monitoring.register_callback(tool_id, events.PY_UNWIND, on_unwind)
+    monitoring.set_events(tool_id, events.LINE | events.PY_RETURN | events.PY_UNWIND)
+    try:
+        return func(*args)
+    finally:
+        monitoring.set_events(tool_id, 0)
+        monitoring.register_callback(tool_id, events.LINE, None)
+        monitoring.register_callback(tool_id, events.PY_RETURN, None)
+        monitoring.register_callback(tool_id, events.PY_UNWIND, None)
+        monitoring.free_tool_id(tool_id)
+        # Locations disabled for library code would otherwise stay disabled
+        monitoring.restart_events()
+
+
+def _run_settrace(func, args, recorder):
+    """Run func(*args) with recorder attached through sys.settrace"""
+    def local_trace(frame, event, arg):
+        if event == 'line':
+            recorder.line(frame, frame.f_lineno)
+        elif event == 'return':
+            recorder.finish(frame)
+        return local_trace
+
+    def global_trace(frame, event, arg):
+        return local_trace if _is_submission(frame.f_code) else None
+
+    sys.settrace(global_trace)
+    try:
+        return func(*args)
+    finally:
+        sys.settrace(None)
+
+
+def _trace(namespace, request, request_payload):
+    function_name = request['function']
+    try:
+        args = decode_value(request['inputs'], request_payload)
+        func = namespace.get(function_name)
+        if func is None:
+            raise NameError(f"name '{function_name}' is not defined")
+    except BaseException as e:
+        return {'status': 'error', 'exception_type': type(e).__name__,
+                'message': f"ERROR: {type(e).__name__}: {e}"}, b''
+
+    recorder = _LineRecorder(request.get('max_steps', 10000))
+    tool_id = _monitoring_tool_id()
+    response = {'status': 'ok', 'tracer': 'settrace' if tool_id is None else 'sys.monitoring',
+                'truncated': False}
+    payload = bytearray()
+    _limit_cpu(namespace.get('__cpu_time__'))
+    try:
+        if tool_id is None:
+            result = _run_settrace(func, args, recorder)
+        else:
+            result = _run_monitored(func, args, recorder, tool_id)
+        response['value'] = encode_value(result, payload)
+    except _StepBudgetExceeded:
+        response['truncated'] = True
+    except BaseException as e:
+        payload = bytearray()
+        response.update(status='error', exception_type=type(e).__name__,
+                        message=f"ERROR: {type(e).__name__}: {e}")
+    response.update(steps=min(recorder.steps, recorder.max_steps),
+                    lines={str(line): hits for line, hits in recorder.lines.items()},
+                    transitions=[[a, b, count] for (a, b), count in recorder.transitions.items()],
+                    variables=recorder.variables)
+    return response, bytes(payload)
+
+
+def main():
+    proto_in, proto_out = _detach_protocol_streams()
+    protocol_fds = (proto_in.fileno(), proto_out.fileno())
+    namespace = {}
+
+    while True:
+        received = read_message(proto_in)
+        if received is None:
+            break
+        request, payload = received
+
+        if request['op'] == 'load':
+            response, response_payload = _load(namespace, request)
+        elif request['op'] == 'call' and request.get('fork'):
+            response, response_payload = _forked_call(namespace, request, payload, protocol_fds)
+        elif request['op'] == 'call':
+            response, response_payload = _call(namespace, request, payload)
+        elif request['op'] == 'trace':
+            response, response_payload = _trace(namespace, request, payload)
+        else:
+            response, response_payload = {'status': 'error', 'exception_type': None,
+                                          'message': f"Unknown operation {request['op']!r}"}, b''
+
+        proto_out.write(pack_message(response, response_payload))
+        proto_out.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+import java.io.BufferedInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.lang.reflect.Array;
+import java.lang.reflect.Constructor;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Modifier;
+import java.lang.reflect.ParameterizedType;
+import java.lang.reflect.Type;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.LinkedHashMap;
+import java.util.LinkedHashSet;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+public class QgTestDriver {
+    private static final InputStream in = new BufferedInputStream(System.in);
+    private static final StringBuilder out = new StringBuilder();
+
+    private static void badInput() {
+        System.err.println("Could not read test input");
+        System.exit(2);
+    }
+
+    private static String readToken() throws IOException {
+        StringBuilder token = new StringBuilder();
+        int c = in.read();
+        while (c != -1 && Character.isWhitespace(c)) c = in.read();
+        while (c != -1 && !Character.isWhitespace(c)) {
+            token.append((char) c);
+            c = in.read();
+        }
+        if (token.length() == 0) badInput();
+        return token.toString();
+    }
+
+    private static int readSize() throws IOException {
+        int size = Integer.parseInt(readToken());
+        if (size < 0) badInput();
+        return size;
+    }
+
+    private static String readString() throws IOException {
+        // The single space after the length was consumed by readToken
+        int length = readSize();
+        byte[] bytes = new byte[length];
+        int offset = 0;
+        while (offset < length) {
+            int n = in.read(bytes, offset, length - offset);
+            if (n < 0) badInput();
+            offset += n;
+        }
+        return new String(bytes, StandardCharsets.UTF_8);
+    }
+
+    private static Class<?> rawClass(Type type) {
+        if (type instanceof Class) return (Class<?>) type;
+        if (type instanceof ParameterizedType) return (Class<?>) ((ParameterizedType) type).getRawType();
+        return Object.class;
+    }
+
+    private static Type typeArgument(Type type, int index) {
+        if (type instanceof ParameterizedType) return ((ParameterizedType) type).getActualTypeArguments()[index];
+        return Object.class;
+    }
+
+    @SuppressWarnings("unchecked")
+    private static Object readValue(Type type) throws Exception {
+        Class<?> c = rawClass(type);
+        if (c == int.class || c == Integer.class) return (int) Long.parseLong(readToken());
+        if (c == long.class || c == Long.class) return Long.parseLong(readToken());
+        if (c == short.class || c == Short.class) return (short) Long.parseLong(readToken());
+        if (c == byte.class || c == Byte.class) return (byte) Long.parseLong(readToken());
+        if (c == double.class || c == Double.class) return Double.parseDouble(readToken());
+        if (c == float.class || c == Float.class) return (float) Double.parseDouble(readToken());
+        if (c == boolean.class || c == Boolean.class) return Long.parseLong(readToken()) != 0;
+        if (c == char.class || c == Character.class) return readString().charAt(0);
+        if (c == String.class || c == Object.class || c == CharSequence.class) return readString();
+        if (c.isArray()) {
+            int length = readSize();
+            Object array = Array.newInstance(c.getComponentType(), length);
+            for (int i = 0; i < length; i++) Array.set(array, i, readValue(c.getComponentType()));
+            return array;
+        }
+        if (Map.class.isAssignableFrom(c)) {
+            Map<Object, Object> map = c.isInterface() || c.isAssignableFrom(LinkedHashMap.class)
+                ? new LinkedHashMap<>() : (Map<Object, Object>) c.getDeclaredConstructor().newInstance();
+            int length = readSize();
+            for (int i = 0; i < length; i++) {
+                Object key = readValue(typeArgument(type, 0));
+                map.put(key, readValue(typeArgument(type, 1)));
+            }
+            return map;
+        }
+        if (Collection.class.isAssignableFrom(c)) {
+            Collection<Object> items;
+            if (!c.isInterface()) items = (Collection<Object>) c.getDeclaredConstructor().newInstance();
+            else if (Set.class.isAssignableFrom(c)) items = new LinkedHashSet<>();
+            else items = new ArrayList<>();
+            int length = readSize();
+            for (int i = 0; i < length; i++) items.add(readValue(typeArgument(type, 0)));
+            return items;
+        }
+        throw new IllegalArgumentException("unsupported parameter type for compiled tests: " + type);
+    }
+
+    private static void emitString(String text) {
+        out.append('"');
+        for (int i = 0; i < text.length(); i++) {
+            char c = text.charAt(i);
+            if (c == '"' || c == '\\') out.append('\\').append(c);
+            else if (c < 0x20 || c > 0x7e) out.append(String.format("\\u%04x", (int) c));
+            else out.append(c);
+        }
+        out.append('"');
+    }
+
+    private static void emitItems(Iterable<?> items) {
+        boolean first = true;
+        for (Object item : items) {
+            if (!first) out.append(',');
+            first = false;
+            emit(item);
+        }
+    }
+
+    private static void emit(Object value) {
+        if (value == null) out.append("null");
+        else if (value instanceof Boolean) out.append(((Boolean) value) ? "true" : "false");
+        else if (value instanceof Character) emitString(value.toString());
+        else if (value instanceof Double || value instanceof Float) {
+            double number = ((Number) value).doubleValue();
+            if (Double.isNaN(number)) out.append("NaN");
+            else if (Double.isInfinite(number)) out.append(number > 0 ? "Infinity" : "-Infinity");
+            else out.append(Double.toString(number));
+        }
+        else if (value instanceof Number) out.append(value.toString());
+        else if (value instanceof String) emitString((String) value);
+        else if (value.getClass().isArray()) {
+            out.append('[');
+            for (int i = 0; i < Array.getLength(value); i++) {
+                if (i > 0) out.append(',');
+                emit(Array.get(value, i));
+            }
+            out.append(']');
+        }
+        else if (value instanceof Set) {
+            out.append("{\"__set__\":[");
+            emitItems((Set<?>) value);
+            out.append("],\"frozen\":false}");
+        }
+        else if (value instanceof Collection) {
+            out.append('[');
+            emitItems((Collection<?>) value);
+            out.append(']');
+        }
+        else if (value instanceof Map) {
+            out.append("{\"__dict__\":[");
+            boolean first = true;
+            for (Map.Entry<?, ?> entry : ((Map<?, ?>) value).entrySet()) {
+                if (!first) out.append(',');
+                first = false;
+                out.append('[');
+                emit(entry.getKey());
+                out.append(',');
+                emit(entry.getValue());
+                out.append(']');
+            }
+            out.append("]}");
+        }
+        else {
+            out.append("{\"__repr__\":");
+            emitString(value.toString());
+            out.append(",\"type\":");
+            emitString(value.getClass().getSimpleName());
+            out.append('}');
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        Class<?> target = Class.forName("__QG_CLASS__");
+        int argumentCount = readSize();
+        Method method = null;
+        for (Method candidate : target.getDeclaredMethods()) {
+            if (candidate.getName().equals("__QG_FUNCTION__") && candidate.getParameterCount() == argumentCount) {
+                method = candidate;
+                break;
+            }
+        }
+        if (method == null) {
+            System.err.println("ERROR: NoSuchMethodException: __QG_FUNCTION__ with " + argumentCount + " parameters");
+            System.exit(3);
+        }
+        method.setAccessible(true);
+
+        Type[] types = method.getGenericParameterTypes();
+        Object[] values = new Object[types.length];
+        try {
+            for (int i = 0; i < types.length; i++) values[i] = readValue(types[i]);
+        }
+        catch (IllegalArgumentException e) {
+            System.err.println(e.getMessage());
+            System.exit(2);
+        }
+        catch (Exception e) {
+            badInput();
+        }
+
+        Object instance = null;
+        if (!Modifier.isStatic(method.getModifiers())) {
+            Constructor<?> constructor = target.getDeclaredConstructor();
+            constructor.setAccessible(true);
+            instance = constructor.newInstance();
+        }
+
+        Object result;
+        try {
+            result = method.invoke(instance, values);
+        }
+        catch (InvocationTargetException e) {
+            Throwable cause = e.getCause();
+            System.out.flush();
+            System.err.println("ERROR: " + cause.getClass().getSimpleName() + ": " + cause.getMessage());
+            System.exit(3);
+            return;
+        }
+
+        if (method.getReturnType() == void.class) {
+            // A void method's result is its first array argument, e.g. an in-place sort
+            for (Object value : values) {
+                if (value != null && (value.getClass().isArray() || value instanceof Collection)) {
+                    result = value;
+                    break;
+                }
+            }
+        }
+        emit(result);
+        System.out.flush();
+        System.out.print(peakRss() + "\n__QG_RESULT__\n" + out);
+        System.out.flush();
+    }
+
+    // The JVM's resident high-water mark (Linux), reported like the C and C++ drivers
+    private static String peakRss() {
+        try {
+            for (String line : Files.readAllLines(Paths.get("/proc/self/status"), StandardCharsets.UTF_8)) {
+                if (line.startsWith("VmHWM:")) {
+                    long kib = Long.parseLong(line.substring(6).trim().split("\\s+")[0]);
+                    return "\n__QG_PEAK_RSS__ " + kib * 1024;
+                }
+            }
+        }
+        catch (IOException | RuntimeException e) {
+            // Not Linux; the peak is left unreported
+        }
+        return "";
+    }
+}
@@ -0,0 +1,331 @@
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <exception>
+#include <map>
+#include <set>
+#include <string>
+#include <tuple>
+#include <type_traits>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+#if defined(__GNUC__)
+#include <cxxabi.h>
+#endif
+#include <typeinfo>
+
+namespace __qg {
+
+template <typename T> struct dependent_false : std::false_type {};
+template <typename T> struct is_sequence : std::false_type {};
+template <typename T, typename A> struct is_sequence<std::vector<T, A>> : std::true_type {};
+
+[[noreturn]] inline void bad_input() {
+    std::fprintf(stderr, "Could not read test input\n");
+    std::exit(2);
+}
+
+inline long long read_integer() {
+    long long value;
+    if (std::scanf(" %lld", &value) != 1) bad_input();
+    return value;
+}
+
+inline double read_real() {
+    char token[512];
+    if (std::scanf(" %511s", token) != 1) bad_input();
+    return std::strtod(token, nullptr);
+}
+
+inline std::size_t read_size() {
+    long long value = read_integer();
+    if (value < 0) bad_input();
+    return static_cast<std::size_t>(value);
+}
+
+inline std::string read_string() {
+    std::size_t length = read_size();
+    if (std::getchar() != ' ') bad_input();
+    std::string text(length, '\0');
+    if (length && std::fread(&text[0], 1, length, stdin) != length) bad_input();
+    return text;
+}
+
+inline std::map<const void*, std::size_t>& array_lengths() {
+    static std::map<const void*, std::size_t> lengths;
+    return lengths;
+}
+
+template <typename T> void read(T& value);
+template <typename T> void read(T*& value);
+template <typename T, typename A> void read(std::vector<T, A>& value);
+template <typename K, typename V, typename C, typename A> void read(std::map<K, V, C, A>& value);
+template <typename K, typename V, typename H, typename E, typename A> void read(std::unordered_map<K, V, H, E, A>& value);
+template <typename T, typename C, typename A> void read(std::set<T, C, A>& value);
+template <typename T, typename H, typename E, typename A> void read(std::unordered_set<T, H, E, A>& value);
+template <typename A, typename B> void read(std::pair<A, B>& value);
+inline void read(std::string& value) { value = read_string(); }
+inline void read(char& value) { value = read_string()[0]; }
+inline void read(bool& value) { value = read_integer() != 0; }
+inline void read(const char*& value) { value = (new std::string(read_string()))->c_str(); }
+inline void read(char*& value) { value = &(*new std::string(read_string()))[0]; }
+
+template <typename T> void read(T& value) {
+    if constexpr (std::is_integral_v<T>) value = static_cast<T>(read_integer());
+    else if constexpr (std::is_floating_point_v<T>) value = static_cast<T>(read_real());
+    else static_assert(dependent_false<T>::value, "unsupported parameter type for compiled tests");
+}
+
+template <typename T> void read(T*& value) {
+    // C-style array parameter; the storage lives until the process exits
+    auto* storage = new std::vector<std::remove_const_t<T>>();
+    read(*storage);
+    storage->emplace_back();
+    value = storage->data();
+    array_lengths()[value] = storage->size() - 1;
+}
+
+template <typename T, typename A> void read(std::vector<T, A>& value) {
+    std::size_t length = read_size();
+    value.clear();
+    for (std::size_t i = 0; i < length; i++) {
+        T item{};
+        read(item);
+        value.push_back(item);
+    }
+}
+
+template <typename K, typename V, typename C, typename A> void read(std::map<K, V, C, A>& value) {
+    std::size_t length = read_size();
+    for (std::size_t i = 0; i < length; i++) {
+        K key{};
+        V item{};
+        read(key);
+        read(item);
+        value[key] = item;
+    }
+}
+
+template <typename K, typename V, typename H, typename E, typename A> void read(std::unordered_map<K, V, H, E, A>& value) {
+    std::size_t length = read_size();
+    for (std::size_t i = 0; i < length; i++) {
+        K key{};
+        V item{};
+        read(key);
+        read(item);
+        value[key] = item;
+    }
+}
+
+template <typename T, typename C, typename A> void read(std::set<T, C, A>& value) {
+    std::size_t length = read_size();
+    for (std::size_t i = 0; i < length; i++) {
+        T item{};
+        read(item);
+        value.insert(item);
+    }
+}
+
+template <typename T, typename H, typename E, typename A> void read(std::unordered_set<T, H, E, A>& value) {
+    std::size_t length = read_size();
+    for (std::size_t i = 0; i < length; i++) {
+        T item{};
+        read(item);
+        value.insert(item);
+    }
+}
+
+template <typename A, typename B> void read(std::pair<A, B>& value) {
+    if (read_size() != 2) bad_input();
+    read(value.first);
+    read(value.second);
+}
+
+inline void emit_chars(const char* text, std::size_t length) {
+    std::putchar('"');
+    for (std::size_t i = 0; i < length; i++) {
+        unsigned char c = static_cast<unsigned char>(text[i]);
+        if (c == '"' || c == '\\') std::printf("\\%c", c);
+        else if (c < 0x20) std::printf("\\u%04x", c);
+        else std::putchar(c);
+    }
+    std::putchar('"');
+}
+
+template <typename T> void emit(const T& value);
+template <typename T> void emit(T* const& value);
+template <typename T, typename A> void emit(const std::vector<T, A>& value);
+template <typename K, typename V, typename C, typename A> void emit(const std::map<K, V, C, A>& value);
+template <typename K, typename V, typename H, typename E, typename A> void emit(const std::unordered_map<K, V, H, E, A>& value);
+template <typename T, typename C, typename A> void emit(const std::set<T, C, A>& value);
+template <typename T, typename H, typename E, typename A> void emit(const std::unordered_set<T, H, E, A>& value);
+template <typename A, typename B> void emit(const std::pair<A, B>& value);
+inline void emit(const std::string& value) { emit_chars(value.data(), value.size()); }
+inline void emit(const char& value) { emit_chars(&value, 1); }
+inline void emit(const bool& value) { std::printf(value ? "true" : "false"); }
+inline void emit(const char* const& value) {
+    if (value == nullptr) std::printf("null");
+    else emit_chars(value, std::char_traits<char>::length(value));
+}
+inline void emit(char* const& value) { emit(static_cast<const char*>(value)); }
+
+template <typename T> void emit(const T& value) {
+    if constexpr (std::is_integral_v<T>) std::printf("%lld", static_cast<long long>(value));
+    else if constexpr (std::is_floating_point_v<T>) {
+        double number = static_cast<double>(value);
+        if (std::isnan(number)) std::printf("NaN");
+        else if (std::isinf(number)) std::printf(number > 0 ? "Infinity" : "-Infinity");
+        else std::printf("%.17g", number);
+    }
+    else static_assert(dependent_false<T>::value, "unsupported return type for compiled tests");
+}
+
+template <typename T> void emit(T* const& value) {
+    auto found = array_lengths().find(value);
+    if (found == array_lengths().end()) {
+        std::printf("null");
+        return;
+    }
+    std::putchar('[');
+    for (std::size_t i = 0; i < found->second; i++) {
+        if (i) std::putchar(',');
+        emit(value[i]);
+    }
+    std::putchar(']');
+}
+
+template <typename T, typename A> void emit(const std::vector<T, A>& value) {
+    std::putchar('[');
+    for (std::size_t i = 0; i < value.size(); i++) {
+        if (i) std::putchar(',');
+        emit(static_cast<T>(value[i]));
+    }
+    std::putchar(']');
+}
+
+template <typename Items> void emit_items(const Items& items) {
+    bool first = true;
+    for (const auto& item : items) {
+        if (!first) std::putchar(',');
+        first = false;
+        emit(item);
+    }
+}
+
+template <typename Map> void emit_map(const Map& value) {
+    std::printf("{\"__dict__\":[");
+    bool first = true;
+    for (const auto& item : value) {
+        if (!first) std::putchar(',');
+        first = false;
+        std::putchar('[');
+        emit(item.first);
+        std::putchar(',');
+        emit(item.second);
+        std::putchar(']');
+    }
+    std::printf("]}");
+}
+
+template <typename K, typename V, typename C, typename A> void emit(const std::map<K, V, C, A>& value) { emit_map(value); }
+template <typename K, typename V, typename H, typename E, typename A> void emit(const std::unordered_map<K, V, H, E, A>& value) { emit_map(value); }
+
+template <typename T, typename C, typename A> void emit(const std::set<T, C, A>& value) {
+    std::printf("{\"__set__\":[");
+    emit_items(value);
+    std::printf("],\"frozen\":false}");
+}
+
+template <typename T, typename H, typename E, typename A> void emit(const std::unordered_set<T, H, E, A>& value) {
+    std::printf("{\"__set__\":[");
+    emit_items(value);
+    std::printf("],\"frozen\":false}");
+}
+
+template <typename A, typename B> void emit(const std::pair<A, B>& value) {
+    std::printf("{\"__tuple__\":[");
+    emit(value.first);
+    std::putchar(',');
+    emit(value.second);
+    std::printf("]}");
+}
+
+template <typename T> bool emit_if_array(const T& value) {
+    // A void function's result is its first array argument, e.g. an in-place sort
+    if constexpr (is_sequence<T>::value ||
+                  (std::is_pointer_v<T> && !std::is_same_v<std::remove_cv_t<std::remove_pointer_t<T>>, char>)) {
+        emit(value);
+        return true;
+    }
+    else {
+        return false;
+    }
+}
+
+inline void report_peak_rss() {
+    // This process's own resident high-water mark (Linux), which starts afresh at exec
+    char line[256];
+    std::FILE* status = std::fopen("/proc/self/status", "r");
+    if (status == nullptr) return;
+    while (std::fgets(line, sizeof line, status)) {
+        if (std::strncmp(line, "VmHWM:", 6) == 0) {
+            std::printf("\n__QG_PEAK_RSS__ %lld", std::strtoll(line + 6, nullptr, 10) * 1024);
+            break;
+        }
+    }
+    std::fclose(status);
+}
+
+inline void begin_result() {
+    std::fflush(stdout);
+    report_peak_rss();
+    std::printf("\n__QG_RESULT__\n");
+}
+
+template <typename R, typename... Args> void run(R (*function)(Args...)) {
+    std::tuple<std::remove_cv_t<std::remove_reference_t<Args>>...> args;
+    read_size();  // argument count, used by the Java driver
+    std::apply([](auto&... arg) { (read(arg), ...); }, args);
+    try {
+        if constexpr (std::is_void_v<R>) {
+            std::apply(function, args);
+            begin_result();
+            bool emitted = false;
+            std::apply([&emitted](auto&... arg) { ((emitted = emitted || emit_if_array(arg)), ...); }, args);
+            if (!emitted) std::printf("null");
+        }
+        else {
+            auto&& result = std::apply(function, args);
+            begin_result();
+            emit(result);
+        }
+    }
+    catch (const std::exception& e) {
+        std::string type_name = typeid(e).name();
+#if defined(__GNUC__)
+        int status = 0;
+        char* demangled = abi::__cxa_demangle(type_name.c_str(), nullptr, nullptr, &status);
+        if (status == 0) type_name = demangled;
+        std::free(demangled);
+#endif
+        std::fflush(stdout);
+        std::fprintf(stderr, "ERROR: %s: %s\n", type_name.c_str(), e.what());
+        std::exit(3);
+    }
+    catch (...) {
+        std::fflush(stdout);
+        std::fprintf(stderr, "ERROR: exception: unknown exception\n");
+        std::exit(3);
+    }
+    std::fflush(stdout);
+}
+
+}  // namespace __qg
+
+int main() {
+    __qg::run(&__QG_FUNCTION__);
+    return 0;
+}
@@ -0,0 +1,97 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+
+static void __qg_bad_input(void) {
+    fprintf(stderr, "Could not read test input\n");
+    exit(2);
+}
+
+static long long __qg_read_integer(void) {
+    long long value;
+    if (scanf(" %lld", &value) != 1) __qg_bad_input();
+    return value;
+}
+
+static double __qg_read_real(void) {
+    char token[512];
+    if (scanf(" %511s", token) != 1) __qg_bad_input();
+    return strtod(token, NULL);
+}
+
+static size_t __qg_read_size(void) {
+    long long value = __qg_read_integer();
+    if (value < 0) __qg_bad_input();
+    return (size_t)value;
+}
+
+static char *__qg_read_string(void) {
+    size_t length = __qg_read_size();
+    char *text;
+    if (getchar() != ' ') __qg_bad_input();
+    text = (char *)malloc(length + 1);
+    if (fread(text, 1, length, stdin) != length) __qg_bad_input();
+    text[length] = '\0';
+    return text;
+}
+
+static char __qg_read_char(void) {
+    return __qg_read_string()[0];
+}
+
+static void __qg_emit_integer(long long value) {
+    printf("%lld", value);
+}
+
+static void __qg_emit_real(double value) {
+    if (isnan(value)) printf("NaN");
+    else if (isinf(value)) printf(value > 0 ? "Infinity" : "-Infinity");
+    else printf("%.17g", value);
+}
+
+static void __qg_emit_bool(int value) {
+    printf(value ? "true" : "false");
+}
+
+static void __qg_emit_chars(const char *text, size_t length) {
+    size_t i;
+    putchar('"');
+    for (i = 0; i < length; i++) {
+        unsigned char c = (unsigned char)text[i];
+        if (c == '"' || c == '\\') printf("\\%c", c);
+        else if (c < 0x20) printf("\\u%04x", c);
+        else putchar(c);
+    }
+    putchar('"');
+}
+
+static void __qg_emit_string(const char *text) {
+    if (text == NULL) printf("null");
+    else __qg_emit_chars(text, strlen(text));
+}
+
+static void __qg_emit_char(char c) {
+    __qg_emit_chars(&c, 1);
+}
+
+static void __qg_report_peak_rss(void) {
+    /* This process's own resident high-water mark (Linux), which starts afresh at exec */
+    char line[256];
+    FILE *status = fopen("/proc/self/status", "r");
+    if (status == NULL) return;
+    while (fgets(line, sizeof line, status)) {
+        if (strncmp(line, "VmHWM:", 6) == 0) {
+            printf("\n__QG_PEAK_RSS__ %lld", strtoll(line + 6, NULL, 10) * 1024);
+            break;
+        }
+    }
+    fclose(status);
+}
+
+static void __qg_begin_result(void) {
+    fflush(stdout);
+    __qg_report_peak_rss();
+    printf("\n__QG_RESULT__\n");
+}
+
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root, next to this directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    """Keep the caches of compiled drivers and test results out of the user's cache directory"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path_factory.getbasetemp() / 'cache'))
+
+
+@pytest.fixture(scope='session')
+def evaluation():
+    """The EvaluationCodeComplete module; tests using it are skipped without its dependencies"""
+    for module in ('pandas', 'numpy', 'matplotlib', 'seaborn', 'spacy', 'nltk', 'sklearn', 'scipy', 'textstat'):
+        pytest.importorskip(module)
+    try:
+        import EvaluationCodeComplete
+    except OSError as e:  # the spaCy model is not installed
+        pytest.skip(f'EvaluationCodeComplete cannot load: {e}')
+    return EvaluationCodeComplete
+
+
+QUESTIONS = [
+    'List the variables used in {name}.',
+    'Explain what the loop in {name} does.',
+    'Apply {name} to the list [3, 1, 2].',
+    'Analyze the time complexity of {name}.',
+    'Evaluate whether {name} handles empty input.',
+    'Design a test that breaks {name}.',
+    'Describe the return value of {name}.',
+]
+
+
+@pytest.fixture
+def question_frames():
+    """Question frames shaped like the output of preprocess_data, for n questions per language"""
+    import pandas as pd
+
+    def frames(n=40, languages=('C', 'CPP', 'Java', 'Python')):
+        dfs = {}
+        for offset, lang in enumerate(languages):
+            rows = []
+            for i in range(n):
+                algorithm = f'algorithm_{(i + offset) % 5}'
+                rows.append({
+                    'algorithm': algorithm,
+                    'code': f'int {algorithm}(int count) {{ return count; }}',
+                    'complexity': ['Simple', 'Moderate', 'Complex'][i % 3],
+                    'question': QUESTIONS[(i * 3 + offset) % len(QUESTIONS)].format(name=algorithm),
+                    'level': ['beginner', 'intermediate', 'advanced'][i % 3],
+                    'code_elements': {'variables': ['count'], 'functions': [algorithm]},
+                })
+            dfs[f'{lang}_questions'] = pd.DataFrame(rows)
+        return dfs
+
+    return frames
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+FOLDER = os.path.join(ROOT, 'code_samples', 'quick_sort')
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+@pytest.mark.parametrize('hint, expected', [
+    ('quick_sort', 'quick_sort'),
+    ('Quick Sort', 'quick_sort'),
+    ('breadth_first_search', 'bfs'),
+])
+def test_vote_algorithm_folder_hint_decides(generator, hint, expected):
+    identified = {'python': 'binary_search', 'java': 'binary_search'}
+    assert generator.vote_algorithm(identified, hint) == expected
+
+
+def test_vote_algorithm_majority_and_first_on_ties(generator):
+    assert generator.vote_algorithm({'python': 'dfs', 'java': 'bfs', 'cpp': 'bfs'}, 'my_folder') == 'bfs'
+    assert generator.vote_algorithm({'python': 'dfs', 'java': 'bfs', 'c': None}) == 'dfs'
+    assert generator.vote_algorithm({'python': None, 'java': None}, 'unrelated') is None
+
+
+def test_bundle_serial_and_parallel_agree(generator):
+    serial = generator.generate_algorithm_bundle(FOLDER, 4, seed=7, max_workers=1)
+    parallel = generator.generate_algorithm_bundle(FOLDER, 4, seed=7, max_workers=2)
+    assert json.dumps(serial, sort_keys=True) == json.dumps(parallel, sort_keys=True)
+
+
+def test_bundle_aligns_questions_across_languages(generator):
+    bundle = generator.generate_algorithm_bundle(FOLDER, 4, seed=7, max_workers=1)
+    assert bundle['algorithm'] == 'quick_sort'
+    assert set(bundle['languages']) == {'python', 'java', 'cpp', 'c'}
+    aligned = [language for language, entry in bundle['languages'].items() if entry['aligned']]
+    assert aligned
+    for entry in bundle['languages'].values():
+        assert entry['metrics']['language']
+        assert entry['questions']
+    for index, row in enumerate(bundle['aligned']):
+        assert row['template_id'] and row['bloom']
+        assert set(row['questions']) == set(aligned)
+        for language, question in row['questions'].items():
+            assert bundle['languages'][language]['questions'][index]['template_id'] == row['template_id']
+            assert bundle['languages'][language]['questions'][index]['question'] == question
+
+
+def test_bundle_is_seeded(generator):
+    first = generator.generate_algorithm_bundle(FOLDER, 4, seed=11, max_workers=1)
+    second = generator.generate_algorithm_bundle(FOLDER, 4, seed=11, max_workers=1)
+    assert json.dumps(first, sort_keys=True) == json.dumps(second, sort_keys=True)
@@ -0,0 +1,91 @@
+import os
+import sys
+import math
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+import sandbox_worker
+
+CODE = '''def fact(n):
+    result = 1
+    if n > 1:
+        result = n * fact(n - 1)
+    return result
+
+def classify(values):
+    counts = [0, 0, 0]
+    for v in values:
+        for w in range(2):
+            pass
+        if v < 2:
+            counts[0] += 1
+        elif v < 4:
+            counts[1] += 1
+        else:
+            counts[2] += 1
+    return counts
+
+def spin(n):
+    while True:
+        n += 1
+'''
+
+
+def classify(values):
+    return [sum(v < 2 for v in values), sum(2 <= v < 4 for v in values), sum(v >= 4 for v in values)]
+
+
+@pytest.fixture(scope='module')
+def answers():
+    generator = qg.MultiLanguageQuestionGenerator()
+    questions = [
+        {'category': 'function', 'function_name': 'classify', 'question': 'What does classify return?'},
+        {'category': 'loop', 'line_num': 9, 'question': 'How often does the outer loop run?'},
+        {'category': 'loop', 'line_num': 10, 'question': 'How often does the inner loop run?'},
+        {'category': 'condition', 'line_num': 12, 'question': 'How often is v < 2?'},
+        {'category': 'variable', 'variable_name': 'counts', 'question': 'Which values does counts take?'},
+        {'category': 'function', 'function_name': 'fact', 'question': 'What does fact return?'},
+        {'category': 'function', 'function_name': 'spin', 'question': 'What does spin return?'},
+        {'category': 'concept', 'question': 'Why use a list of counts?'},
+    ]
+    values = generator.generate_example_inputs(['values'], 'classify')[0]
+    n = generator.generate_example_inputs(['n'], 'fact')[0]
+    return generator.generate_answer_keys(CODE, questions, max_steps=1000), values, n
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='the unit test sandbox is POSIX only')
+def test_answers_come_from_the_trace(answers):
+    (returned, outer, inner, condition, counts, fact, spin, concept), values, n = answers
+    assert returned['answer_key']['output'] == classify(values)
+    assert returned['answer'] == f'classify({values!r}) returns {classify(values)!r}'
+    assert outer['answer_key']['iterations'] == len(values)
+    assert inner['answer_key']['iterations'] == 2 * len(values)
+    assert (condition['answer_key']['true'], condition['answer_key']['false']) == \
+        (classify(values)[0], len(values) - classify(values)[0])
+    assert counts['answer_key']['values'][-1][1] == repr(classify(values))
+    assert fact['answer_key']['output'] == math.factorial(n)
+    assert not any(key['answer_key']['truncated'] for key in (returned, outer, condition, fact))
+
+    assert spin['answer_key']['truncated']
+    assert 'does not finish' in spin['answer']
+    assert 'answer' not in concept
+
+
+def test_other_languages_are_returned_unchanged():
+    questions = [{'category': 'function', 'function_name': 'main', 'question': 'What does main return?'}]
+    code = 'public class Main { public static int main() { return 1; } }'
+    assert qg.MultiLanguageQuestionGenerator().generate_answer_keys(code, questions) == questions
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason='sys.monitoring needs Python 3.12')
+def test_monitoring_and_settrace_agree(monkeypatch):
+    namespace = {}
+    sandbox_worker._load(namespace, {'code': CODE})
+    request = {'function': 'classify', 'inputs': [[0, 3, 5, 1]]}
+    monitored, _ = sandbox_worker._trace(namespace, request, b'')
+    monkeypatch.setattr(sandbox_worker, '_monitoring_tool_id', lambda: None)
+    traced, _ = sandbox_worker._trace(namespace, request, b'')
+    assert monitored['tracer'] != traced['tracer']
+    for key in ('status', 'value', 'steps', 'lines', 'transitions', 'variables'):
+        assert monitored[key] == traced[key]
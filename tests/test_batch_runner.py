@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='sandboxed workers are POSIX only')
+
+CODE = '''def add(a, b):
+    return a + b
+'''
+
+
+def add_tests(count, wrong=()):
+    return [{'test_id': i, 'function_name': 'add', 'inputs': [i, 1],
+             'expected_output': i + (2 if i in wrong else 1)} for i in range(count)]
+
+
+@pytest.fixture
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+def test_tasks_are_queued_round_robin(generator, monkeypatch):
+    calls = []
+    execute_tests = generator._execute_tests
+
+    def recorded(code, language, test_cases, *args):
+        calls.append((code, [test['test_id'] for test in test_cases]))
+        return execute_tests(code, language, test_cases, *args)
+
+    monkeypatch.setattr(generator, '_execute_tests', recorded)
+    big, small = CODE, CODE + '\n# small\n'
+    generator.run_unit_tests_batch([{'code': big, 'test_cases': add_tests(10)},
+                                    {'code': small, 'test_cases': add_tests(3)}],
+                                   max_workers=1, tests_per_task=4)
+    # The small submission's only task runs right after the big one's first
+    assert calls == [(big, [0, 1, 2, 3]), (small, [0, 1, 2]), (big, [4, 5, 6, 7]), (big, [8, 9])]
+
+
+def test_batch_results_match_run_unit_tests(generator):
+    submissions = [{'id': 'many', 'code': CODE, 'test_cases': add_tests(9, wrong={4})},
+                   {'id': 'few', 'code': CODE, 'test_cases': add_tests(2)},
+                   {'id': 'none', 'code': CODE, 'test_cases': []}]
+    batch = generator.run_unit_tests_batch(submissions, max_workers=2, tests_per_task=2)
+    assert [result['submission_id'] for result in batch['results']] == ['many', 'few', 'none']
+    assert batch['total_tests'] == 11
+    for submission, result in zip(submissions, batch['results']):
+        single = generator.run_unit_tests(submission['code'], submission['test_cases'])
+        assert [test['test_id'] for test in result['test_results']] == \
+            [test['test_id'] for test in single['test_results']]
+        for key in ('total_tests', 'passed', 'failed', 'errors'):
+            assert result[key] == single[key]
+    assert batch['results'][0]['failed'] == 1
@@ -0,0 +1,72 @@
+import csv
+import json
+import os
+
+import pytest
+
+pytest.importorskip('pandas')
+
+import bloom_distribution_analysis as bda
+
+
+def write_csv(path, levels):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['question', 'bloom'])
+        writer.writerows([f'Question {i}?', level] for i, level in enumerate(levels))
+
+
+@pytest.fixture
+def question_root(tmp_path):
+    """Question files for three algorithms; one has the same questions as CSV and JSON"""
+    for name, levels in [('bubble_sort', ['remember', 'apply', 'apply']),
+                         ('binary_search', ['analyze', '', 'create']),
+                         ('dijkstra', ['understand', 'evaluate', 'remember', 'apply'])]:
+        directory = tmp_path / 'questions' / name
+        directory.mkdir(parents=True)
+        write_csv(directory / f'{name}_questions.csv', levels)
+    with open(tmp_path / 'questions' / 'dijkstra' / 'dijkstra_questions.json', 'w') as f:
+        json.dump([{'question': 'Ignored?', 'bloom': 'create'}], f)
+    with open(tmp_path / 'questions' / 'heap_questions.json', 'w') as f:
+        json.dump([{'question': 'Why?', 'bloom': 'evaluate'}, {'question': 'How?', 'bloom': 'metacognitive'}], f)
+    return tmp_path
+
+
+EXPECTED = {'remember': 2, 'understand': 1, 'apply': 3, 'analyze': 1, 'evaluate': 2, 'create': 1, 'metacognitive': 1}
+
+
+def test_csv_shadows_json_of_the_same_questions(question_root):
+    files = bda.find_question_files(str(question_root / 'questions'))
+    assert [os.path.basename(path) for path in files] == [
+        'heap_questions.json', 'binary_search_questions.csv', 'bubble_sort_questions.csv', 'dijkstra_questions.csv']
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_counts_match_across_workers(question_root, max_workers):
+    files = bda.find_question_files(str(question_root / 'questions'))
+    counts = bda.aggregate_bloom_counts(files, max_workers=max_workers, cache_path=None)
+    assert counts == EXPECTED
+    # Unexpected labels come after the known levels
+    assert list(counts) == bda.bloom_levels + ['metacognitive']
+
+
+def test_cache_rereads_only_changed_files(question_root, capsys):
+    cache_path = str(question_root / 'cache.json')
+    files = bda.find_question_files(str(question_root / 'questions'))
+    bda.aggregate_bloom_counts(files, max_workers=1, cache_path=cache_path)
+    assert 'Counted 4 new or changed of 4' in capsys.readouterr().out
+    assert bda.aggregate_bloom_counts(files, max_workers=1, cache_path=cache_path) == EXPECTED
+    assert 'Counted 0 new or changed of 4' in capsys.readouterr().out
+
+    write_csv(question_root / 'questions' / 'bubble_sort' / 'bubble_sort_questions.csv', ['create'])
+    counts = bda.aggregate_bloom_counts(files, max_workers=1, cache_path=cache_path)
+    assert 'Counted 1 new or changed of 4' in capsys.readouterr().out
+    assert counts == dict(EXPECTED, remember=1, apply=1, create=2)
+
+
+def test_cache_drops_files_that_are_gone(question_root):
+    cache_path = str(question_root / 'cache.json')
+    files = bda.find_question_files(str(question_root / 'questions'))
+    bda.aggregate_bloom_counts(files, max_workers=1, cache_path=cache_path)
+    bda.aggregate_bloom_counts(files[1:], max_workers=1, cache_path=cache_path)
+    assert sorted(bda.load_cache(cache_path)) == sorted(files[1:])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+
+def per_algorithm(df):
+    """Bloom's entropy and cognitive diversity of each algorithm, computed one algorithm at a time"""
+    entropy, diversity = {}, {}
+    for algorithm, rows in df.groupby('algorithm'):
+        p = rows['blooms_level'].value_counts(normalize=True).to_numpy()
+        entropy[algorithm] = -(p * np.log(p)).sum() / np.log(6)
+        diversity[algorithm] = 0.4 * rows['blooms_level'].nunique() / 6 + 0.6 * entropy[algorithm]
+    return entropy, diversity
+
+
+@pytest.fixture
+def evaluated(evaluation, question_frames, monkeypatch):
+    evaluator = evaluation.QuestionEvaluator()
+    evaluator.dfs = question_frames()
+    builds = []
+    count_matrix = evaluation.QuestionEvaluator._blooms_count_matrix
+    monkeypatch.setattr(evaluation.QuestionEvaluator, '_blooms_count_matrix',
+                        lambda self, df: builds.append(len(df)) or count_matrix(self, df))
+    evaluator.analyze_blooms_taxonomy()
+    evaluator.evaluate_cognitive_diversity()
+    return evaluator, builds
+
+
+def test_scores_match_per_algorithm_loop(evaluated):
+    evaluator, _ = evaluated
+    for lang in evaluator.languages:
+        df = evaluator.dfs[f'{lang}_questions']
+        entropy, diversity = per_algorithm(df)
+        np.testing.assert_allclose(df['blooms_distribution'], df['algorithm'].map(entropy))
+        np.testing.assert_allclose(df['cognitive_diversity'], df['algorithm'].map(diversity))
+
+
+def test_count_matrix_is_built_once_per_language(evaluated):
+    evaluator, builds = evaluated
+    assert len(builds) == len(evaluator.languages)
+    for lang in evaluator.languages:
+        matrix = evaluator.dfs[f'{lang}_blooms_matrix']
+        df = evaluator.dfs[f'{lang}_questions']
+        assert list(matrix.columns) == ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create']
+        assert matrix.to_numpy().sum() == len(df)
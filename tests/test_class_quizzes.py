@@ -0,0 +1,50 @@
+import itertools
+import os
+from collections import Counter
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+with open(os.path.join(ROOT, 'code_samples', 'quick_sort', 'quick_sort.py'), encoding='utf-8') as f:
+    CODE = f.read()
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+@pytest.mark.parametrize('max_overlap', [1, 2])
+def test_class_quizzes_overlap_at_most_max_overlap(generator, max_overlap):
+    result = generator.generate_class_quizzes(CODE, num_students=12, num_questions=5, max_overlap=max_overlap, seed=3)
+    quizzes = [{q['question'] for q in quiz['questions']} for quiz in result['quizzes']]
+    assert len(quizzes) == 12
+    assert all(len(quiz) == 5 for quiz in quizzes)
+    for a, b in itertools.combinations(quizzes, 2):
+        assert len(a & b) <= max_overlap
+
+
+def test_class_quizzes_are_seeded(generator):
+    assert (generator.generate_class_quizzes(CODE, 6, seed='class')
+            == generator.generate_class_quizzes(CODE, 6, seed='class'))
+
+
+def test_quizzes_meet_the_bloom_quotas(generator):
+    quotas = {'remember': 1, 'understand': 2, 'evaluate': 1}
+    result = generator.generate_class_quizzes(CODE, 8, bloom_quotas=quotas, seed=1)
+    assert result['bloom_quotas'] == quotas
+    for quiz in result['quizzes']:
+        assert Counter(q['bloom'] for q in quiz['questions']) == Counter(quotas)
+    default = generator.generate_class_quizzes(CODE, 4, num_questions=5, seed=1)
+    assert sum(default['bloom_quotas'].values()) == 5
+    # At most 40% of a quiz per level while other levels have questions
+    assert max(default['bloom_quotas'].values()) <= 2
+
+
+def test_impossible_classes_are_refused(generator):
+    with pytest.raises(ValueError, match='pairwise share'):
+        generator.generate_class_quizzes(CODE, num_students=10**6, num_questions=5, max_overlap=0)
+    with pytest.raises(ValueError, match='Bloom quotas'):
+        generator.generate_class_quizzes(CODE, 2, bloom_quotas={'create': 10**4})
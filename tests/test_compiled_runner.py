@@ -0,0 +1,100 @@
+import os
+import shutil
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+
+pytestmark = pytest.mark.skipif(shutil.which('gcc') is None, reason='gcc is not installed')
+
+C_CODE = '''#include <stdio.h>
+
+int add(int a, int b) {
+    return a + b;
+}
+
+void sort(int *values, int n) {
+    for (int i = 1; i < n; i++)
+        for (int j = i; j > 0 && values[j - 1] > values[j]; j--) {
+            int t = values[j]; values[j] = values[j - 1]; values[j - 1] = t;
+        }
+}
+
+int main(void) {
+    printf("%d\\n", add(1, 2));
+    return 0;
+}
+'''
+
+CPP_CODE = '''#include <vector>
+
+long long total(std::vector<int> values) {
+    long long sum = 0;
+    for (int value : values) sum += value;
+    return sum;
+}
+'''
+
+
+@pytest.fixture
+def runner(tmp_path):
+    return qg.CompiledTestRunner(cache_dir=str(tmp_path / 'compiled'))
+
+
+def test_c_functions_compile_once_per_function(runner):
+    tests = [{'id': 1, 'function_name': 'add', 'inputs': [2, 3], 'expected_output': 5},
+             {'id': 2, 'function_name': 'add', 'inputs': [-1, 1], 'expected_output': 1},
+             {'id': 3, 'function_name': 'sort', 'inputs': [[3, 1, 2], 3], 'expected_output': [1, 2, 3]}]
+    results = runner.run_tests(C_CODE, 'c', tests)
+    assert [result['status'] for result in results] == ['passed', 'failed', 'passed']
+    assert results[1]['value'] == 0
+    assert runner.compilations == 2 and runner.cache_hits == 0
+    runner.run_tests(C_CODE, 'c', tests)
+    assert runner.compilations == 2 and runner.cache_hits == 2
+
+
+def test_builds_are_shared_through_the_cache_dir(runner):
+    tests = [{'id': 1, 'function_name': 'add', 'inputs': [2, 3], 'expected_output': 5}]
+    runner.run_tests(C_CODE, 'c', tests)
+    other = qg.CompiledTestRunner(cache_dir=runner.cache_dir)
+    assert other.run_tests(C_CODE, 'c', tests)[0]['status'] == 'passed'
+    assert other.compilations == 0 and other.cache_hits == 1
+
+
+def test_compile_errors_are_cached(runner):
+    tests = [{'id': 1, 'function_name': 'add', 'inputs': [2, 3], 'expected_output': 5}]
+    broken = C_CODE.replace('return a + b;', 'return a + ;')
+    for _ in range(2):
+        result, = runner.run_tests(broken, 'c', tests)
+        assert result['status'] == 'error'
+        assert result['message'].startswith('Compilation failed')
+    assert runner.compilations == 1 and runner.cache_hits == 1
+
+
+@pytest.mark.skipif(shutil.which('g++') is None, reason='g++ is not installed')
+def test_cpp_vector_argument(runner):
+    result, = runner.run_tests(CPP_CODE, 'cpp', [{'id': 1, 'function_name': 'total', 'inputs': [[1, 2, 3]],
+                                                  'expected_output': 6}])
+    assert result['status'] == 'passed'
+
+
+def test_prune_removes_old_builds_then_least_recently_used(runner):
+    first, _ = runner.build('c', C_CODE, 'add')
+    second, _ = runner.build('c', C_CODE, 'sort')
+    os.utime(first, (1, 1))
+    runner.max_age = 3600
+    runner.prune_cache()
+    assert not os.path.exists(first) and os.path.isdir(second)
+
+    runner.max_cache_bytes = 1
+    third, _ = runner.build('c', C_CODE.replace('a + b', 'b + a'), 'add')
+    # The new build is kept even past the size limit
+    assert os.listdir(runner.cache_dir) == [os.path.basename(third)]
+
+
+def test_cache_dir_must_be_private(tmp_path):
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        qg.CompiledTestRunner(cache_dir=str(shared))
@@ -0,0 +1,61 @@
+import math
+import os
+import random
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+
+SIZES = [8, 11, 16, 23, 32, 45, 64, 91, 128, 181, 256, 362, 512, 724, 1024, 1448, 2048]
+
+GROWTH = {
+    'O(1)': lambda n: 1.0,
+    'O(log n)': math.log2,
+    'O(n)': float,
+    'O(n log n)': lambda n: n * math.log2(n),
+    'O(n²)': lambda n: float(n) ** 2,
+    'O(n³)': lambda n: float(n) ** 3,
+}
+
+
+@pytest.mark.parametrize('expected', list(GROWTH))
+def test_fit_recovers_the_growth_of_noisy_timings(expected):
+    rng = random.Random(expected)
+    g = GROWTH[expected]
+    # A fixed call overhead plus the growing term, with 3% multiplicative noise
+    times = [(2e-6 + 1e-7 * g(n)) * rng.uniform(0.97, 1.03) for n in SIZES]
+    best, scores = qg.fit_complexity(SIZES, times)
+    assert best == expected
+    assert scores[expected] < 0.05
+
+
+def test_too_few_timings_are_not_fitted():
+    assert qg.fit_complexity([8, 16, 32], [1e-6, 2e-6, 4e-6]) == (None, {})
+    # Zero times are dropped before counting
+    assert qg.fit_complexity([8, 16, 32, 64], [0.0, 1e-6, 2e-6, 4e-6]) == (None, {})
+
+
+CODE = '''def total(values):
+    result = 0
+    for value in values:
+        result += value
+    return result
+
+def past_the_end(values):
+    return values[len(values)]
+'''
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='the unit test sandbox is POSIX only')
+def test_profile_reports_growth_and_input_errors():
+    generator = qg.MultiLanguageQuestionGenerator()
+    profiles = {profile['function_name']: profile
+                for profile in generator.profile_complexity(CODE, max_size=2**12)}
+    assert profiles['total']['error'] is None
+    # Real timings are noisy; a linear loop must not fit as constant or quadratic
+    assert profiles['total']['empirical_complexity'] in ('O(n)', 'O(n log n)')
+    assert [n for n, _ in profiles['total']['measurements']][:3] == [8, 11, 16]
+
+    assert 'IndexError' in profiles['past_the_end']['error']
+    assert profiles['past_the_end']['measurements'] == []
+    assert profiles['past_the_end']['empirical_complexity'] is None
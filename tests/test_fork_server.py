@@ -0,0 +1,64 @@
+import gc
+import os
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+import sandbox_worker
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='the fork server needs os.fork')
+
+CODE = '''calls = 0
+
+def bump():
+    global calls
+    calls += 1
+    return calls
+
+def bomb(n):
+    return [0] * (n * 2**30)
+
+def spin(n):
+    while True:
+        n += 1
+'''
+
+
+@pytest.fixture
+def generator():
+    generator = qg.MultiLanguageQuestionGenerator()
+    generator.test_limits = qg.ResourceLimits(cpu_time=1, memory=256 * 2**20)
+    return generator
+
+
+def bump_tests(count):
+    return [{'test_id': i, 'function_name': 'bump', 'inputs': [], 'expected_output': 1} for i in range(count)]
+
+
+def test_every_test_starts_from_the_loaded_module(generator):
+    forked = generator.run_unit_tests(CODE, bump_tests(3), mode='fork')
+    assert forked['passed'] == 3
+    # A shared interpreter keeps the state of earlier tests
+    pooled = generator.run_unit_tests(CODE, bump_tests(3), mode='pool')
+    assert [result['value'] for result in pooled['test_results']] == [1, 2, 3]
+
+
+def test_limits_lose_only_the_child(generator):
+    tests = [{'test_id': 1, 'function_name': 'spin', 'inputs': [1], 'expected_output': 0},
+             {'test_id': 2, 'function_name': 'bomb', 'inputs': [8], 'expected_output': 0},
+             {'test_id': 3, 'function_name': 'bump', 'inputs': [], 'expected_output': 1}]
+    spin, bomb, bump = generator.run_unit_tests(CODE, tests, mode='fork')['test_results']
+    assert 'time limit' in spin['message'].lower()
+    assert bomb['exception_type'] == 'MemoryError'
+    assert bump['status'] == 'passed'
+
+
+def test_forks_leave_the_server_heap_unfrozen():
+    namespace = {}
+    assert sandbox_worker._load(namespace, {'code': CODE})[0]['status'] == 'ok'
+    frozen = gc.get_freeze_count()
+    for _ in range(3):
+        response, payload = sandbox_worker._forked_call(
+            namespace, {'op': 'call', 'function': 'bump', 'inputs': [], 'fork': True, 'timeout': 5}, b'', ())
+        assert sandbox_worker.decode_value(response['value'], payload) == 1
+    assert gc.get_freeze_count() == frozen
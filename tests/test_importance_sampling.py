@@ -0,0 +1,80 @@
+import random
+from collections import Counter
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+
+CODE = '''def quick_sort(values, low, high):
+    if low < high:
+        pivot = partition(values, low, high)
+        quick_sort(values, low, pivot - 1)
+        quick_sort(values, pivot + 1, high)
+    return values
+
+def partition(values, low, high):
+    pivot = values[high]
+    i = low - 1
+    for j in range(low, high):
+        if values[j] <= pivot:
+            i += 1
+            values[i], values[j] = values[j], values[i]
+    values[i + 1], values[high] = values[high], values[i + 1]
+    return i + 1
+
+def show(values):
+    print(values)
+'''
+
+
+def test_alias_table_draws_in_proportion_to_weight():
+    weights = [1, 0, 3, 6]
+    table = qg.AliasTable(weights)
+    rng = random.Random(0)
+    draws = Counter(table.draw(rng) for _ in range(50000))
+    assert draws[1] == 0
+    for index, weight in enumerate(weights):
+        assert draws[index] / 50000 == pytest.approx(weight / 10, abs=0.01)
+
+
+def test_alias_table_without_weight_draws_uniformly():
+    table = qg.AliasTable([0, 0, 0, 0])
+    rng = random.Random(1)
+    draws = Counter(table.draw(rng) for _ in range(20000))
+    assert set(draws) == {0, 1, 2, 3}
+    assert min(draws.values()) / 20000 == pytest.approx(0.25, abs=0.02)
+    assert len(qg.AliasTable([])) == 0
+
+
+def test_recursive_and_called_functions_are_more_important():
+    generator = qg.MultiLanguageQuestionGenerator()
+    importance = {q['function_name']: qg.question_importance(q)
+                  for q in generator.generate_question_candidates(CODE) if q.get('category') == 'function'}
+    assert importance['quick_sort'] > importance['partition'] > importance['show'] == 1.0
+    assert qg.question_importance({'question': 'No element?'}) == 1.0
+
+
+def test_important_questions_are_sampled_more_often():
+    generator = qg.MultiLanguageQuestionGenerator()
+    candidates = [{'question': 'Minor?', 'bloom': 'remember', 'importance': 1.0},
+                  {'question': 'Major?', 'bloom': 'remember', 'importance': 4.0}]
+    picked = Counter(generator.sample_questions(candidates, 1, random.Random(seed))[0]['question']
+                     for seed in range(4000))
+    assert picked['Major?'] / 4000 == pytest.approx(0.8, abs=0.03)
+
+
+def test_sampling_tables_are_cached_per_code_and_difficulty(monkeypatch):
+    built = []
+    build = qg.sampling_table
+    monkeypatch.setattr(qg, 'sampling_table', lambda questions: built.append(len(questions)) or build(questions))
+    generator = qg.MultiLanguageQuestionGenerator()
+    generator.max_sampling_tables = 2
+    for seed in range(5):
+        generator.generate_questions(CODE, 4, seed=seed)
+    assert len(built) == 1
+    generator.generate_questions(CODE, 4, qg.DifficultyLevel.BEGINNER, seed=0)
+    generator.generate_questions(CODE, 4, qg.DifficultyLevel.ADVANCED, seed=0)
+    assert len(built) == 3
+    # The least recently used table was evicted
+    generator.generate_questions(CODE, 4, seed=0)
+    assert len(built) == 4
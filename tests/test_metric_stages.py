@@ -0,0 +1,101 @@
+import io
+import contextlib
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def evaluator(evaluation):
+    return evaluation.QuestionEvaluator()
+
+
+def run_quietly(evaluator, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()) as report:
+        evaluator.run_metric_stages(*args, **kwargs)
+    return report.getvalue()
+
+
+def test_waves_follow_declared_dependencies(evaluator):
+    waves = evaluator._resolve_metric_stages()
+    assert sorted(name for wave in waves for name in wave) == sorted(evaluator.metric_stages)
+    produced = set(evaluator.base_columns)
+    for wave in waves:
+        for name in wave:
+            assert set(evaluator.metric_stages[name]['inputs']) <= produced
+        for name in wave:
+            produced.update(evaluator.metric_stages[name]['outputs'])
+    assert waves[-1] == ['quality_score']
+
+
+def test_subset_resolves_only_needed_stages(evaluator):
+    assert evaluator._resolve_metric_stages(['cognitive_diversity']) == [['blooms_taxonomy'], ['cognitive_diversity']]
+    # Output columns name the stage that produces them
+    assert evaluator._resolve_metric_stages(['blooms_level']) == [['blooms_taxonomy']]
+    with pytest.raises(ValueError, match='Unknown metric'):
+        evaluator._resolve_metric_stages(['no_such_metric'])
+
+
+def test_register_metric_rejects_bad_stages(evaluator):
+    with pytest.raises(ValueError, match='redefines'):
+        evaluator.register_metric('copy', lambda dfs: None, inputs=['question'], outputs=['quality_score'])
+    evaluator.register_metric('orphan', lambda dfs: None, inputs=['not_a_column'], outputs=['orphan'])
+    with pytest.raises(ValueError, match='No metric stage produces'):
+        evaluator._resolve_metric_stages(['orphan'])
+    evaluator.register_metric('ping', lambda dfs: None, inputs=['pong'], outputs=['ping'])
+    evaluator.register_metric('pong', lambda dfs: None, inputs=['ping'], outputs=['pong'])
+    with pytest.raises(ValueError, match='cycle'):
+        evaluator._resolve_metric_stages(['ping'])
+
+
+def test_subset_run_adds_only_its_columns(evaluator, question_frames):
+    evaluator.dfs = question_frames(20)
+    run_quietly(evaluator, ['cognitive_diversity'], max_workers=1)
+    columns = set(evaluator.dfs['C_questions'].columns)
+    assert {'blooms_level', 'cognitive_diversity'} <= columns
+    assert not columns & {'linguistic_complexity', 'code_coverage', 'quality_score'}
+
+
+def test_pooled_run_matches_serial_run(evaluation, question_frames):
+    runs = []
+    for max_workers in (1, None):
+        evaluator = evaluation.QuestionEvaluator()
+        evaluator.dfs = question_frames(60)
+        runs.append((evaluator.dfs, run_quietly(evaluator, max_workers=max_workers)))
+    (serial, serial_report), (pooled, pooled_report) = runs
+    assert pooled_report == serial_report
+    assert serial.keys() == pooled.keys()
+    for key in serial:
+        pd.testing.assert_frame_equal(pooled[key], serial[key])
+
+
+def test_plugin_stage_runs_next_to_builtin_ones(evaluator, question_frames):
+    evaluator.dfs = question_frames(20)
+
+    def question_length(dfs):
+        for key in [key for key in dfs if key.endswith('_questions')]:
+            dfs[key]['question_length'] = dfs[key]['question'].str.len()
+        print('plugin ran')
+
+    evaluator.register_metric('question_length', question_length, inputs=['question'], outputs=['question_length'])
+    report = run_quietly(evaluator)
+    assert 'plugin ran' in report
+    assert {'question_length', 'quality_score'} <= set(evaluator.dfs['Python_questions'].columns)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='counts calls in forked workers')
+def test_pooled_stages_share_the_count_matrix(evaluation, evaluator, question_frames, monkeypatch, tmp_path):
+    calls = tmp_path / 'calls'
+    count_matrix = evaluation.QuestionEvaluator._blooms_count_matrix
+
+    def counted(self, df):
+        with open(calls, 'a') as f:
+            f.write('.')
+        return count_matrix(self, df)
+
+    monkeypatch.setattr(evaluation.QuestionEvaluator, '_blooms_count_matrix', counted)
+    evaluator.dfs = question_frames(20)
+    run_quietly(evaluator)
+    # Once per language by analyze_blooms_taxonomy, none by evaluate_cognitive_diversity
+    assert calls.read_text() == '.' * len(evaluator.languages)
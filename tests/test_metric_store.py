@@ -0,0 +1,62 @@
+import io
+import os
+import sqlite3
+import contextlib
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+
+FILE_PATHS = {lang: os.path.join(ROOT, f'CodeQualityMetricsFinal-{lang}.csv') for lang in ('C', 'CPP', 'Java', 'Python')}
+
+
+@pytest.fixture
+def run(evaluation, monkeypatch, tmp_path):
+    """Evaluate the repository files against one store, returning the frames and the rows computed per column"""
+    monkeypatch.chdir(tmp_path)
+    fill_column = evaluation.QuestionEvaluator._fill_column
+
+    def evaluate():
+        computed = {}
+
+        def counted(self, df, column, compute):
+            def compute_and_count(rows):
+                computed[column] = computed.get(column, 0) + len(rows)
+                return compute(rows)
+            fill_column(self, df, column, compute_and_count)
+
+        evaluator = evaluation.QuestionEvaluator()
+        with monkeypatch.context() as patch, contextlib.redirect_stdout(io.StringIO()):
+            patch.setattr(evaluation.QuestionEvaluator, '_fill_column', counted)
+            evaluator.evaluate_questions(FILE_PATHS, metrics=['quality_score'], max_workers=1,
+                                         metric_store='metrics.sqlite')
+        return evaluator.dfs, computed
+
+    return evaluate
+
+
+def assert_same_scores(dfs, expected):
+    for key, df in expected.items():
+        # Restored columns come first, so compare by name
+        pd.testing.assert_frame_equal(dfs[key][df.columns], df, check_dtype=False)
+
+
+def test_second_run_reuses_every_stored_metric(evaluation, run):
+    first, computed = run()
+    total = sum(len(df) for key, df in first.items() if key.endswith('_questions'))
+    assert computed['blooms_level'] == total
+    second, computed = run()
+    assert computed == {}
+    assert_same_scores(second, first)
+
+
+def test_only_rows_missing_from_the_store_are_computed(evaluation, run):
+    first, _ = run()
+    question_hash = first['Python_questions']['question_hash'].iloc[0]
+    with sqlite3.connect('metrics.sqlite') as conn:
+        conn.execute('DELETE FROM question_metrics WHERE question_hash = ?', (question_hash,))
+    rows = int((first['Python_questions']['question_hash'] == question_hash).sum())
+    second, computed = run()
+    assert computed == {column: rows for column in evaluation.QuestionEvaluator().stored_metric_columns}
+    assert_same_scores(second, first)
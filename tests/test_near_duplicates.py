@@ -0,0 +1,86 @@
+import glob
+import itertools
+import os
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+CODE_FILES = sorted(glob.glob(os.path.join(ROOT, 'code_samples', '*', '*.py')))[:6]
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+def near_duplicate_pairs(generator, questions):
+    near = generator.near_duplicate_templates()
+    return [(a['question'], b['question']) for a, b in itertools.combinations(questions, 2)
+            if qg.question_element(a) == qg.question_element(b)
+            and (a['template_id'] == b['template_id'] or b['template_id'] in near.get(a['template_id'], {}))]
+
+
+def test_minhash_estimates_jaccard_similarity():
+    hasher = qg.MinHasher(num_perm=256)
+    text = 'Explain what the loop over {name} computes in each iteration'
+    assert hasher.similarity(hasher.signature(text), hasher.signature(text)) == 1.0
+    assert hasher.signature(text) == qg.MinHasher(num_perm=256).signature(text)
+    unrelated = hasher.signature('Design a new sorting algorithm for linked lists')
+    assert hasher.similarity(hasher.signature(text), unrelated) < 0.1
+    close = hasher.signature('Explain what the loop over {name} computes in every iteration')
+    # 7 of the 11 distinct bigrams are shared
+    assert hasher.similarity(hasher.signature(text), close) == pytest.approx(7 / 11, abs=0.12)
+
+
+def test_near_duplicate_templates_are_symmetric():
+    generator = qg.MultiLanguageQuestionGenerator()
+    near = generator.near_duplicate_templates()
+    assert near
+    for first, others in near.items():
+        for second, similarity in others.items():
+            assert near[second][first] == similarity >= generator.near_duplicate_threshold
+    generator.near_duplicate_threshold = None
+    assert generator.near_duplicate_templates() == {}
+
+
+@pytest.mark.parametrize('path', CODE_FILES, ids=os.path.basename)
+def test_sampled_questions_have_no_near_duplicates(generator, path):
+    code = read(path)
+    for seed in range(5):
+        assert near_duplicate_pairs(generator, generator.generate_quiz(code, 8, seed=seed)['questions']) == []
+        assert near_duplicate_pairs(generator, generator.generate_mixed_difficulty_questions(code, 3, 3, 3, seed=seed)) == []
+
+
+def test_near_duplicate_templates_are_not_sampled_together():
+    generator = qg.MultiLanguageQuestionGenerator()
+    first, second = next((first, second) for first, others in sorted(generator.near_duplicate_templates().items())
+                         for second in others if first.split('/')[0] == second.split('/')[0] == 'function')
+    pair = [{'question': f'Question from {template_id}', 'category': 'function', 'template_id': template_id,
+             'function_name': 'target', 'bloom': bloom} for template_id, bloom in ((first, 'analyze'), (second, 'evaluate'))]
+    fillers = [{'question': f'Question about {name}', 'category': 'function', 'template_id': 'function/beginner/0',
+                'function_name': name, 'bloom': bloom}
+               for name, bloom in (('helper', 'remember'), ('other', 'understand'), ('last', 'apply'))]
+
+    def both_picked(generator):
+        return sum({q['question'] for q in pair} <= {q['question'] for q in generator.sample_questions(
+            pair + fillers, 4, qg.make_rng(seed))} for seed in range(50))
+
+    assert both_picked(generator) == 0
+    generator.near_duplicate_threshold = None
+    assert both_picked(generator) > 0
+
+
+def test_avoided_questions_are_not_repeated(generator):
+    code = read(CODE_FILES[0])
+    candidates = generator.generate_question_candidates(code)
+    rng = qg.make_rng(1)
+    first = generator.sample_questions(candidates, 4, rng)
+    second = generator.sample_questions(candidates, 4, rng, avoid=first)
+    assert near_duplicate_pairs(generator, first + second) == []
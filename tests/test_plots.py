@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def render(evaluation, monkeypatch, tmp_path):
+    """A renderer recording the files it draws and the backend it draws them with"""
+    monkeypatch.chdir(tmp_path)
+    drawn = []
+
+    def render_table(path, df):
+        drawn.append((os.path.basename(path), evaluation.matplotlib.get_backend().lower()))
+        df.to_csv(path)
+
+    return render_table, drawn
+
+
+def plots(render_table, offset=0):
+    return [('first.png', render_table, (pd.DataFrame({'x': [1, 2, 3]}),)),
+            ('second.png', render_table, (pd.DataFrame({'x': [4, 5, 6 + offset]}),))]
+
+
+def test_unchanged_figures_are_skipped(evaluation, render):
+    render_table, drawn = render
+    evaluator = evaluation.QuestionEvaluator()
+    evaluator._render_plots(plots(render_table), max_workers=1)
+    assert [name for name, _ in drawn] == ['first.png', 'second.png']
+    del drawn[:]
+    evaluator._render_plots(plots(render_table), max_workers=1)
+    assert drawn == []
+    evaluator._render_plots(plots(render_table, offset=1), max_workers=1)
+    assert [name for name, _ in drawn] == ['second.png']
+
+
+def test_force_and_missing_files_redraw(evaluation, render):
+    render_table, drawn = render
+    evaluator = evaluation.QuestionEvaluator()
+    evaluator._render_plots(plots(render_table), max_workers=1)
+    os.remove(os.path.join('evaluation_plots', 'first.png'))
+    del drawn[:]
+    evaluator._render_plots(plots(render_table), max_workers=1)
+    assert [name for name, _ in drawn] == ['first.png']
+    del drawn[:]
+    evaluator._render_plots(plots(render_table), max_workers=1, force=True)
+    assert [name for name, _ in drawn] == ['first.png', 'second.png']
+
+
+def test_in_process_rendering_uses_agg_and_restores_backend(evaluation, render):
+    render_table, drawn = render
+    backend = evaluation.matplotlib.get_backend()
+    evaluation.QuestionEvaluator()._render_plots(plots(render_table), max_workers=1)
+    assert {used for _, used in drawn} == {'agg'}
+    assert evaluation.matplotlib.get_backend() == backend
+
+
+def test_worker_processes_render_figures(evaluation, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    level_df = pd.DataFrame({'Language': ['C', 'C', 'Python'], 'Difficulty': ['beginner', 'advanced', 'beginner'],
+                             'Quality Score': [0.5, 0.7, 0.6]})
+    evaluation.QuestionEvaluator()._render_plots(
+        [('quality_by_difficulty.png', evaluation._plot_quality_by_difficulty, (level_df,))], max_workers=2)
+    assert os.path.getsize(os.path.join('evaluation_plots', 'quality_by_difficulty.png')) > 0
@@ -0,0 +1,78 @@
+import glob
+import os
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+SAMPLES = os.path.join(ROOT, 'code_samples')
+CODE_FILES = [path for path in sorted(glob.glob(os.path.join(SAMPLES, 'quick_sort', 'quick_sort.*'))
+                                      + glob.glob(os.path.join(SAMPLES, 'bubble_sort', 'bubble_sort.*')))
+              if os.path.splitext(path)[1] in ('.py', '.java', '.cpp', '.c')]
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+@pytest.fixture(scope='module')
+def banked():
+    bank = qg.QuestionBank(':memory:')
+    generator = qg.MultiLanguageQuestionGenerator()
+    for path in CODE_FILES:
+        bank.build(generator, read(path), path)
+    generator.question_bank = bank
+    yield generator
+    bank.close()
+
+
+@pytest.mark.parametrize('path', CODE_FILES, ids=os.path.basename)
+@pytest.mark.parametrize('mixed', [True, False])
+def test_banked_quiz_matches_unbanked(generator, banked, path, mixed):
+    code = read(path)
+    assert banked.question_bank.prepared_quiz(code, mixed) is not None
+    for seed in range(3):
+        assert banked.generate_quiz(code, 6, mixed, seed=seed) == generator.generate_quiz(code, 6, mixed, seed=seed)
+
+
+def test_unbanked_code_falls_back(generator, banked):
+    code = read(CODE_FILES[0]) + '\n# not banked\n'
+    assert banked.question_bank.prepared_quiz(code) is None
+    assert banked.generate_quiz(code, 5, seed=1) == generator.generate_quiz(code, 5, seed=1)
+
+
+def test_query_filters_stored_candidates(generator, banked):
+    bank = banked.question_bank
+    code = read(CODE_FILES[0])
+    code_id = bank.code_id(code)
+    everything = bank.query(code_id)
+    candidates = generator.prepare_quiz(code)['candidates']
+    assert len(everything) == sum(len(questions) for questions in candidates.values())
+    beginner_loops = bank.query(code_id, category='loop', difficulty='beginner')
+    assert beginner_loops == [question for question in candidates['beginner'] if question.get('category') == 'loop']
+
+
+def test_rebuild_replaces_and_corpus_reports_failures(generator, tmp_path):
+    bank = qg.QuestionBank(str(tmp_path / 'bank.sqlite3'))
+    code = read(CODE_FILES[0])
+    count = len(bank.query(bank.build(generator, code)))
+    # Rebuilding replaces the stored candidates instead of adding to them
+    assert len(bank.query(bank.build(generator, code))) == count
+    assert bank._connection.execute('SELECT COUNT(*) FROM questions').fetchone()[0] == count
+
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    (corpus / 'bubble_sort.py').write_text(read(os.path.join(SAMPLES, 'bubble_sort', 'bubble_sort.py')))
+    (corpus / 'broken.py').write_bytes(b'\xff\xfe not utf-8')
+    (corpus / 'notes.txt').write_text('ignored')
+    report = bank.build_corpus(generator, str(corpus))
+    assert list(report['built']) == [str(corpus / 'bubble_sort.py')]
+    assert list(report['failed']) == [str(corpus / 'broken.py')]
+    bank.close()
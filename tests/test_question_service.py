@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import question_service
+from conftest import ROOT
+
+with open(os.path.join(ROOT, 'code_samples', 'bubble_sort', 'bubble_sort.py')) as f:
+    CODE = f.read()
+
+
+async def exchange(port, requests):
+    """Send (method, path, body) requests on one keep-alive connection; returns (status, headers, object) each"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    responses = []
+    try:
+        for method, path, body in requests:
+            data = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b''
+            writer.write(f'{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n\r\n'.encode() + data)
+            await writer.drain()
+            status_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            payload = json.loads(await reader.readexactly(int(headers['content-length'])))
+            responses.append((int(status_line.split()[1]), headers, payload))
+    finally:
+        writer.close()
+    return responses
+
+
+def serve(*requests, **options):
+    async def run():
+        service = question_service.QuestionService(workers=1, timeout=30, **options)
+        server = await service.start('127.0.0.1', 0)
+        try:
+            return await exchange(server.sockets[0].getsockname()[1], requests)
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+
+def test_endpoints_answer_on_one_connection():
+    (explain, _, explanation), (generate, _, generated), (quiz, _, quizzed), (metrics, _, stats) = serve(
+        ('POST', '/explain', {'code': CODE}),
+        ('POST', '/generate', {'code': CODE, 'num_questions': 3, 'difficulty': 'beginner'}),
+        ('POST', '/quiz', {'code': CODE, 'num_questions': 4}),
+        ('GET', '/metrics', None))
+    assert (explain, generate, quiz, metrics) == (200, 200, 200, 200)
+    assert isinstance(explanation['explanation'], str) and explanation['explanation']
+    assert len(generated['questions']) == 3
+    assert all(question['difficulty'] == 'beginner' for question in generated['questions'])
+    assert quizzed['quiz']['num_questions'] == 4
+    assert stats['requests'] == {'/explain': 1, '/generate': 1, '/quiz': 1, '/metrics': 1}
+    assert stats['batches'] >= 1 and stats['latency_ms']['samples'] == 3
+
+
+@pytest.mark.parametrize('method, path, body, status', [
+    ('POST', '/nowhere', {'code': CODE}, 404),
+    ('GET', '/generate', None, 405),
+    ('POST', '/metrics', None, 405),
+    ('POST', '/generate', b'{"code": ', 400),
+    ('POST', '/generate', {'source': CODE}, 400),
+    ('POST', '/generate', [CODE], 400),
+    ('POST', '/generate', {'code': CODE, 'num_questions': 0}, 400),
+    ('POST', '/generate', {'code': CODE, 'num_questions': 'many'}, 400),
+    ('POST', '/generate', {'code': CODE, 'num_questions': 10**6}, 400),
+    ('POST', '/generate', {'code': CODE, 'difficulty': 'impossible'}, 400),
+    ('POST', '/generate', {'code': CODE, 'answer_keys': 'yes'}, 400),
+    ('POST', '/quiz', {'code': CODE, 'mixed_difficulty': 1}, 400),
+])
+def test_bad_requests_are_refused_before_queueing(method, path, body, status):
+    (got, headers, payload), (metrics, _, stats) = serve((method, path, body), ('GET', '/metrics', None))
+    assert got == status
+    assert 'error' in payload
+    if status == 405:
+        assert headers['allow'] in ('GET', 'POST')
+    assert stats['batches'] == 0
+
+
+def test_numeric_strings_are_accepted_as_num_questions():
+    (status, _, payload), = serve(('POST', '/generate', {'code': CODE, 'num_questions': '2'}))
+    assert status == 200 and len(payload['questions']) == 2
+
+
+def test_full_queue_is_refused_with_retry_after():
+    async def run():
+        service = question_service.QuestionService(workers=1, max_pending=1, timeout=30)
+        await service.start('127.0.0.1', 0)
+        try:
+            # The batcher is stopped, so queued jobs stay pending
+            service._batcher.cancel()
+            await asyncio.sleep(0)
+            pending = asyncio.ensure_future(service.handle_request('POST', '/explain', json.dumps({'code': CODE})))
+            await asyncio.sleep(0.01)
+            refused = await service.handle_request('POST', '/explain', json.dumps({'code': CODE + '\n'}))
+            pending.cancel()
+            return refused
+        finally:
+            await service.close()
+
+    status, payload, headers = asyncio.run(run())
+    assert status == 503 and headers == {'Retry-After': '1'}
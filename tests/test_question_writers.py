@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+with open(os.path.join(ROOT, 'code_samples', 'binary_search', 'binary_search.py'), encoding='utf-8') as f:
+    CODE = f.read()
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+@pytest.mark.parametrize('difficulty', list(qg.DifficultyLevel))
+def test_streamed_candidates_match_the_list(generator, difficulty):
+    assert list(generator.iter_question_candidates(CODE, difficulty)) == \
+        generator.generate_question_candidates(CODE, difficulty)
+
+
+def test_iter_questions_matches_generate_questions(generator):
+    assert list(generator.iter_questions(CODE, 6, seed=5)) == generator.generate_questions(CODE, 6, seed=5)
+    everything = list(generator.iter_questions(CODE, difficulty=None))
+    assert len(everything) == sum(len(generator.generate_question_candidates(CODE, difficulty))
+                                  for difficulty in qg.DifficultyLevel)
+
+
+def test_csv_writer_uses_fixed_columns(generator):
+    questions = generator.generate_questions(CODE, 6, seed=1)
+    questions[0] = dict(questions[0], answer_key={'output': [1, 2]}, extra='dropped')
+    out = io.StringIO()
+    assert qg.write_questions_csv(iter(questions), out) == 6
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert list(rows[0]) == qg.QUESTION_FIELDS
+    assert [row['question'] for row in rows] == [q['question'] for q in questions]
+    assert json.loads(rows[0]['answer_key']) == {'output': [1, 2]}
+    assert rows[1]['answer_key'] == ''
+
+
+def test_jsonl_writer_streams_to_a_path(generator, tmp_path):
+    path = tmp_path / 'binary_search_questions.jsonl'
+    count = qg.write_questions_jsonl(generator.iter_questions(CODE, difficulty=None), str(path))
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert count == len(lines) > 0
+    assert json.loads(lines[0]) == next(generator.iter_questions(CODE, difficulty=None))
+
+
+def test_records_written_before_a_failure_are_kept(tmp_path):
+    def questions():
+        yield {'question': 'First?', 'bloom': 'remember'}
+        raise RuntimeError('generator failed')
+
+    path = tmp_path / 'partial.jsonl'
+    with pytest.raises(RuntimeError):
+        qg.write_questions_jsonl(questions(), str(path))
+    assert path.read_text(encoding='utf-8') == json.dumps({'question': 'First?', 'bloom': 'remember'}) + '\n'
+
+
+def test_bloom_analysis_counts_jsonl_files(tmp_path):
+    pytest.importorskip('pandas')
+    import bloom_distribution_analysis as bda
+
+    records = [{'question': 'Why?', 'bloom': 'evaluate'}, {'question': 'What?', 'bloom': 'remember'}]
+    qg.write_questions_jsonl(records, str(tmp_path / 'a_questions.jsonl'))
+    # Shadowed by the CSV of the same questions
+    qg.write_questions_jsonl(records, str(tmp_path / 'b_questions.jsonl'))
+    qg.write_questions_csv(records[:1], str(tmp_path / 'b_questions.csv'))
+    files = bda.find_question_files(str(tmp_path))
+    assert [os.path.basename(path) for path in files] == ['a_questions.jsonl', 'b_questions.csv']
+    counts = bda.aggregate_bloom_counts(files, max_workers=1, cache_path=None)
+    assert counts['evaluate'] == 2 and counts['remember'] == 1
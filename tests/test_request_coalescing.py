@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+import question_service
+from conftest import ROOT
+from test_question_service import exchange
+
+with open(os.path.join(ROOT, 'code_samples', 'bubble_sort', 'bubble_sort.py')) as f:
+    CODE = f.read()
+
+
+def run_together(count, target):
+    results = [None] * count
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, target())) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_shares_overlapping_calls():
+    flight = qg.SingleFlight()
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return [x * 2]
+
+    results = run_together(8, lambda: flight.do('key', slow, 4))
+    assert len(calls) == 1 and flight.coalesced == 7
+    assert all(result is results[0] for result in results)
+    # Nothing is kept once the call is over
+    assert flight.do('key', slow, 5) == [10] and len(calls) == 2
+
+
+def test_single_flight_shares_errors():
+    flight = qg.SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise KeyError('missing')
+
+    def call():
+        try:
+            flight.do('key', failing)
+        except KeyError as e:
+            return e
+
+    errors = run_together(4, call)
+    assert all(isinstance(error, KeyError) for error in errors)
+    assert flight.coalesced == 3
+
+
+def test_concurrent_candidates_are_computed_once(monkeypatch):
+    generator = qg.MultiLanguageQuestionGenerator()
+    calls = []
+    generate = generator._generate_question_candidates
+
+    def slow(*args):
+        calls.append(args)
+        time.sleep(0.2)
+        return generate(*args)
+
+    monkeypatch.setattr(generator, '_generate_question_candidates', slow)
+    results = run_together(4, lambda: generator.generate_question_candidates(CODE))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_samples_are_copies_drawn_with_the_given_rng():
+    generator = qg.MultiLanguageQuestionGenerator()
+    candidates = generator.generate_question_candidates(CODE)
+    snapshot = [dict(question) for question in candidates]
+    first = generator.sample_questions(candidates, 4, random.Random(7))
+    assert generator.sample_questions(candidates, 4, random.Random(7)) == first
+    for question in first:
+        question['question'] = 'changed'
+    assert candidates == snapshot
+
+
+def test_identical_requests_share_one_worker_job():
+    async def run():
+        service = question_service.QuestionService(workers=1, timeout=30)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            responses = await asyncio.gather(*(
+                exchange(port, [('POST', '/generate', {'code': CODE, 'num_questions': 3 + i % 2, 'seed': i % 5})])
+                for i in range(20)))
+            (_, _, stats), = await exchange(port, [('GET', '/metrics', None)])
+            return [response for response, in responses], stats
+        finally:
+            await service.close()
+
+    responses, stats = asyncio.run(run())
+    assert all(status == 200 for status, _, _ in responses)
+    assert stats['coalesced'] >= 1
+    assert stats['coalesced'] + stats['mean_batch_size'] * stats['batches'] == 20
+    assert stats['shared_jobs_in_flight'] == 0
+    questions = [[question['question'] for question in payload['questions']] for _, _, payload in responses]
+    assert [len(mix) for mix in questions] == [3 + i % 2 for i in range(20)]
+    # Requests with the same seed and size draw the same questions
+    assert questions[0] == questions[10] and questions[1] == questions[11]
@@ -0,0 +1,53 @@
+import os
+import random
+from collections import Counter
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+with open(os.path.join(ROOT, 'code_samples', 'dijkstra', 'dijkstra.py'), encoding='utf-8') as f:
+    CODE = f.read()
+
+
+def test_items_are_kept_in_proportion_to_weight():
+    kept = Counter()
+    for seed in range(6000):
+        reservoir = qg.WeightedReservoir(1, random.Random(seed))
+        for item, weight in (('a', 1), ('b', 2), ('c', 7), ('never', 0)):
+            reservoir.offer(item, weight)
+        kept.update(reservoir.items())
+    assert kept['never'] == 0
+    for item, share in (('a', 0.1), ('b', 0.2), ('c', 0.7)):
+        assert kept[item] / 6000 == pytest.approx(share, abs=0.03)
+
+
+def test_reservoir_holds_at_most_size_items_in_offer_order():
+    reservoir = qg.WeightedReservoir(5, random.Random(0))
+    for i in range(1000):
+        reservoir.offer(i)
+    assert len(reservoir) == 5 and reservoir.offered == 1000
+    assert reservoir.items() == sorted(reservoir.items())
+    empty = qg.WeightedReservoir(0, random.Random(0))
+    empty.offer('x')
+    assert empty.items() == []
+
+
+def test_reservoir_candidates_keep_per_level_samples():
+    generator = qg.MultiLanguageQuestionGenerator()
+    candidates = generator.generate_question_candidates(CODE)
+    kept = generator.reservoir_candidates(iter(candidates), 3, random.Random(1))
+    levels = Counter(q.get('bloom', 'other') for q in candidates)
+    assert Counter(q.get('bloom', 'other') for q in kept) == {level: min(count, 6) for level, count in levels.items()}
+    assert all(q in candidates for q in kept)
+
+
+def test_bounded_memory_sampling_is_seeded():
+    generator = qg.MultiLanguageQuestionGenerator()
+    first = generator.generate_questions(CODE, 6, seed=5, bounded_memory=True)
+    assert generator.generate_questions(CODE, 6, seed=5, bounded_memory=True) == first
+    assert len(first) == 6 and len({q['question'] for q in first}) == 6
+    candidates = {q['question'] for q in generator.generate_question_candidates(CODE)}
+    assert {q['question'] for q in first} <= candidates
+    assert max(Counter(q['bloom'] for q in first).values()) <= 6 * 0.4
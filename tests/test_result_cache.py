@@ -0,0 +1,97 @@
+import os
+import stat
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+
+CODE = '''def add(a, b):
+    return a + b
+'''
+
+TESTS = [
+    {'test_id': 1, 'function_name': 'add', 'inputs': [2, 3], 'expected_output': 5},
+    {'test_id': 2, 'function_name': 'add', 'inputs': [2, 2], 'expected_output': 5},
+]
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'results')
+
+
+@pytest.fixture
+def generator(cache_dir):
+    generator = qg.MultiLanguageQuestionGenerator()
+    generator.test_result_cache = qg.TestResultCache(cache_dir=cache_dir)
+    return generator
+
+
+def test_second_run_is_served_from_memory(generator):
+    first = generator.run_unit_tests(CODE, TESTS)
+    second = generator.run_unit_tests(CODE, TESTS)
+    assert first['cache_hits'] == 0
+    assert second['cache_hits'] == len(TESTS)
+    assert [r['status'] for r in second['test_results']] == ['passed', 'failed']
+    assert all(r['cached'] and r['cache_tier'] == 'memory' for r in second['test_results'])
+
+
+def test_results_survive_on_disk(generator, cache_dir):
+    generator.run_unit_tests(CODE, TESTS)
+    generator.test_result_cache = qg.TestResultCache(cache_dir=cache_dir)
+    results = generator.run_unit_tests(CODE, TESTS)
+    assert results['cache_hits'] == len(TESTS)
+    assert all(r['cache_tier'] == 'disk' for r in results['test_results'])
+
+
+def test_formatting_changes_still_hit(generator):
+    generator.run_unit_tests(CODE, TESTS)
+    reformatted = '# adds two numbers\ndef add(a,  b):\n    return (a + b)\n'
+    assert generator.run_unit_tests(reformatted, TESTS)['cache_hits'] == len(TESTS)
+
+
+def test_changed_code_or_tests_miss(generator):
+    generator.run_unit_tests(CODE, TESTS)
+    changed = CODE.replace('a + b', 'a * b + 1')
+    results = generator.run_unit_tests(changed, TESTS)
+    assert results['cache_hits'] == 0
+    assert [r['status'] for r in results['test_results']] == ['failed', 'passed']
+
+    new_test = [dict(TESTS[0], inputs=[1, 4])]
+    assert generator.run_unit_tests(CODE, new_test)['cache_hits'] == 0
+
+
+def test_clear_invalidates(generator):
+    generator.run_unit_tests(CODE, TESTS)
+    generator.test_result_cache.clear()
+    assert generator.run_unit_tests(CODE, TESTS)['cache_hits'] == 0
+
+
+def test_use_cache_false_runs_again(generator):
+    generator.run_unit_tests(CODE, TESTS)
+    results = generator.run_unit_tests(CODE, TESTS, use_cache=False)
+    assert results['cache_hits'] == 0
+    assert not any(r.get('cached') for r in results['test_results'])
+
+
+def test_cache_dir_is_private(cache_dir):
+    qg.TestResultCache(cache_dir=cache_dir)
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) & 0o077 == 0
+
+    os.chmod(cache_dir, 0o777)
+    with pytest.raises(PermissionError):
+        qg.TestResultCache(cache_dir=cache_dir)
+
+
+def test_source_hash_ignores_comments():
+    cache = qg.TestResultCache(disk=False)
+    assert cache.source_hash(CODE, qg.Language.PYTHON) == cache.source_hash('# add\n' + CODE, qg.Language.PYTHON)
+    assert cache.source_hash(CODE, qg.Language.PYTHON) != cache.source_hash(CODE.replace('+', '-'), qg.Language.PYTHON)
+
+
+def test_limit_errors_are_not_cached(generator):
+    generator.test_limits = qg.ResourceLimits(cpu_time=1)
+    tests = [{'test_id': 1, 'function_name': 'spin', 'inputs': [1], 'expected_output': 0}]
+    code = 'def spin(n):\n    while True:\n        n += 1\n'
+    generator.run_unit_tests(code, tests)
+    assert generator.run_unit_tests(code, tests)['cache_hits'] == 0
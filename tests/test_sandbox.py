@@ -0,0 +1,77 @@
+import os
+import shutil
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='resource limits are POSIX only')
+
+CODE = '''def bomb(n):
+    return [0] * (n * 2**30)
+
+def spin(n):
+    while True:
+        n += 1
+
+def add(a, b):
+    return a + b
+'''
+
+C_CODE = '''int spin(int n) {
+    volatile int i = n;
+    while (1) i++;
+    return i;
+}
+'''
+
+
+@pytest.fixture
+def generator():
+    generator = qg.MultiLanguageQuestionGenerator()
+    generator.test_limits = qg.ResourceLimits(cpu_time=1, memory=256 * 2**20)
+    return generator
+
+
+@pytest.mark.parametrize('mode', ['pool', 'subprocess'])
+def test_memory_bomb_is_a_memory_error(generator, mode):
+    results = generator.run_unit_tests(CODE, [{'test_id': 1, 'function_name': 'bomb', 'inputs': [8],
+                                               'expected_output': 0}], mode=mode)
+    result, = results['test_results']
+    assert result['status'] == 'error'
+    assert result['exception_type'] == 'MemoryError'
+
+
+@pytest.mark.parametrize('mode', ['pool', 'subprocess'])
+def test_infinite_loop_times_out(generator, mode):
+    results = generator.run_unit_tests(CODE, [{'test_id': 1, 'function_name': 'spin', 'inputs': [1],
+                                               'expected_output': 0}], mode=mode)
+    result, = results['test_results']
+    assert result['status'] == 'error'
+    assert 'time limit' in result['message'].lower()
+
+
+def test_add_still_passes_under_limits(generator):
+    results = generator.run_unit_tests(CODE, [{'test_id': 1, 'function_name': 'add', 'inputs': [2, 3],
+                                               'expected_output': 5}])
+    assert results['passed'] == 1
+    result, = results['test_results']
+    assert result['cpu_user'] is not None and result['peak_rss'] > 0
+
+
+@pytest.mark.skipif(shutil.which('gcc') is None, reason='gcc is not installed')
+def test_compiled_infinite_loop_hits_the_cpu_limit(tmp_path):
+    runner = qg.CompiledTestRunner(cache_dir=str(tmp_path / 'compiled'))
+    result, = runner.run_tests(C_CODE, 'c', [{'id': 1, 'function_name': 'spin', 'inputs': [1], 'expected_output': 0}],
+                               limits=qg.ResourceLimits(cpu_time=1))
+    assert result['status'] == 'error'
+    assert result['exception_type'] == 'SIGXCPU'
+    assert 'time limit' in result['message'].lower()
+
+
+def test_wall_timeout_never_undercuts_the_cpu_limit():
+    limits = qg.ResourceLimits(cpu_time=10)
+    assert limits.wall_timeout(5) == 11
+    assert limits.wall_timeout(5, budget=3) == 31
+    assert limits.wall_timeout(60) == 60
+    assert qg.ResourceLimits(cpu_time=None).wall_timeout(5) == 5
@@ -0,0 +1,65 @@
+import glob
+import os
+import random
+
+import pytest
+
+import MultiProgrammingCodeQG as qg
+from conftest import ROOT
+
+SAMPLES = os.path.join(ROOT, 'code_samples')
+CODE_FILES = [path for path in sorted(glob.glob(os.path.join(SAMPLES, 'quick_sort', 'quick_sort.*'))
+                                      + glob.glob(os.path.join(SAMPLES, 'bubble_sort', 'bubble_sort.*')))
+              if os.path.splitext(path)[1] in ('.py', '.java', '.cpp', '.c')]
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return qg.MultiLanguageQuestionGenerator()
+
+
+def test_make_rng():
+    rng = random.Random(1)
+    assert qg.make_rng(rng) is rng
+    assert qg.make_rng(random) is random
+    assert qg.make_rng(5).random() == random.Random(5).random()
+    assert qg.make_rng('class').random() == random.Random('class').random()
+    first, second = qg.make_rng(None), qg.make_rng(None)
+    assert isinstance(first, random.Random) and first is not second
+
+
+@pytest.mark.parametrize('path', CODE_FILES, ids=os.path.basename)
+def test_generate_questions_is_seeded(generator, path):
+    code = read(path)
+    runs = [generator.generate_questions(code, 6, seed=seed) for seed in (1, 1, random.Random(1), 'other')]
+    assert runs[0] == runs[1] == runs[2]
+    assert runs[0] != runs[3]
+    assert generator.generate_mixed_difficulty_questions(code, seed=4) == \
+        generator.generate_mixed_difficulty_questions(code, seed=4)
+
+
+@pytest.mark.parametrize('path', CODE_FILES, ids=os.path.basename)
+@pytest.mark.parametrize('mixed', [True, False])
+def test_generate_quiz_is_seeded(generator, path, mixed):
+    code = read(path)
+    quizzes = [generator.generate_quiz(code, 6, mixed, seed=seed) for seed in (1, 1, 2)]
+    assert quizzes[0] == quizzes[1]
+    assert quizzes[0]['questions'] != quizzes[2]['questions']
+
+
+def test_unseeded_calls_leave_the_random_module_alone(generator):
+    code = read(CODE_FILES[0])
+    state = random.getstate()
+    generator.generate_questions(code, 6)
+    generator.generate_quiz(code, 6)
+    assert random.getstate() == state
+    # The module is still used when passed explicitly
+    random.seed(9)
+    first = generator.generate_questions(code, 6, seed=random)
+    random.seed(9)
+    assert generator.generate_questions(code, 6, seed=random) == first
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+
+FILE_PATHS = {lang: os.path.join(ROOT, f'CodeQualityMetricsFinal-{lang}.csv') for lang in ('C', 'CPP', 'Java', 'Python')}
+
+
+@pytest.fixture(scope='module')
+def evaluations(evaluation, tmp_path_factory):
+    """The in-memory and the streaming evaluation of the same files, run in a scratch directory"""
+    directory = tmp_path_factory.mktemp('evaluation')
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        evaluator = evaluation.QuestionEvaluator()
+        evaluator.evaluate_questions(FILE_PATHS, metrics=['quality_score'])
+        in_memory = evaluator.generate_summary_statistics()
+        questions = pd.concat([evaluator.dfs[f'{lang}_questions'] for lang in evaluator.languages],
+                              ignore_index=True)
+
+        # Small chunks, so the aggregates of many chunks are merged
+        evaluation.QuestionEvaluator().evaluate_questions_streaming(
+            FILE_PATHS, chunksize=4, questions_output='streamed_questions.csv', max_workers=1)
+        streamed = pd.read_csv('evaluation_stats_summary.csv')
+        streamed_questions = pd.read_csv('streamed_questions.csv')
+    finally:
+        os.chdir(cwd)
+    return in_memory, streamed, questions, streamed_questions
+
+
+def test_streamed_summary_matches_in_memory(evaluations):
+    in_memory, streamed, _, _ = evaluations
+    assert list(streamed[['Language', 'Metric']].itertuples(index=False)) == \
+        list(in_memory[['Language', 'Metric']].itertuples(index=False))
+    for column in ('mean', 'median', 'std', 'min', 'max'):
+        np.testing.assert_allclose(streamed[column], in_memory[column], rtol=1e-9, atol=1e-12)
+
+
+def test_streamed_question_scores_match_in_memory(evaluation, evaluations):
+    _, _, questions, streamed_questions = evaluations
+    assert list(streamed_questions['question']) == list(questions['question'])
+    for metric in evaluation.QuestionEvaluator().report_metrics:
+        np.testing.assert_allclose(streamed_questions[metric], questions[metric], rtol=1e-9, atol=1e-12)
+
+
+def test_pooled_stream_matches_serial_stream(evaluation, evaluations, tmp_path, monkeypatch):
+    _, streamed, _, _ = evaluations
+    monkeypatch.chdir(tmp_path)
+    evaluation.QuestionEvaluator().evaluate_questions_streaming(FILE_PATHS, chunksize=16, max_workers=2)
+    pooled = pd.read_csv('evaluation_stats_summary.csv')
+    pd.testing.assert_frame_equal(pooled[['Language', 'Metric']], streamed[['Language', 'Metric']])
+    for column in ('mean', 'median', 'std', 'min', 'max'):
+        np.testing.assert_allclose(pooled[column], streamed[column], rtol=1e-9, atol=1e-12)
+
+
+def test_running_stats_merge_matches_whole(evaluation):
+    values = np.random.default_rng(0).integers(0, 50, 999).astype(float)
+    whole = evaluation._RunningStats()
+    whole.update(values)
+    merged = evaluation._RunningStats()
+    for part in np.array_split(values, 7):
+        stats = evaluation._RunningStats()
+        stats.update(part)
+        merged.merge(stats)
+    assert merged.count == whole.count == len(values)
+    for key, value in whole.summary().items():
+        assert merged.summary()[key] == pytest.approx(value)
+    assert whole.summary()['median'] == np.median(values)
+    assert whole.summary()['std'] == pytest.approx(np.std(values, ddof=1))
+
+
+def test_running_stats_compress_continuous_values(evaluation):
+    values = np.random.default_rng(1).random(20000)
+    stats = evaluation._RunningStats()
+    for part in np.array_split(values, 10):
+        stats.update(part)
+    assert len(stats.value_counts) <= stats.max_bins
+    assert sum(stats.value_counts.values()) == len(values)
+    # The median is accurate to within about one bucket of the values
+    assert abs(stats.median() - np.median(values)) < 2 / stats.max_bins
+    assert stats.summary()['mean'] == pytest.approx(values.mean())